@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+여러 학생 프로필에 대한 일괄 시간표 최적화
+- courses.json은 한 번만 읽고, 각 워커가 카탈로그 색인과 시간표 비트마스크를 한 번만 구성
+- 프로필마다 최적화를 워커 풀에서 실행하고 결과를 JSONL로 바로바로 기록
+- 처리량(profiles/sec)과 프로필별 지연 시간 백분위수 보고
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from catalog_snapshot import load_catalog
+from course_catalog import CourseCatalog
+from time_parser import TimeTableParser
+from cost_function import TimetableCostFunction
+from simulated_annealing import TimetableSimulatedAnnealing
+from result_writer import build_result_payload
+
+# 워커 프로세스마다 한 번 구성되는 공유 상태
+_worker_catalog = None
+_worker_time_parser = None
+_worker_sa_parameters = None
+
+
+def load_profiles(path):
+    """
+    프로필 디렉터리(*.json) 또는 JSONL 파일에서 (profile_id, profile) 목록 로드
+    profile_id는 파일 이름 또는 JSONL의 student_id(없으면 줄 번호)
+    """
+    profiles = []
+
+    if os.path.isdir(path):
+        for file_name in sorted(os.listdir(path)):
+            if not file_name.endswith('.json'):
+                continue
+            with open(os.path.join(path, file_name), 'r', encoding='utf-8') as f:
+                profiles.append((os.path.splitext(file_name)[0], json.load(f)))
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                profile = json.loads(line)
+                profiles.append((str(profile.get('student_id', line_number)), profile))
+
+    return profiles
+
+
+def prepare_catalog(course_database, time_parser):
+    """
+    카탈로그 색인과 모든 분반의 시간표 비트마스크를 미리 구성
+    course_database: courses.json 딕셔너리, CourseCatalog 또는 컴파일된 스냅샷 디렉터리 경로
+    (스냅샷은 워커마다 같은 파일을 메모리 매핑으로 읽고 시간표를 다시 파싱하지 않음)
+    """
+    if isinstance(course_database, str):
+        catalog = load_catalog(course_database, time_parser)
+    elif isinstance(course_database, CourseCatalog):
+        catalog = course_database
+    else:
+        catalog = CourseCatalog(course_database)
+    catalog.get_schedule_masks(time_parser)
+    return catalog
+
+
+def _init_worker(course_database, sa_parameters):
+    """워커 초기화: 프로필과 무관한 카탈로그 전처리를 한 번만 수행"""
+    global _worker_catalog, _worker_time_parser, _worker_sa_parameters
+    _worker_time_parser = TimeTableParser()
+    _worker_catalog = prepare_catalog(course_database, _worker_time_parser)
+    _worker_sa_parameters = sa_parameters
+
+
+def _optimize_profile(profile_id, user_profile, seed, sa_parameters=None):
+    """
+    프로필 하나 최적화 (워커 프로세스에서 호출)
+    sa_parameters: 이 요청에만 적용할 SA 파라미터 (워커 기본값 위에 덮어씀)
+    """
+    start_time = time.perf_counter()
+    try:
+        random.seed(seed)
+        cost_function = TimetableCostFunction(user_profile, _worker_catalog, _worker_time_parser)
+        optimizer = TimetableSimulatedAnnealing(user_profile, _worker_catalog,
+                                                _worker_time_parser, cost_function)
+        if _worker_sa_parameters:
+            optimizer.set_parameters(_worker_sa_parameters)
+        if sa_parameters:
+            optimizer.set_parameters(sa_parameters)
+
+        result = optimizer.optimize(verbose=False)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        record = {
+            'profile_id': profile_id,
+            'seed': seed,
+            'result': build_result_payload(user_profile, result, cost_function, timestamp)
+        }
+    except (KeyError, TypeError, ValueError) as e:
+        record = {'profile_id': profile_id, 'seed': seed,
+                  'error': f"{type(e).__name__}: {e}"}
+
+    record['latency_seconds'] = time.perf_counter() - start_time
+    return record
+
+
+def latency_percentiles(latencies, percentiles=(50, 90, 95, 99)):
+    """지연 시간 백분위수 (선형 보간)"""
+    if not latencies:
+        return {}
+
+    values = sorted(latencies)
+    summary = {}
+    for percentile in percentiles:
+        position = (len(values) - 1) * percentile / 100
+        lower = int(position)
+        upper = min(lower + 1, len(values) - 1)
+        fraction = position - lower
+        summary[f'p{percentile}'] = values[lower] + (values[upper] - values[lower]) * fraction
+    return summary
+
+
+def run_batch(profiles, course_database, output_stream, workers=None, base_seed=0,
+              sa_parameters=None):
+    """
+    프로필 목록을 워커 풀에서 최적화하고 끝나는 순서대로 output_stream에 JSONL 기록
+    Returns: 처리량/지연 시간 요약 딕셔너리
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(profiles) or 1))
+
+    latencies = []
+    failed = 0
+    start_time = time.perf_counter()
+    initargs = (course_database, sa_parameters)
+
+    def emit(record):
+        nonlocal failed
+        if 'error' in record:
+            failed += 1
+        latencies.append(record['latency_seconds'])
+        output_stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        output_stream.flush()
+
+    if workers == 1:
+        _init_worker(*initargs)
+        for i, (profile_id, user_profile) in enumerate(profiles):
+            emit(_optimize_profile(profile_id, user_profile, base_seed + i))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=initargs) as executor:
+            futures = [executor.submit(_optimize_profile, profile_id, user_profile, base_seed + i)
+                       for i, (profile_id, user_profile) in enumerate(profiles)]
+            for future in as_completed(futures):
+                emit(future.result())
+
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'profiles': len(profiles),
+        'failed': failed,
+        'workers': workers,
+        'elapsed_seconds': elapsed,
+        'throughput_profiles_per_sec': len(profiles) / elapsed if elapsed > 0 else 0.0,
+        'latency_seconds': latency_percentiles(latencies)
+    }
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(description="여러 학생 프로필 일괄 시간표 최적화")
+    arg_parser.add_argument('profiles', help="프로필 JSON 디렉터리 또는 JSONL 파일")
+    arg_parser.add_argument('--catalog', default='data/courses.json',
+                            help="과목 데이터 (courses.json 또는 catalog_snapshot.py로 컴파일한 디렉터리)")
+    arg_parser.add_argument('--output', '-o', default='-', help="결과 JSONL 파일 (기본: 표준 출력)")
+    arg_parser.add_argument('--workers', type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    arg_parser.add_argument('--seed', type=int, default=0, help="기준 난수 시드 (프로필마다 +1)")
+    arg_parser.add_argument('--max-iterations', type=int, default=None, help="프로필별 SA 최대 반복")
+    return arg_parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    if os.path.isdir(args.catalog):
+        course_database = args.catalog  # 스냅샷은 경로만 넘기고 워커에서 각자 매핑
+    else:
+        with open(args.catalog, 'r', encoding='utf-8') as f:
+            course_database = json.load(f)
+    profiles = load_profiles(args.profiles)
+
+    sa_parameters = {}
+    if args.max_iterations is not None:
+        sa_parameters['max_iterations'] = args.max_iterations
+
+    if args.output == '-':
+        summary = run_batch(profiles, course_database, sys.stdout, args.workers, args.seed, sa_parameters)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as output_stream:
+            summary = run_batch(profiles, course_database, output_stream, args.workers,
+                                args.seed, sa_parameters)
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2), file=sys.stderr)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
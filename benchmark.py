@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+합성 카탈로그 규모별 성능 벤치마크
+parse_schedule, check_time_conflict, calculate_total_cost, generate_neighbor, optimize를
+분반 수(기본 1k/10k/100k)별로 측정하고 결과를 JSON으로 저장해 성능 회귀를 추적한다.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from synthetic_data import generate_catalog, generate_profile
+from course_catalog import CourseCatalog
+from time_parser import TimeTableParser
+from cost_function import TimetableCostFunction
+from simulated_annealing import TimetableSimulatedAnnealing
+
+
+def _time_calls(function, arguments):
+    """arguments의 각 항목으로 function을 호출하고 시간 측정"""
+    start_time = time.perf_counter()
+    for argument in arguments:
+        function(*argument)
+    elapsed = time.perf_counter() - start_time
+    calls = len(arguments)
+    return {
+        'calls': calls,
+        'total_seconds': elapsed,
+        'per_call_us': elapsed / calls * 1e6 if calls else 0.0
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_scale(n_sections, sections_per_course=3, n_areas=4, prerequisite_density=0.1,
+                    calls=2000, optimize_iterations=300, seed=0):
+    """분반 수 n_sections 규모에서 핵심 연산별 시간 측정"""
+    n_courses = max(1, n_sections // sections_per_course)
+    rng = random.Random(seed)
+
+    start_time = time.perf_counter()
+    course_db = generate_catalog(n_courses, sections_per_course, n_areas, seed=seed)
+    user_profile = generate_profile(course_db, prerequisite_density, seed=seed)
+    generation_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    catalog = CourseCatalog(course_db)
+    time_parser = TimeTableParser()
+    cost_function = TimetableCostFunction(user_profile, catalog, time_parser)
+    sa_optimizer = TimetableSimulatedAnnealing(user_profile, catalog, time_parser, cost_function)
+    setup_seconds = time.perf_counter() - start_time
+
+    courses = catalog.courses
+    schedules = [rng.choice(courses)['schedule'] for _ in range(calls)]
+    schedule_pairs = [(rng.choice(courses)['schedule'], rng.choice(courses)['schedule'])
+                      for _ in range(calls)]
+
+    timings = {}
+    timings['parse_schedule'] = _time_calls(time_parser.parse_schedule, [(s,) for s in schedules])
+    # 첫 호출은 마스크 컴파일 포함(cold), 두 번째부터는 캐시된 마스크만 사용(warm)
+    timings['check_time_conflict_cold'] = _time_calls(time_parser.check_time_conflict, schedule_pairs)
+    timings['check_time_conflict'] = _time_calls(time_parser.check_time_conflict, schedule_pairs)
+
+    random.seed(seed)
+    solutions = []
+    for _ in range(min(calls, 500)):
+        picks = rng.sample(courses, 7)
+        solutions.append([{'course_code': c['course_code'], 'section': c['section']} for c in picks])
+    timings['calculate_total_cost'] = _time_calls(cost_function.calculate_total_cost,
+                                                  [(s,) for s in solutions])
+
+    base_solution = sa_optimizer.generate_initial_solution()
+    timings['generate_neighbor'] = _time_calls(sa_optimizer.generate_neighbor,
+                                               [(base_solution,)] * min(calls, 500))
+
+    sa_optimizer.max_iterations = optimize_iterations
+    sa_optimizer.cooling_rate = 0.995
+    start_time = time.perf_counter()
+    result = sa_optimizer.optimize(verbose=False)
+    optimize_seconds = time.perf_counter() - start_time
+    timings['optimize'] = {
+        'calls': 1,
+        'total_seconds': optimize_seconds,
+        'iterations': result['iterations'],
+        'per_iteration_us': optimize_seconds / max(1, result['iterations']) * 1e6,
+        'best_cost': result['best_cost']
+    }
+
+    return {
+        'sections': len(courses),
+        'courses': n_courses,
+        'sections_per_course': sections_per_course,
+        'areas': n_areas,
+        'prerequisite_density': prerequisite_density,
+        'generation_seconds': generation_seconds,
+        'setup_seconds': setup_seconds,
+        'timings': timings
+    }
+
+
+def run_benchmarks(sizes, **options):
+    """여러 규모에 대해 벤치마크 실행"""
+    return {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'git_revision': _git_revision(),
+            'options': options
+        },
+        'results': [benchmark_scale(n_sections, **options) for n_sections in sizes]
+    }
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(description="시간표 최적화 성능 벤치마크")
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                            help="측정할 총 분반 수 목록")
+    arg_parser.add_argument('--sections-per-course', type=int, default=3)
+    arg_parser.add_argument('--areas', type=int, default=4)
+    arg_parser.add_argument('--prerequisite-density', type=float, default=0.1)
+    arg_parser.add_argument('--calls', type=int, default=2000, help="연산별 호출 횟수")
+    arg_parser.add_argument('--optimize-iterations', type=int, default=300)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--output', '-o', default='results/benchmark.json')
+    return arg_parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    report = run_benchmarks(
+        args.sizes,
+        sections_per_course=args.sections_per_course,
+        n_areas=args.areas,
+        prerequisite_density=args.prerequisite_density,
+        calls=args.calls,
+        optimize_iterations=args.optimize_iterations,
+        seed=args.seed
+    )
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for result in report['results']:
+        timings = result['timings']
+        print(f"[{result['sections']} 분반] "
+              + ", ".join(f"{name}: {timing.get('per_call_us', timing.get('per_iteration_us')):.1f}us"
+                          for name, timing in timings.items()))
+    print(f"✅ 벤치마크 결과가 '{args.output}'에 저장되었습니다.", file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    main()
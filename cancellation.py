@@ -0,0 +1,39 @@
+import threading
+import time
+
+
+class CancellationToken:
+    """
+    최적화 협조적 취소 토큰 (스레드 안전)
+    다른 스레드에서 cancel()을 호출하거나 deadline(time.monotonic() 기준)이 지나면
+    SA 루프가 다음 반복에서 멈추고 그때까지의 최적해를 반환한다.
+    parent가 취소되면 이 토큰도 취소된 것으로 본다.
+    """
+
+    def __init__(self, deadline=None, parent=None):
+        self.deadline = deadline
+        self.parent = parent
+        self._event = threading.Event()
+
+    @classmethod
+    def with_timeout(cls, seconds, parent=None):
+        """지금부터 seconds초 뒤가 마감인 토큰"""
+        return cls(time.monotonic() + seconds, parent)
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def reason(self):
+        """취소 이유 ('cancelled' / 'deadline', 아직 아니면 None)"""
+        if self._event.is_set():
+            return 'cancelled'
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return 'deadline'
+        if self.parent is not None:
+            return self.parent.reason
+        return None
+
+    @property
+    def cancelled(self):
+        return self.reason is not None
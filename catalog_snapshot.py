@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+컴파일된 과목 카탈로그 스냅샷
+courses.json을 한 번 컴파일해 디렉터리에 저장하고, 실행할 때는 JSON 파싱과 시간표 문자열 파싱 없이
+NumPy 배열을 메모리 매핑(mmap)으로 읽는다. 여러 워커 프로세스가 같은 파일을 읽기 전용으로 공유한다.
+
+디렉터리 구성
+- strings.json: 메타데이터와 문자열 테이블 (과목코드, 분반, 과목명, 교수, 강의실, 분류, 영역, 시간표)
+- 분반별 배열 (struct-of-arrays): code_id, section_id, name_id, professor_id, classroom_id,
+  category_id, area_id, schedule_id, credits, year_level
+- schedule_day_masks.npy: 시간표 문자열별 요일(월~토) 15비트 점유 마스크 (시간표 수 x 6)
+- conflict_indptr.npy / conflict_indices.npy: 시간이 겹치는 분반 인접 리스트 (CSR, 선택 사항)
+배열로 그대로 복원되지 않는 값(없는 필드, 숫자 필드의 None/실수, 그 밖의 필드)은 strings.json에
+분반별로 따로 저장하므로 to_course_database()는 courses.json과 같은 딕셔너리를 돌려준다.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Sequence
+
+import numpy as np
+
+from course_catalog import CourseCatalog
+from time_parser import TimeTableParser
+
+FORMAT_VERSION = 1
+
+# 문자열 테이블로 저장하는 필드 -> 분반별 ID 배열 이름
+STRING_FIELDS = [
+    ('course_code', 'code_id'),
+    ('section', 'section_id'),
+    ('course_name', 'name_id'),
+    ('professor', 'professor_id'),
+    ('classroom', 'classroom_id'),
+    ('category', 'category_id'),
+    ('area', 'area_id'),
+    ('schedule', 'schedule_id'),
+]
+NUMBER_FIELDS = [('credits', np.float64), ('year_level', np.int16)]
+
+# 복원할 때의 필드 순서 (courses.json과 같음)
+COURSE_FIELDS = ['course_code', 'section', 'course_name', 'credits', 'professor', 'schedule',
+                 'classroom', 'category', 'area', 'year_level']
+
+
+def _intern(values):
+    """문자열 목록을 (테이블, 인덱스 배열)로 변환 (테이블은 처음 나온 순서)"""
+    table = {}
+    indices = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        indices[i] = table.setdefault(value, len(table))
+    return list(table), indices
+
+
+def _storable_number(field, value):
+    """숫자 필드 값이 배열에 저장했다가 같은 값/타입으로 복원되는지"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    if field == 'credits':
+        return isinstance(value, int) or not value.is_integer()  # 정수 값 실수는 int로 복원됨
+    return isinstance(value, int) and np.iinfo(np.int16).min <= value <= np.iinfo(np.int16).max
+
+
+def _conflict_adjacency(section_schedule_ids, schedule_day_masks):
+    """
+    시간이 겹치는 분반 쌍의 CSR 인접 리스트
+    같은 교시를 차지하는 분반끼리 묶어 쌍을 만든다 (교시별 분반 수의 제곱에 비례).
+    """
+    n_sections = len(section_schedule_ids)
+    days, = schedule_day_masks.shape[1:]
+    periods = TimeTableParser.PERIODS_PER_DAY
+
+    # (시간표, 교시) 점유 행렬 → 분반별 점유 교시
+    bits = (schedule_day_masks[:, :, np.newaxis] >> np.arange(periods)) & 1
+    schedule_slots = bits.reshape(len(schedule_day_masks), days * periods).astype(bool)
+    section_slots = schedule_slots[section_schedule_ids]
+
+    rows = []
+    cols = []
+    for slot in range(days * periods):
+        members = np.flatnonzero(section_slots[:, slot])
+        if len(members) > 1:
+            rows.append(np.repeat(members, len(members)))
+            cols.append(np.tile(members, len(members)))
+
+    if rows:
+        pairs = np.unique(np.concatenate(rows).astype(np.int64) * n_sections + np.concatenate(cols))
+        pair_rows = pairs // n_sections
+        pair_cols = pairs % n_sections
+        keep = pair_rows != pair_cols
+        pair_rows = pair_rows[keep]
+        pair_cols = pair_cols[keep]
+    else:
+        pair_rows = pair_cols = np.empty(0, dtype=np.int64)
+
+    indptr = np.zeros(n_sections + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pair_rows, minlength=n_sections), out=indptr[1:])
+    return indptr, pair_cols.astype(np.int32)
+
+
+def compile_catalog(course_database, output_dir, time_parser=None, include_conflicts=False):
+    """
+    courses.json 딕셔너리를 스냅샷 디렉터리로 컴파일
+    include_conflicts: 분반 충돌 인접 리스트도 저장 (분반 수가 많으면 크기가 커진다)
+    Returns: 메타데이터 딕셔너리
+    """
+    if time_parser is None:
+        time_parser = TimeTableParser()
+    courses = course_database['courses']
+    os.makedirs(output_dir, exist_ok=True)
+
+    strings = {}
+    for field, array_name in STRING_FIELDS:
+        table, indices = _intern([course.get(field) for course in courses])
+        strings[field] = table
+        np.save(os.path.join(output_dir, f'{array_name}.npy'), indices)
+
+    # 배열로 복원되지 않는 값: sid -> {필드: 원래 값}, sid -> [없는 필드]
+    overrides = {}
+    missing_fields = {}
+    number_fields = dict(NUMBER_FIELDS)
+    for sid, course in enumerate(courses):
+        for field, value in course.items():
+            if field not in COURSE_FIELDS or (field in number_fields and not _storable_number(field, value)):
+                overrides.setdefault(str(sid), {})[field] = value
+        absent = [field for field in COURSE_FIELDS if field not in course]
+        if absent:
+            missing_fields[str(sid)] = absent
+
+    for field, dtype in NUMBER_FIELDS:
+        np.save(os.path.join(output_dir, f'{field}.npy'),
+                np.array([course.get(field) if _storable_number(field, course.get(field)) else 0
+                          for course in courses], dtype=dtype))
+
+    schedule_day_masks = np.array(
+        [time_parser.get_day_masks(time_parser.get_schedule_mask(schedule) if schedule else 0)
+         for schedule in strings['schedule']],
+        dtype=np.uint16
+    ).reshape(len(strings['schedule']), len(time_parser.DAY_ORDER))
+    np.save(os.path.join(output_dir, 'schedule_day_masks.npy'), schedule_day_masks)
+
+    if include_conflicts:
+        schedule_ids = np.load(os.path.join(output_dir, 'schedule_id.npy'))
+        indptr, indices = _conflict_adjacency(schedule_ids, schedule_day_masks)
+        np.save(os.path.join(output_dir, 'conflict_indptr.npy'), indptr)
+        np.save(os.path.join(output_dir, 'conflict_indices.npy'), indices)
+
+    metadata = {
+        'format_version': FORMAT_VERSION,
+        'sections': len(courses),
+        'periods_per_day': time_parser.PERIODS_PER_DAY,
+        'day_order': time_parser.DAY_ORDER,
+        'has_conflicts': include_conflicts
+    }
+    with open(os.path.join(output_dir, 'strings.json'), 'w', encoding='utf-8') as f:
+        json.dump({'metadata': metadata, 'strings': strings,
+                   'overrides': overrides, 'missing_fields': missing_fields}, f, ensure_ascii=False)
+    return metadata
+
+
+class CatalogSnapshot:
+    """컴파일된 스냅샷 (배열은 기본적으로 읽기 전용 메모리 매핑)"""
+
+    def __init__(self, snapshot_dir, mmap=True):
+        with open(os.path.join(snapshot_dir, 'strings.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.metadata = data['metadata']
+        self.strings = data['strings']
+        self.overrides = data.get('overrides', {})
+        self.missing_fields = data.get('missing_fields', {})
+
+        if self.metadata.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 형식입니다: {self.metadata.get('format_version')}")
+        if (self.metadata['periods_per_day'] != TimeTableParser.PERIODS_PER_DAY or
+                self.metadata['day_order'] != TimeTableParser.DAY_ORDER):
+            raise ValueError("스냅샷의 요일/교시 구성이 TimeTableParser와 다릅니다. 다시 컴파일하세요.")
+
+        mmap_mode = 'r' if mmap else None
+        self.arrays = {}
+        names = [array_name for _, array_name in STRING_FIELDS] + [field for field, _ in NUMBER_FIELDS]
+        names.append('schedule_day_masks')
+        if self.metadata['has_conflicts']:
+            names += ['conflict_indptr', 'conflict_indices']
+        for name in names:
+            self.arrays[name] = np.load(os.path.join(snapshot_dir, f'{name}.npy'), mmap_mode=mmap_mode)
+
+    def __len__(self):
+        return self.metadata['sections']
+
+    def schedule_masks(self):
+        """시간표 문자열별 전체 비트마스크 (TimeTableParser.get_schedule_mask와 같은 값)"""
+        periods = self.metadata['periods_per_day']
+        return [sum(int(day_bits) << (day_idx * periods) for day_idx, day_bits in enumerate(row))
+                for row in self.arrays['schedule_day_masks']]
+
+    def conflicts(self, sid):
+        """sid와 시간이 겹치는 분반 ID 배열 (컴파일할 때 include_conflicts를 켠 경우)"""
+        if not self.metadata['has_conflicts']:
+            raise ValueError("충돌 인접 리스트 없이 컴파일된 스냅샷입니다")
+        indptr = self.arrays['conflict_indptr']
+        return self.arrays['conflict_indices'][indptr[sid]:indptr[sid + 1]]
+
+    def column(self, field):
+        """분반별 field 값 목록 (sid 순서, 복원한 과목의 course.get(field)와 같은 값)"""
+        string_fields = dict(STRING_FIELDS)
+        if field in string_fields:
+            table = self.strings[field]
+            values = [table[i] for i in self.arrays[string_fields[field]].tolist()]
+        elif field == 'credits':
+            values = [int(value) if value.is_integer() else value for value in self.arrays['credits'].tolist()]
+        elif field == 'year_level':
+            values = self.arrays['year_level'].tolist()
+        else:
+            values = [None] * len(self)
+        for sid, fields in self.overrides.items():
+            if field in fields:
+                values[int(sid)] = fields[field]
+        for sid, fields in self.missing_fields.items():
+            if field in fields:
+                values[int(sid)] = None
+        return values
+
+    def to_course_database(self):
+        """courses.json과 같은 형식의 딕셔너리로 복원 (모든 과목 딕셔너리를 한 번에 만듦)"""
+        columns = {}
+        for field, array_name in STRING_FIELDS:
+            table = self.strings[field]
+            columns[field] = [table[i] for i in self.arrays[array_name].tolist()]
+        columns['credits'] = [int(value) if value.is_integer() else value
+                              for value in self.arrays['credits'].tolist()]
+        columns['year_level'] = self.arrays['year_level'].tolist()
+
+        courses = [
+            {'course_code': course_code, 'section': section, 'course_name': course_name,
+             'credits': credits, 'professor': professor, 'schedule': schedule,
+             'classroom': classroom, 'category': category, 'area': area, 'year_level': year_level}
+            for (course_code, section, course_name, credits, professor, schedule,
+                 classroom, category, area, year_level) in zip(*(columns[field] for field in COURSE_FIELDS))
+        ]
+        for sid, fields in self.overrides.items():
+            courses[int(sid)].update(fields)
+        for sid, fields in self.missing_fields.items():
+            for field in fields:
+                del courses[int(sid)][field]
+        return {'courses': courses}
+
+
+class SnapshotCourses(Sequence):
+    """
+    스냅샷의 분반 목록 (courses.json의 'courses' 리스트 대신 사용)
+    과목 딕셔너리는 처음 조회할 때 만들어 캐시하고, 전체를 훑는 색인 구성은 column()으로
+    딕셔너리 없이 필드 값 목록만 읽는다. 최적화에서 실제로 다루는 분반만 딕셔너리가 된다.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self._columns = {}
+        self._courses = [None] * len(snapshot)
+
+    def column(self, field):
+        """분반별 field 값 목록 (한 번 만들면 재사용)"""
+        values = self._columns.get(field)
+        if values is None:
+            values = self._columns[field] = self.snapshot.column(field)
+        return values
+
+    def __len__(self):
+        return len(self._courses)
+
+    def __getitem__(self, sid):
+        if isinstance(sid, slice):
+            return [self[i] for i in range(*sid.indices(len(self)))]
+        course = self._courses[sid]
+        if course is None:
+            sid = range(len(self))[sid]
+            course = {field: self.column(field)[sid] for field in COURSE_FIELDS}
+            course.update(self.snapshot.overrides.get(str(sid), {}))
+            for field in self.snapshot.missing_fields.get(str(sid), ()):
+                del course[field]
+            self._courses[sid] = course
+        return course
+
+    def materialized(self):
+        """지금까지 딕셔너리를 만든 분반 수"""
+        return sum(course is not None for course in self._courses)
+
+
+def _groups(ids, table, skip_empty=False):
+    """ID 배열을 {테이블 값: [sid, ...]}로 묶기 (테이블 순서 = 처음 나온 순서)"""
+    order = np.argsort(ids, kind='stable')
+    bounds = [0] + (np.flatnonzero(np.diff(ids[order])) + 1).tolist() + [len(order)]
+    order = order.tolist()
+    groups = {}
+    for start, end in zip(bounds, bounds[1:]):
+        if start < end:
+            value = table[ids[order[start]]]
+            if skip_empty and not value:
+                continue
+            groups[value] = order[start:end]
+    return groups
+
+
+def load_catalog(snapshot_dir, time_parser=None, mmap=True):
+    """
+    스냅샷에서 CourseCatalog 생성
+    과목 딕셔너리는 SnapshotCourses가 조회할 때 만들고, 색인은 배열/필드 값 목록으로 구성한다.
+    분반별 시간표 비트마스크를 미리 채워 두고, time_parser를 주면 그 마스크 캐시도 채운다
+    (최적화 중 시간표 문자열을 다시 파싱하지 않음).
+    """
+    snapshot = CatalogSnapshot(snapshot_dir, mmap)
+    arrays = snapshot.arrays
+    strings = snapshot.strings
+    courses = SnapshotCourses(snapshot)
+    course_database = {'courses': courses}
+
+    # 학점은 문자열 테이블이 없으므로 처음 나온 순서로 번호를 매긴다
+    credit_values, first_index, credit_ids = np.unique(arrays['credits'], return_index=True,
+                                                       return_inverse=True)
+    appearance = np.argsort(first_index)
+    credit_rank = np.empty(len(appearance), dtype=np.int64)
+    credit_rank[appearance] = np.arange(len(appearance))
+    credits = courses.column('credits')
+    credit_table = [credits[first_index[i]] for i in appearance]
+
+    catalog = CourseCatalog.from_groups(
+        course_database,
+        _groups(np.asarray(arrays['code_id']), strings['course_code']),
+        _groups(np.asarray(arrays['area_id']), strings['area'], skip_empty=True),
+        _groups(np.asarray(arrays['category_id']), strings['category'], skip_empty=True),
+        _groups(credit_rank[credit_ids.reshape(-1)], credit_table)
+    )
+
+    masks = snapshot.schedule_masks()
+    catalog._schedule_masks = [masks[i] for i in arrays['schedule_id'].tolist()]
+    if time_parser is not None:
+        for schedule, mask in zip(strings['schedule'], masks):
+            if schedule:
+                time_parser._mask_cache[schedule] = mask
+    return catalog
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(description="과목 카탈로그 스냅샷 컴파일")
+    arg_parser.add_argument('catalog', nargs='?', default='data/courses.json', help="과목 데이터 (courses.json)")
+    arg_parser.add_argument('--output', '-o', default='data/courses.snapshot', help="스냅샷 디렉터리")
+    arg_parser.add_argument('--conflicts', action='store_true', help="분반 충돌 인접 리스트 포함")
+    return arg_parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    start_time = time.perf_counter()
+    with open(args.catalog, 'r', encoding='utf-8') as f:
+        course_database = json.load(f)
+    metadata = compile_catalog(course_database, args.output, include_conflicts=args.conflicts)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"✅ {metadata['sections']}개 분반을 '{args.output}'에 컴파일했습니다 ({elapsed:.2f}초)",
+          file=sys.stderr)
+    return metadata
+
+
+if __name__ == "__main__":
+    main()
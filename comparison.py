@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+최적화 알고리즘 비교 하네스
+등록된 최적화기(optimizer_base)마다 같은 프로필을 여러 시드로, 같은 평가 수 또는 실행 시간 예산 아래
+워커 풀에서 실행하고 최고/중앙값/최저 비용, 목표 도달 시간, 초당 평가 수, 최대 메모리를 JSON과 그래프로 남긴다.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import batch
+from benchmark import _git_revision
+from cost_function import TimetableCostFunction
+from optimizer_base import available_optimizers, create_optimizer
+from time_parser import TimeTableParser
+
+# 예산을 다 쓰도록 알고리즘별 반복/종료 조건을 푸는 기본 파라미터 (사용자 파라미터가 우선)
+BUDGET_PARAMETERS = {
+    'simulated_annealing': {'max_iterations': 10 ** 9, 'final_temperature': 0.01, 'cooling_rate': 0.9995},
+    'parallel_tempering': {'max_iterations': 10 ** 9},
+    'genetic_algorithm': {'generations': 10 ** 9},
+    'tabu_search': {'max_iterations': 10 ** 9, 'max_no_improvement': None},
+    'branch_and_bound': {'max_nodes': None}
+}
+
+# 워커 프로세스마다 한 번 구성되는 공유 상태
+_worker_catalog = None
+_worker_time_parser = None
+_worker_profile = None
+
+
+def _init_worker(course_database, user_profile):
+    global _worker_catalog, _worker_time_parser, _worker_profile
+    _worker_time_parser = TimeTableParser()
+    _worker_catalog = batch.prepare_catalog(course_database, _worker_time_parser)
+    _worker_profile = user_profile
+
+
+def budget_parameters(name, max_evaluations=None, time_limit=None, parameters=None):
+    """알고리즘 하나에 적용할 예산 파라미터"""
+    merged = dict(BUDGET_PARAMETERS.get(name, {}))
+    parameters = parameters or {}
+    if name == 'simulated_annealing' and max_evaluations:
+        # 평가 예산이 끝날 때쯤 온도 0.01에 닿도록 냉각률 조정, 종료는 평가 예산이 먼저 걸리도록 최종 온도는 그보다 낮게.
+        # 냉각률은 시작 온도로 정해지므로 초기 온도 자동 보정은 끄고 지정한(기본 1000) 초기 온도를 쓴다
+        merged['final_temperature'] = 0.001
+        if 'cooling_rate' not in parameters:
+            if parameters.get('auto_initial_temperature'):
+                raise ValueError("평가 예산 비교에서 SA 초기 온도 자동 보정을 쓰려면 cooling_rate도 지정해야 합니다")
+            initial_temperature = parameters.get('initial_temperature', 1000.0)
+            merged['auto_initial_temperature'] = False
+            merged['cooling_rate'] = (0.01 / initial_temperature) ** (1.0 / max_evaluations)
+    merged['max_evaluations'] = max_evaluations
+    merged['time_limit'] = time_limit
+    merged.update(parameters)
+    return merged
+
+
+def _run_trial(name, seed, parameters, trace_memory=False):
+    """워커에서 최적화 한 번 실행 → 실행 통계 (trace_memory면 tracemalloc으로 최대 메모리 측정)"""
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        random.seed(seed)
+        cost_function = TimetableCostFunction(_worker_profile, _worker_catalog, _worker_time_parser)
+        optimizer = create_optimizer(name, _worker_profile, _worker_catalog, _worker_time_parser,
+                                     cost_function, parameters)
+        start_time = time.process_time()
+        result = optimizer.optimize(verbose=False)
+        cpu_seconds = time.process_time() - start_time
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    elapsed = result['elapsed_seconds']
+    return {
+        'algorithm': name,
+        'seed': seed,
+        'best_cost': result['best_cost'],
+        'evaluations': result['evaluations'],
+        'iterations': result['iterations'],
+        'elapsed_seconds': elapsed,
+        'cpu_seconds': cpu_seconds,
+        'evaluations_per_second': result['evaluations'] / elapsed if elapsed else 0.0,
+        'stop_reason': result['stop_reason'],
+        'improvements': [list(point) for point in result['improvements']],
+        'peak_memory_bytes': peak_memory
+    }
+
+
+def _best_cost_at(improvements, seconds):
+    """improvements 기록에서 seconds 시점의 최적 비용 (그 전에 해가 없으면 None)"""
+    best = None
+    for elapsed, _, cost in improvements:
+        if elapsed > seconds:
+            break
+        best = cost
+    return best
+
+
+def _time_to_target(improvements, target_cost):
+    for elapsed, _, cost in improvements:
+        if cost <= target_cost:
+            return elapsed
+    return None
+
+
+def summarize(runs, target_cost, curve_points=50):
+    """알고리즘별 실행 목록 → 비용/속도/목표 도달 시간 요약과 시간별 품질 곡선 (중앙값)"""
+    costs = [run['best_cost'] for run in runs]
+    times_to_target = [run['time_to_target'] for run in runs if run['time_to_target'] is not None]
+    horizon = max(run['elapsed_seconds'] for run in runs)
+
+    curve_seconds = [horizon * k / (curve_points - 1) for k in range(curve_points)]
+    curve_costs = []
+    for seconds in curve_seconds:
+        values = [cost for cost in (_best_cost_at(run['improvements'], seconds) for run in runs)
+                  if cost is not None]
+        curve_costs.append(statistics.median(values) if values else None)
+
+    return {
+        'runs': len(runs),
+        'best_cost': min(costs),
+        'median_cost': statistics.median(costs),
+        'worst_cost': max(costs),
+        'mean_evaluations': statistics.mean(run['evaluations'] for run in runs),
+        'mean_elapsed_seconds': statistics.mean(run['elapsed_seconds'] for run in runs),
+        'evaluations_per_second': statistics.mean(run['evaluations_per_second'] for run in runs),
+        'target_success_rate': len(times_to_target) / len(runs),
+        'median_time_to_target': statistics.median(times_to_target) if times_to_target else None,
+        'quality_curve': {'seconds': curve_seconds, 'median_best_cost': curve_costs}
+    }
+
+
+def compare_algorithms(course_database, user_profile, algorithms=None, seeds=5, max_evaluations=None,
+                       time_limit=None, target_cost=None, workers=None, parameters=None, measure_memory=True):
+    """
+    알고리즘별로 seeds개 시드를 같은 예산(max_evaluations 또는 time_limit)으로 실행해 비교
+    course_database: courses.json 딕셔너리, CourseCatalog 또는 스냅샷 디렉터리 경로
+    parameters: {알고리즘 이름: 파라미터 딕셔너리} 추가 설정
+    target_cost: 목표 도달 시간 기준 비용 (None이면 전체 실행의 최종 비용 중앙값)
+    measure_memory: 알고리즘마다 tracemalloc을 켠 실행을 한 번 더 해 최대 메모리 측정
+                    (tracemalloc은 실행을 느리게 하므로 시간 측정 실행과 분리)
+    """
+    if seeds < 1:
+        raise ValueError(f"seeds는 1 이상이어야 합니다: {seeds}")
+    algorithms = algorithms or available_optimizers()
+    if max_evaluations is None and time_limit is None:
+        max_evaluations = 20000
+    parameters = parameters or {}
+    trial_parameters = {name: budget_parameters(name, max_evaluations, time_limit, parameters.get(name))
+                        for name in algorithms}
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(algorithms) * seeds))
+
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(course_database, user_profile)) as executor:
+        futures = [(name, executor.submit(_run_trial, name, seed, trial_parameters[name]))
+                   for name in algorithms for seed in range(seeds)]
+        memory_futures = {}
+        if measure_memory:
+            memory_futures = {name: executor.submit(_run_trial, name, 0, trial_parameters[name], True)
+                              for name in algorithms}
+        runs_by_algorithm = {name: [] for name in algorithms}
+        for name, future in futures:
+            runs_by_algorithm[name].append(future.result())
+        peak_memory = {name: future.result()['peak_memory_bytes'] for name, future in memory_futures.items()}
+    elapsed = time.perf_counter() - start_time
+
+    if target_cost is None:
+        target_cost = statistics.median(run['best_cost'] for runs in runs_by_algorithm.values() for run in runs)
+
+    report_algorithms = {}
+    for name, runs in runs_by_algorithm.items():
+        for run in runs:
+            run['time_to_target'] = _time_to_target(run['improvements'], target_cost)
+        summary = summarize(runs, target_cost)
+        summary['peak_memory_bytes'] = peak_memory.get(name)
+        report_algorithms[name] = {
+            'parameters': trial_parameters[name],
+            'summary': summary,
+            'runs': [{key: value for key, value in run.items() if key != 'improvements'} for run in runs]
+        }
+
+    return {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': _git_revision(),
+            'workers': workers,
+            'seeds': seeds,
+            'elapsed_seconds': elapsed
+        },
+        'budget': {'max_evaluations': max_evaluations, 'time_limit': time_limit},
+        'target_cost': target_cost,
+        'algorithms': report_algorithms
+    }
+
+
+def plot_comparison(report, output_path):
+    """시간별 품질 곡선(중앙값)과 목표 도달 시간 누적 분포를 이미지로 저장"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    for name, entry in report['algorithms'].items():
+        curve = entry['summary']['quality_curve']
+        points = [(seconds, cost) for seconds, cost in zip(curve['seconds'], curve['median_best_cost'])
+                  if cost is not None]
+        if points:
+            ax1.step(*zip(*points), where='post', label=name)
+
+        times = sorted(run['time_to_target'] for run in entry['runs'] if run['time_to_target'] is not None)
+        if times:
+            fractions = [(k + 1) / len(entry['runs']) for k in range(len(times))]
+            ax2.step([0.0] + times, [0.0] + fractions, where='post', label=name)
+
+    ax1.set_xlabel('Seconds')
+    ax1.set_ylabel('Median best cost')
+    ax1.set_title('Solution quality over time')
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+
+    ax2.set_xlabel('Seconds')
+    ax2.set_ylabel('Fraction of runs')
+    ax2.set_title(f"Time to target (cost <= {report['target_cost']:g})")
+    ax2.set_ylim(0, 1.05)
+    ax2.grid(True, alpha=0.3)
+    ax2.legend()
+
+    plt.tight_layout()
+    fig.savefig(output_path)
+    plt.close(fig)
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(description="시간표 최적화 알고리즘 비교")
+    arg_parser.add_argument('--catalog', default='data/courses.json',
+                            help="과목 데이터 (courses.json 또는 컴파일된 스냅샷 디렉터리)")
+    arg_parser.add_argument('--profile', default='data/user_profile.json', help="사용자 프로필 JSON")
+    arg_parser.add_argument('--algorithms', nargs='+', default=None,
+                            help="비교할 최적화기 (기본: 등록된 전체, " + ", ".join(available_optimizers()) + ")")
+    arg_parser.add_argument('--seeds', type=int, default=5, help="알고리즘별 실행 수")
+    budget_group = arg_parser.add_mutually_exclusive_group()
+    budget_group.add_argument('--evaluations', type=int, default=None,
+                              help="실행별 평가 수 예산 (기본 20000)")
+    budget_group.add_argument('--time-limit', type=float, default=None, help="실행별 시간 예산(초)")
+    arg_parser.add_argument('--target', type=float, default=None,
+                            help="목표 도달 시간 기준 비용 (기본: 전체 실행 최종 비용의 중앙값)")
+    arg_parser.add_argument('--workers', type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    arg_parser.add_argument('--parameters', default=None,
+                            help='알고리즘별 파라미터 JSON (예: \'{"genetic_algorithm": {"population_size": 60}}\')')
+    arg_parser.add_argument('--no-memory', action='store_true', help="tracemalloc 메모리 측정 실행 생략")
+    arg_parser.add_argument('--output', '-o', default='results/comparison.json')
+    arg_parser.add_argument('--plot-to', default=None, metavar='FILE',
+                            help="그래프 저장 경로 (기본: --output과 같은 이름의 .png, 'none'이면 생략)")
+    return arg_parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    if os.path.isdir(args.catalog):
+        course_database = args.catalog
+    else:
+        with open(args.catalog, 'r', encoding='utf-8') as f:
+            course_database = json.load(f)
+    with open(args.profile, 'r', encoding='utf-8') as f:
+        user_profile = json.load(f)
+
+    report = compare_algorithms(
+        course_database, user_profile,
+        algorithms=args.algorithms,
+        seeds=args.seeds,
+        max_evaluations=args.evaluations,
+        time_limit=args.time_limit,
+        target_cost=args.target,
+        workers=args.workers,
+        parameters=json.loads(args.parameters) if args.parameters else None,
+        measure_memory=not args.no_memory
+    )
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"{'알고리즘':<20} {'최고':>8} {'중앙값':>8} {'최저':>8} {'평가/초':>10} {'목표 도달':>9} {'메모리(KB)':>10}")
+    for name, entry in report['algorithms'].items():
+        summary = entry['summary']
+        time_to_target = summary['median_time_to_target']
+        peak_memory = summary['peak_memory_bytes']
+        print(f"{name:<20} {summary['best_cost']:>8.1f} {summary['median_cost']:>8.1f} "
+              f"{summary['worst_cost']:>8.1f} {summary['evaluations_per_second']:>10.0f} "
+              f"{(f'{time_to_target:.3f}s' if time_to_target is not None else '-'):>9} "
+              f"{(f'{peak_memory / 1024:.0f}' if peak_memory is not None else '-'):>10}")
+    print(f"✅ 비교 결과가 '{args.output}'에 저장되었습니다.", file=sys.stderr)
+
+    plot_path = args.plot_to or os.path.splitext(args.output)[0] + '.png'
+    if plot_path != 'none':
+        try:
+            plot_comparison(report, plot_path)
+            print(f"✅ 그래프가 '{plot_path}'에 저장되었습니다.", file=sys.stderr)
+        except ImportError:
+            print("matplotlib가 설치되지 않아 그래프를 건너뜁니다.", file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    main()
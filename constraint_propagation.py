@@ -0,0 +1,152 @@
+import time
+from collections import deque
+
+
+class PropagationResult:
+    """
+    제약 전파 결과
+    domains: 과목코드 -> 남은 분반 ID 목록 (분반이 모두 빠진 과목은 없음)
+    fixed: 필수과목코드 -> 분반이 하나만 남아 확정된 분반 ID
+    removed: 빠진 분반 ID -> 이유 ('avoid_times' / 'prerequisite' / 'required_conflict')
+    consistent: 필수과목끼리 동시에 넣을 수 없어(도메인이 비어) 충돌 전파를 되돌렸으면 False
+    """
+
+    def __init__(self, domains_before, domains, fixed, removed, consistent, elapsed_seconds):
+        self.domains = domains
+        self.fixed = fixed
+        self.removed = removed
+        self.consistent = consistent
+        self.elapsed_seconds = elapsed_seconds
+        self.before = {'courses': len(domains_before), 'sections': sum(map(len, domains_before.values()))}
+        self.after = {'courses': len(domains), 'sections': sum(map(len, domains.values()))}
+
+    def allowed_section_ids(self):
+        """남은 분반 ID 집합"""
+        return {sid for sids in self.domains.values() for sid in sids}
+
+    def removed_counts(self):
+        """이유별 제거된 분반 수"""
+        counts = {}
+        for reason in self.removed.values():
+            counts[reason] = counts.get(reason, 0) + 1
+        return counts
+
+    def to_dict(self):
+        return {
+            'before': self.before,
+            'after': self.after,
+            'removed': self.removed_counts(),
+            'fixed': dict(self.fixed),
+            'consistent': self.consistent,
+            'elapsed_seconds': self.elapsed_seconds
+        }
+
+    def summary(self):
+        """한 줄 요약 (출력용)"""
+        removed = ", ".join(f"{reason} {count}" for reason, count in sorted(self.removed_counts().items()))
+        return (f"과목 {self.before['courses']} → {self.after['courses']}, "
+                f"분반 {self.before['sections']} → {self.after['sections']}"
+                + (f" (제거: {removed})" if removed else "")
+                + (f", 확정 필수과목 {len(self.fixed)}개" if self.fixed else ""))
+
+
+def propagate_domains(domains, catalog, user_profile, time_parser):
+    """
+    최적화 전에 좋은 시간표에 들어갈 수 없는 분반을 후보에서 제거
+    domains: 과목코드 -> 분반 ID 목록 (TimetableSimulatedAnnealing.candidate_domains())
+    1. 기피 시간대(avoid_times) 안에만 있는 분반 제거 (필수과목은 분반이 하나라도 남을 때만)
+    2. 선수과목을 이수하지도, 이번 학기에 같이 듣지도 못하는 (필수가 아닌) 과목 제거
+    3. 분반 충돌 그래프의 아크 일관성(AC-3): 어떤 필수과목의 모든 남은 분반과 시간이 겹치는 분반 제거.
+       필수과목의 도메인이 줄면 그 과목을 향한 아크를 다시 검사하고, 분반이 하나 남은 필수과목은 확정한다.
+       필수과목 도메인이 비면 (필수과목끼리 동시에 넣을 수 없음) 3단계 결과는 버린다.
+    충돌 여부는 분반 충돌 인접 리스트 대신 시간표 비트마스크 AND로 판단한다.
+    Returns: PropagationResult
+    """
+    start_clock = time.perf_counter()
+    required_courses = set(user_profile['constraints']['required_courses'])
+    completed_courses = set(user_profile['completed_courses'])
+    prerequisite_rules = user_profile['constraints']['prerequisite_rules']
+
+    masks = {}
+    for sids in domains.values():
+        for sid in sids:
+            schedule = catalog.courses[sid]['schedule']
+            masks[sid] = time_parser.get_schedule_mask(schedule) if schedule else 0
+
+    current = {course_code: list(sids) for course_code, sids in domains.items() if sids}
+    removed = {}
+
+    # 1. 기피 시간대
+    avoid_mask = 0
+    for avoid_time in user_profile['preferences']['avoid_times']:
+        avoid_mask |= time_parser.get_schedule_mask(avoid_time)
+    if avoid_mask:
+        for course_code, sids in current.items():
+            kept = [sid for sid in sids if not masks[sid] or masks[sid] & ~avoid_mask]
+            if len(kept) == len(sids) or (not kept and course_code in required_courses):
+                continue
+            for sid in sids:
+                if sid not in kept:
+                    removed[sid] = 'avoid_times'
+            current[course_code] = kept
+
+    def drop_unsatisfiable_prerequisites():
+        # 과목을 빼면 그 과목을 선수과목으로 갖는 과목도 빠질 수 있으므로 변화가 없을 때까지 반복
+        changed = True
+        while changed:
+            changed = False
+            for course_code in list(current):
+                if course_code in required_courses or not current[course_code]:
+                    continue
+                if any(prerequisite not in completed_courses and not current.get(prerequisite)
+                       for prerequisite in prerequisite_rules.get(course_code, ())):
+                    for sid in current[course_code]:
+                        removed[sid] = 'prerequisite'
+                    current[course_code] = []
+                    changed = True
+
+    # 2. 선수과목
+    drop_unsatisfiable_prerequisites()
+
+    # 3. AC-3 (아크 X → R: X의 각 분반은 R의 남은 분반 중 겹치지 않는 것이 하나는 있어야 함)
+    before_arc_consistency = {course_code: list(sids) for course_code, sids in current.items()}
+    removed_before_arc_consistency = dict(removed)
+    required_codes = [course_code for course_code in current if course_code in required_courses and current[course_code]]
+    queue = deque((course_code, required_code) for required_code in required_codes
+                  for course_code in current if course_code != required_code and current[course_code])
+    queued = set(queue)
+    consistent = True
+
+    while queue:
+        arc = queue.popleft()
+        queued.discard(arc)
+        course_code, required_code = arc
+        supports = [masks[sid] for sid in current[required_code]]
+        sids = current[course_code]
+        kept = [sid for sid in sids if any(not masks[sid] & support for support in supports)]
+        if len(kept) == len(sids):
+            continue
+        for sid in sids:
+            if sid not in kept:
+                removed[sid] = 'required_conflict'
+        current[course_code] = kept
+
+        if course_code in required_courses:
+            if not kept:
+                consistent = False
+                break
+            for other_code in current:
+                if other_code != course_code and current[other_code] and (other_code, course_code) not in queued:
+                    queue.append((other_code, course_code))
+                    queued.add((other_code, course_code))
+
+    if not consistent:
+        current = before_arc_consistency
+        removed = removed_before_arc_consistency
+    else:
+        drop_unsatisfiable_prerequisites()
+
+    pruned = {course_code: sids for course_code, sids in current.items() if sids}
+    fixed = {course_code: sids[0] for course_code, sids in pruned.items()
+             if course_code in required_courses and len(sids) == 1}
+    return PropagationResult(domains, pruned, fixed, removed, consistent, time.perf_counter() - start_clock)
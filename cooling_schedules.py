@@ -0,0 +1,163 @@
+"""
+시뮬레이티드 어닐링 냉각 스케줄과 초기 온도 자동 보정
+- geometric: T ← T * cooling_rate (기존 방식)
+- linear: T0에서 final_temperature까지 max_iterations 동안 직선 감소
+- logarithmic: T_k = T0 / (1 + scale * ln(1 + k))
+- adaptive: 최근 수락률이 Lam 목표 수락률을 따르도록 온도를 조금씩 올리고 내림
+- reheating: geometric 냉각 중 수락이 끊기면 온도를 다시 올림
+"""
+
+import math
+
+
+class CoolingSchedule:
+    """냉각 스케줄 기본 클래스"""
+
+    name = None
+
+    def reset(self, initial_temperature, final_temperature, max_iterations):
+        """최적화 시작 시 호출"""
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.max_iterations = max_iterations
+
+    def next_temperature(self, temperature, iteration, accepted):
+        """
+        iteration번째 반복(1부터)이 끝난 뒤의 온도
+        accepted: 이번 반복에서 이웃 해가 수락되었는지
+        """
+        raise NotImplementedError
+
+
+class GeometricCooling(CoolingSchedule):
+    name = 'geometric'
+
+    def __init__(self, cooling_rate=0.95):
+        self.cooling_rate = cooling_rate
+
+    def next_temperature(self, temperature, iteration, accepted):
+        return temperature * self.cooling_rate
+
+
+class LinearCooling(CoolingSchedule):
+    name = 'linear'
+
+    def next_temperature(self, temperature, iteration, accepted):
+        progress = min(1.0, iteration / max(1, self.max_iterations))
+        return self.initial_temperature - (self.initial_temperature - self.final_temperature) * progress
+
+
+class LogarithmicCooling(CoolingSchedule):
+    name = 'logarithmic'
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+
+    def next_temperature(self, temperature, iteration, accepted):
+        return self.initial_temperature / (1.0 + self.scale * math.log(1 + iteration))
+
+
+class AdaptiveCooling(CoolingSchedule):
+    """
+    Lam 방식 수락률 목표 냉각
+    수락률의 지수 이동 평균이 목표보다 높으면 온도를 내리고, 낮으면 올린다.
+    목표 수락률은 진행도에 따라 1 → 0.44 (전체의 15%까지) → 0.44 유지 (65%까지) → 0 으로 변한다.
+    """
+
+    name = 'adaptive'
+
+    def __init__(self, adjustment=0.99, smoothing=0.95):
+        self.adjustment = adjustment
+        self.smoothing = smoothing
+
+    def reset(self, initial_temperature, final_temperature, max_iterations):
+        super().reset(initial_temperature, final_temperature, max_iterations)
+        self.acceptance_rate = 1.0
+
+    @staticmethod
+    def target_acceptance(progress):
+        """진행도(0~1)에 따른 Lam 목표 수락률"""
+        if progress < 0.15:
+            return 0.44 + 0.56 * 560 ** (-progress / 0.15)
+        if progress < 0.65:
+            return 0.44
+        return 0.44 * 440 ** (-(progress - 0.65) / 0.35)
+
+    def next_temperature(self, temperature, iteration, accepted):
+        self.acceptance_rate = self.smoothing * self.acceptance_rate + (1 - self.smoothing) * accepted
+        target = self.target_acceptance(min(1.0, iteration / max(1, self.max_iterations)))
+        if self.acceptance_rate > target:
+            return temperature * self.adjustment
+        return temperature / self.adjustment
+
+
+class ReheatingCooling(CoolingSchedule):
+    """geometric 냉각 + 연속 reheat_after회 수락이 없으면 온도를 reheat_factor배로 (T0 이하, 최대 max_reheats회)"""
+
+    name = 'reheating'
+
+    def __init__(self, cooling_rate=0.95, reheat_after=50, reheat_factor=10.0, max_reheats=3):
+        self.cooling_rate = cooling_rate
+        self.reheat_after = reheat_after
+        self.reheat_factor = reheat_factor
+        self.max_reheats = max_reheats
+
+    def reset(self, initial_temperature, final_temperature, max_iterations):
+        super().reset(initial_temperature, final_temperature, max_iterations)
+        self.rejected_streak = 0
+        self.reheats = 0
+
+    def next_temperature(self, temperature, iteration, accepted):
+        self.rejected_streak = 0 if accepted else self.rejected_streak + 1
+        if self.rejected_streak >= self.reheat_after and self.reheats < self.max_reheats:
+            self.rejected_streak = 0
+            self.reheats += 1
+            return min(self.initial_temperature, temperature * self.reheat_factor)
+        return temperature * self.cooling_rate
+
+
+COOLING_SCHEDULES = {
+    schedule.name: schedule
+    for schedule in [GeometricCooling, LinearCooling, LogarithmicCooling, AdaptiveCooling, ReheatingCooling]
+}
+
+
+def create_cooling_schedule(name, cooling_rate=0.95, options=None):
+    """
+    이름으로 냉각 스케줄 생성
+    cooling_rate는 geometric/reheating에만 쓰이고, options는 각 스케줄 생성자 인자
+    """
+    if name not in COOLING_SCHEDULES:
+        raise ValueError(f"알 수 없는 냉각 스케줄: {name} (가능: {', '.join(COOLING_SCHEDULES)})")
+
+    options = dict(options or {})
+    if name in ('geometric', 'reheating'):
+        options.setdefault('cooling_rate', cooling_rate)
+    return COOLING_SCHEDULES[name](**options)
+
+
+def calibrate_initial_temperature(transitions, target_acceptance=0.8, tolerance=1e-3, max_rounds=50):
+    """
+    비용이 나빠지는 이웃 전이 표본으로 초기 온도 추정 (Ben-Ameur 반복법)
+    transitions: [(현재 비용, 이웃 비용)] (이웃 비용이 더 큰 것만 사용)
+    목표: 나빠지는 이동의 평균 수락 확률이 target_acceptance가 되는 온도
+    Returns: 초기 온도 (나빠지는 전이가 없으면 None)
+    """
+    uphill = [(before, after) for before, after in transitions if after > before]
+    if not uphill:
+        return None
+
+    # 시작값: 평균 비용 증가량으로 구한 Kirkpatrick 추정
+    mean_delta = sum(after - before for before, after in uphill) / len(uphill)
+    temperature = -mean_delta / math.log(target_acceptance)
+    offset = min(before for before, _ in uphill)
+
+    for _ in range(max_rounds):
+        accepted = sum(math.exp(-(after - offset) / temperature) for _, after in uphill)
+        proposed = sum(math.exp(-(before - offset) / temperature) for before, _ in uphill)
+        acceptance = max(accepted / proposed, 1e-300)
+        if abs(acceptance - target_acceptance) <= tolerance:
+            break
+        temperature *= math.log(acceptance) / math.log(target_acceptance)
+
+    return temperature
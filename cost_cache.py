@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+
+class CostCache:
+    """
+    해 비용 LRU 캐시
+    키는 순서와 무관한 해 지문(분반 ID를 정렬한 튜플)이고, 값은 항목별 비용 튜플이다.
+    max_entries개를 넘으면 가장 오래 쓰이지 않은 항목부터 버린다.
+    (항목 하나는 대략 과목 7개 기준 키/값/연결 노드를 합쳐 0.5KB 안팎)
+    """
+
+    def __init__(self, max_entries=100000):
+        if max_entries <= 0:
+            raise ValueError("max_entries는 1 이상이어야 합니다")
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(section_ids):
+        """분반 ID 목록의 순서와 무관한 지문"""
+        return tuple(sorted(section_ids))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """캐시된 값 (없으면 None)"""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """적중률 통계 딕셔너리"""
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate
+        }
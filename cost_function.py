@@ -1,15 +1,52 @@
+from course_catalog import CourseCatalog
+
+
 class TimetableCostFunction:
+    # (비용 세부 항목 이름, 계산 메서드) - calculate_total_cost와 같은 순서
+    COST_TERMS = [
+        ('time_conflict', '_time_conflict_cost'),
+        ('prerequisite_violation', '_prerequisite_violation_cost'),
+        ('credit_cost', '_credit_cost'),
+        ('required_course_missing', '_required_course_cost'),
+        ('consecutive_classes', '_consecutive_classes_cost'),
+        ('time_preference', '_time_preference_cost'),
+        ('lunch_time', '_lunch_time_cost'),
+        ('professor_preference', '_professor_preference_cost'),
+        ('area_requirement', '_area_requirement_cost'),
+        ('priority', '_priority_cost'),
+        ('free_days_bonus', '_free_days_cost'),
+    ]
+    
     def __init__(self, user_profile, course_database, time_parser):
         self.user_profile = user_profile
-        self.course_db = course_database
+        # course_database는 courses.json 딕셔너리 또는 미리 만든 CourseCatalog
+        if isinstance(course_database, CourseCatalog):
+            self.catalog = course_database
+        else:
+            self.catalog = CourseCatalog(course_database)
+        self.course_db = self.catalog.course_db
         self.time_parser = time_parser
         self.weights = user_profile['cost_function_weights']
+        
+        # 하루 점유 마스크(15비트)별 연강 비용 캐시
+        self._consecutive_cost_cache = {}
+        
+        # 항목별 시간 계측 (instrumentation.OptimizationProfiler, 사용하지 않으면 None)
+        self.profiler = None
+        
+        # 해 지문별 항목 비용 캐시 (cost_cache.CostCache, 사용하지 않으면 None)
+        self.cost_cache = None
     
     def calculate_total_cost(self, selected_courses):
         """
         선택된 과목들에 대한 총 비용 계산
         selected_courses: [{'course_code': '01605', 'section': '001'}, ...]
         """
+        if self.cost_cache is not None:
+            return self._cached_term_costs(selected_courses)[0]
+        if self.profiler is not None:
+            return self._calculate_total_cost_profiled(selected_courses)
+        
         total_cost = 0
         
         # 1. 시간 충돌 비용
@@ -47,28 +84,60 @@ class TimetableCostFunction:
         
         return total_cost
     
+    def _calculate_total_cost_profiled(self, selected_courses):
+        """항목별 호출 시간을 기록하며 총 비용 계산"""
+        return self._compute_term_costs(selected_courses)[0]
+    
+    def _cached_term_costs(self, selected_courses):
+        """
+        캐시를 거쳐 (총 비용, 항목별 비용 튜플) 계산
+        카탈로그에 없는 분반이 있으면 지문을 만들 수 없으므로 캐시하지 않는다.
+        """
+        section_ids = [self.catalog.section_id(c['course_code'], c['section']) for c in selected_courses]
+        if None in section_ids:
+            return self._compute_term_costs(selected_courses)
+        
+        key = self.cost_cache.fingerprint(section_ids)
+        value = self.cost_cache.get(key)
+        if value is None:
+            value = self._compute_term_costs(selected_courses)
+            self.cost_cache.put(key, value)
+        return value
+    
+    def _compute_term_costs(self, selected_courses):
+        """(총 비용, COST_TERMS 순서의 항목별 비용 튜플)"""
+        profiler = self.profiler
+        terms = []
+        total_cost = 0
+        for term_name, method_name in self.COST_TERMS:
+            if profiler is not None:
+                start_time = profiler.clock()
+            cost = getattr(self, method_name)(selected_courses)
+            if profiler is not None:
+                profiler.record(f'cost.{term_name}', profiler.clock() - start_time)
+            terms.append(cost)
+            total_cost += cost
+        return total_cost, tuple(terms)
+    
     def _get_course_details(self, course_code, section):
         """과목 상세정보 가져오기"""
-        for course in self.course_db['courses']:
-            if course['course_code'] == course_code and course['section'] == section:
-                return course
-        return None
+        return self.catalog.get_course(course_code, section)
     
     def _time_conflict_cost(self, selected_courses):
         """시간 충돌 비용 (하드 제약)"""
         cost = 0
-        schedules = []
+        masks = []
         
         for course_selection in selected_courses:
             course = self._get_course_details(course_selection['course_code'], 
                                            course_selection['section'])
             if course and course['schedule']:
-                schedules.append(course['schedule'])
+                masks.append(self.time_parser.get_schedule_mask(course['schedule']))
         
-        # 모든 쌍에 대해 충돌 검사
-        for i in range(len(schedules)):
-            for j in range(i + 1, len(schedules)):
-                if self.time_parser.check_time_conflict(schedules[i], schedules[j]):
+        # 모든 쌍에 대해 충돌 검사 (비트마스크 AND)
+        for i in range(len(masks)):
+            for j in range(i + 1, len(masks)):
+                if masks[i] & masks[j]:
                     cost += self.weights['time_conflict']
         
         return cost
@@ -100,6 +169,10 @@ class TimetableCostFunction:
             if course:
                 total_credits += course['credits']
         
+        return self._credit_cost_from_total(total_credits)
+    
+    def _credit_cost_from_total(self, total_credits):
+        """총 학점에 대한 학점 비용"""
         target_credits = self.user_profile['target_credits_this_semester']
         min_credits = self.user_profile['min_credits']
         max_credits = self.user_profile['max_credits']
@@ -127,26 +200,38 @@ class TimetableCostFunction:
     def _consecutive_classes_cost(self, selected_courses):
         """연강 비용"""
         cost = 0
-        matrix = self._build_schedule_matrix(selected_courses)
-        max_consecutive = self.user_profile['preferences']['max_consecutive_classes']
+        day_masks = self._build_day_masks(selected_courses)
         
-        # 각 요일별로 연강 검사
-        for day_schedule in matrix:
-            consecutive_count = 0
-            for period in day_schedule:
-                if period:  # 수업이 있는 경우
-                    consecutive_count += 1
-                else:  # 빈 시간
-                    if consecutive_count > max_consecutive:
-                        cost += (consecutive_count - max_consecutive) * self.weights['consecutive_classes']
-                    consecutive_count = 0
-            
-            # 마지막 연강 체크
-            if consecutive_count > max_consecutive:
-                cost += (consecutive_count - max_consecutive) * self.weights['consecutive_classes']
+        # 각 요일별로 연강 검사 (월~금)
+        for day_bits in day_masks[:5]:
+            cost += self._day_consecutive_cost(day_bits)
         
         return cost
     
+    def _day_consecutive_cost(self, day_bits):
+        """하루(15비트 마스크)의 연강 비용 (마스크 값별로 캐시)"""
+        cost = self._consecutive_cost_cache.get(day_bits)
+        if cost is not None:
+            return cost
+        
+        cost = 0
+        max_consecutive = self.user_profile['preferences']['max_consecutive_classes']
+        consecutive_count = 0
+        for period_idx in range(self.time_parser.PERIODS_PER_DAY):
+            if (day_bits >> period_idx) & 1:  # 수업이 있는 경우
+                consecutive_count += 1
+            else:  # 빈 시간
+                if consecutive_count > max_consecutive:
+                    cost += (consecutive_count - max_consecutive) * self.weights['consecutive_classes']
+                consecutive_count = 0
+        
+        # 마지막 연강 체크
+        if consecutive_count > max_consecutive:
+            cost += (consecutive_count - max_consecutive) * self.weights['consecutive_classes']
+        
+        self._consecutive_cost_cache[day_bits] = cost
+        return cost
+    
     def _time_preference_cost(self, selected_courses):
         """시간 선호도 비용"""
         cost = 0
@@ -159,15 +244,17 @@ class TimetableCostFunction:
             if not course or not course['schedule']:
                 continue
             
+            course_mask = self.time_parser.get_schedule_mask(course['schedule'])
+            
             # 기피 시간대 위반
             for avoid_time in avoid_times:
-                if self.time_parser.check_time_conflict(course['schedule'], avoid_time):
+                if course_mask & self.time_parser.get_schedule_mask(avoid_time):
                     cost += self.weights['avoid_time_violation']
             
             # 선호 시간대가 아닌 경우
             is_preferred = False
             for preferred_time in preferred_times:
-                if self.time_parser.check_time_conflict(course['schedule'], preferred_time):
+                if course_mask & self.time_parser.get_schedule_mask(preferred_time):
                     is_preferred = True
                     break
             
@@ -182,22 +269,25 @@ class TimetableCostFunction:
             return 0
         
         cost = 0
-        matrix = self._build_schedule_matrix(selected_courses)
-        lunch_periods = self.user_profile['preferences']['lunch_preferred_periods']
+        day_masks = self._build_day_masks(selected_courses)
         
-        # 각 요일별로 점심시간 확보 여부 체크
-        for day_schedule in matrix:
-            lunch_available = False
-            for lunch_period in lunch_periods:
-                if lunch_period <= len(day_schedule) and not day_schedule[lunch_period - 1]:
-                    lunch_available = True
-                    break
-            
-            if not lunch_available:
-                cost += self.weights['lunch_time_violation']
+        # 각 요일별로 점심시간 확보 여부 체크 (월~금)
+        for day_bits in day_masks[:5]:
+            cost += self._day_lunch_cost(day_bits)
         
         return cost
     
+    def _day_lunch_cost(self, day_bits):
+        """하루(15비트 마스크)의 점심시간 미확보 비용"""
+        lunch_periods = self.user_profile['preferences']['lunch_preferred_periods']
+        
+        for lunch_period in lunch_periods:
+            if (1 <= lunch_period <= self.time_parser.PERIODS_PER_DAY
+                    and not (day_bits >> (lunch_period - 1)) & 1):
+                return 0
+        
+        return self.weights['lunch_time_violation']
+    
     def _professor_preference_cost(self, selected_courses):
         """교수 선호도 비용"""
         cost = 0
@@ -214,9 +304,7 @@ class TimetableCostFunction:
     
     def _area_requirement_cost(self, selected_courses):
         """교양영역 요구사항 비용"""
-        cost = 0
         area_counts = {}
-        area_requirements = self.user_profile['constraints']['area_requirements']
         
         # 선택된 과목들의 영역별 카운트
         for course_selection in selected_courses:
@@ -226,6 +314,13 @@ class TimetableCostFunction:
                 area = course['area']
                 area_counts[area] = area_counts.get(area, 0) + 1
         
+        return self._area_cost_from_counts(area_counts)
+    
+    def _area_cost_from_counts(self, area_counts):
+        """영역별 이수 개수에 대한 교양영역 요구사항 비용"""
+        cost = 0
+        area_requirements = self.user_profile['constraints']['area_requirements']
+        
         # 각 영역별 요구사항 확인
         for area, required_count in area_requirements.items():
             actual_count = area_counts.get(area, 0)
@@ -234,33 +329,8 @@ class TimetableCostFunction:
         
         return cost
     
-    def _free_days_cost(self, selected_courses):
-        """공강일 비용 (공강일이 많을수록 비용 감소 = 보상)"""
-        matrix = self._build_schedule_matrix(selected_courses)
-        
-        # 각 요일별로 수업이 있는지 확인
-        weekdays = ['월', '화', '수', '목', '금']  # 토요일은 제외
-        days_with_classes = 0
-        
-        for day_idx, day_name in enumerate(weekdays):
-            has_classes = any(period != '' for period in matrix[day_idx])
-            if has_classes:
-                days_with_classes += 1
-        
-        # 공강일 수 계산
-        free_days = 5 - days_with_classes  # 최대 5일 중 공강일
-        
-        # 공강일이 많을수록 보상 (비용 감소)
-        # 공강일 0개: 0점, 1개: -50점, 2개: -120점, 3개: -210점, 4개: -320점, 5개: -450점
-        free_days_bonus = free_days * free_days * 30  # 제곱으로 보상 증가
-        
-        # 가중치 적용하여 비용으로 변환 (음수이므로 비용 감소 효과)
-        weight = self.weights.get('free_days_bonus', 100)
-        
-        return -free_days_bonus * weight / 100  # 음수로 보상
-    
-    def _build_schedule_matrix(self, selected_courses):
-        """선택된 과목들로 시간표 매트릭스 구성"""
+    def _build_occupancy_mask(self, selected_courses):
+        """선택된 과목들이 차지하는 시간 비트마스크"""
         courses_with_details = []
         for course_selection in selected_courses:
             course = self._get_course_details(course_selection['course_code'], 
@@ -268,7 +338,11 @@ class TimetableCostFunction:
             if course:
                 courses_with_details.append(course)
         
-        return self.time_parser.get_weekly_schedule_matrix(courses_with_details)
+        return self.time_parser.get_occupancy_mask(courses_with_details)
+    
+    def _build_day_masks(self, selected_courses):
+        """선택된 과목들로 요일별(월~토) 15비트 점유 마스크 구성"""
+        return self.time_parser.get_day_masks(self._build_occupancy_mask(selected_courses))
     
     def _priority_cost(self, selected_courses):
         """우선순위 비용 (낮은 우선순위 과목 선택시 패널티)"""
@@ -287,20 +361,17 @@ class TimetableCostFunction:
     
     def _free_days_cost(self, selected_courses):
         """공강일 비용 (공강일이 많을수록 비용 감소 = 보상)"""
-        matrix = self._build_schedule_matrix(selected_courses)
-        
-        # 각 요일별로 수업이 있는지 확인
-        weekdays = ['월', '화', '수', '목', '금']  # 토요일은 제외
-        days_with_classes = 0
+        day_masks = self._build_day_masks(selected_courses)
         
-        for day_idx, day_name in enumerate(weekdays):
-            has_classes = any(period != '' for period in matrix[day_idx])
-            if has_classes:
-                days_with_classes += 1
+        # 각 요일별로 수업이 있는지 확인 (토요일은 제외)
+        days_with_classes = sum(1 for day_bits in day_masks[:5] if day_bits)
         
         # 공강일 수 계산
         free_days = 5 - days_with_classes  # 최대 5일 중 공강일
-        
+        return self._free_days_bonus_cost(free_days)
+    
+    def _free_days_bonus_cost(self, free_days):
+        """공강일 수에 따른 보상 비용"""
         # 공강일이 많을수록 보상 (비용 감소)
         # 공강일 0개: 0점, 1개: -50점, 2개: -120점, 3개: -210점, 4개: -320점, 5개: -450점
         free_days_bonus = free_days * free_days * 30  # 제곱으로 보상 증가
@@ -311,7 +382,13 @@ class TimetableCostFunction:
         return -free_days_bonus * weight / 100  # 음수로 보상
     
     def get_cost_breakdown(self, selected_courses):
-        """비용 세부 분석"""
+        """비용 세부 분석 (캐시가 있으면 캐시된 항목별 비용 재사용)"""
+        if self.cost_cache is not None:
+            total_cost, terms = self._cached_term_costs(selected_courses)
+            breakdown = {term_name: cost for (term_name, _), cost in zip(self.COST_TERMS, terms)}
+            breakdown['total'] = total_cost
+            return breakdown
+        
         breakdown = {
             'time_conflict': self._time_conflict_cost(selected_courses),
             'prerequisite_violation': self._prerequisite_violation_cost(selected_courses),
@@ -0,0 +1,153 @@
+import json
+
+
+class CourseCatalog:
+    """
+    과목 데이터 색인 (courses.json을 한 번만 읽어 조회용 인덱스 구성)
+    - (과목코드, 분반) -> 과목 정보 O(1) 조회
+    - 과목코드별 분반 목록, 영역/분류/학점별 과목 목록 미리 계산
+    - 각 분반에는 courses 리스트 상의 위치를 정수 ID(sid)로 부여
+    """
+
+    def __init__(self, course_database):
+        self.course_db = course_database
+        self.courses = course_database['courses']
+
+        self._sid_by_key = {}         # (course_code, section) -> sid
+        self._sections_by_code = {}   # course_code -> [section, ...]
+        self._sids_by_code = {}       # course_code -> [sid, ...]
+        self._sids_by_area = {}
+        self._sids_by_category = {}
+        self._sids_by_credits = {}
+        self._schedule_masks = None
+        self._columns = {}
+
+        for sid, course in enumerate(self.courses):
+            course_code = course['course_code']
+            section = course['section']
+
+            # 중복 키는 기존 선형 탐색과 동일하게 처음 나온 과목을 사용
+            self._sid_by_key.setdefault((course_code, section), sid)
+            self._sections_by_code.setdefault(course_code, []).append(section)
+            self._sids_by_code.setdefault(course_code, []).append(sid)
+
+            if course.get('area'):
+                self._sids_by_area.setdefault(course['area'], []).append(sid)
+            if course.get('category'):
+                self._sids_by_category.setdefault(course['category'], []).append(sid)
+            self._sids_by_credits.setdefault(course['credits'], []).append(sid)
+
+    @classmethod
+    def from_groups(cls, course_database, sids_by_code, sids_by_area, sids_by_category, sids_by_credits):
+        """
+        미리 묶어 둔 sid 그룹으로 카탈로그 생성 (과목마다 도는 루프 없이 색인 구성)
+        각 그룹 딕셔너리는 __init__과 같은 순서(처음 나온 순서)여야 한다. catalog_snapshot 로더용.
+        """
+        catalog = cls.__new__(cls)
+        catalog.course_db = course_database
+        catalog.courses = course_database['courses']
+        catalog._schedule_masks = None
+        catalog._columns = {}
+
+        keys = list(zip(catalog.column('course_code'), catalog.column('section')))
+        # 뒤에서부터 넣어 중복 키는 처음 나온 과목이 남도록
+        catalog._sid_by_key = dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+        catalog._sids_by_code = sids_by_code
+        catalog._sections_by_code = {
+            course_code: [keys[sid][1] for sid in sids] for course_code, sids in sids_by_code.items()
+        }
+        catalog._sids_by_area = sids_by_area
+        catalog._sids_by_category = sids_by_category
+        catalog._sids_by_credits = sids_by_credits
+        return catalog
+
+    @classmethod
+    def from_json(cls, path):
+        """courses.json 파일에서 카탈로그 생성"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.courses)
+
+    def __iter__(self):
+        return iter(self.courses)
+
+    def __contains__(self, key):
+        """(과목코드, 분반) 튜플 포함 여부"""
+        return key in self._sid_by_key
+
+    def get_course(self, course_code, section):
+        """과목 상세정보 가져오기 (없으면 None)"""
+        sid = self._sid_by_key.get((course_code, section))
+        if sid is None:
+            return None
+        return self.courses[sid]
+
+    def section_id(self, course_code, section):
+        """(과목코드, 분반)의 정수 ID (없으면 None)"""
+        return self._sid_by_key.get((course_code, section))
+
+    def get_sections(self, course_code):
+        """과목코드의 모든 분반 목록"""
+        return self._sections_by_code.get(course_code, [])
+
+    def get_section_ids(self, course_code):
+        """과목코드의 모든 분반 ID 목록"""
+        return self._sids_by_code.get(course_code, [])
+
+    def get_schedule_masks(self, time_parser):
+        """
+        모든 분반의 시간표 비트마스크 (sid 순서 리스트)
+        처음 호출할 때 한 번 계산하고, 같은 파서의 마스크 캐시도 함께 채워진다.
+        """
+        if self._schedule_masks is None:
+            self._schedule_masks = [time_parser.get_schedule_mask(course['schedule'])
+                                    if course['schedule'] else 0
+                                    for course in self.courses]
+        return self._schedule_masks
+
+    def column(self, field):
+        """
+        분반별 field 값 목록 (sid 순서, 없는 필드는 None)
+        courses가 column()을 제공하면 (catalog_snapshot.SnapshotCourses) 과목 딕셔너리를 만들지 않고 읽는다.
+        """
+        values = self._columns.get(field)
+        if values is None:
+            if hasattr(self.courses, 'column'):
+                values = self.courses.column(field)
+            else:
+                values = [course.get(field) for course in self.courses]
+            self._columns[field] = values
+        return values
+
+    def has_course_code(self, course_code):
+        return course_code in self._sections_by_code
+
+    @property
+    def course_codes(self):
+        return list(self._sections_by_code)
+
+    @property
+    def areas(self):
+        return list(self._sids_by_area)
+
+    @property
+    def categories(self):
+        return list(self._sids_by_category)
+
+    @property
+    def credit_values(self):
+        return list(self._sids_by_credits)
+
+    def courses_by_area(self, area):
+        """교양영역별 과목 목록"""
+        return [self.courses[sid] for sid in self._sids_by_area.get(area, [])]
+
+    def courses_by_category(self, category):
+        """분류(전필/전선/교선 등)별 과목 목록"""
+        return [self.courses[sid] for sid in self._sids_by_category.get(category, [])]
+
+    def courses_by_credits(self, credits):
+        """학점별 과목 목록"""
+        return [self.courses[sid] for sid in self._sids_by_credits.get(credits, [])]
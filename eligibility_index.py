@@ -0,0 +1,92 @@
+import random
+
+
+class EligibilityIndex:
+    """
+    프로필별 추가 가능 분반 색인
+    이수 과목과 선수과목 규칙은 최적화 중에 바뀌지 않으므로, 학점이 있고 선수과목을 만족하는
+    분반을 한 번만 모아 학점별 / (학점, 교양영역)별 버킷으로 나눠 둔다.
+    sample()은 카탈로그를 다시 훑지 않고 버킷에서 무작위로 뽑은 뒤 제외할 과목코드면 다시 뽑는다
+    (max_rejections번 거절되면 큰 버킷은 None).
+    """
+
+    def __init__(self, catalog, user_profile, max_rejections=32):
+        self.catalog = catalog
+        self.max_rejections = max_rejections
+
+        completed_courses = set(user_profile['completed_courses'])
+        prerequisite_rules = user_profile['constraints']['prerequisite_rules']
+
+        self.section_ids = []
+        self._codes = {}               # sid -> 과목코드
+        self._by_credits = {}          # 학점 -> [sid] (카탈로그에 처음 나온 학점 순서)
+        self._by_credits_area = {}     # (학점, 교양영역) -> [sid]
+
+        # 과목 딕셔너리 대신 필드 값 목록으로 훑는다 (스냅샷 카탈로그는 딕셔너리를 만들지 않음)
+        areas = catalog.column('area')
+        for sid, (course_code, credits) in enumerate(zip(catalog.column('course_code'), catalog.column('credits'))):
+            # 0학점 과목 제외 (채플 같은 것들)
+            if credits <= 0:
+                continue
+
+            # 선수과목 확인 (이 과목 하나만 추가했을 때 기준)
+            if any(prerequisite not in completed_courses and prerequisite != course_code
+                   for prerequisite in prerequisite_rules.get(course_code, ())):
+                continue
+
+            self.section_ids.append(sid)
+            self._codes[sid] = course_code
+            self._by_credits.setdefault(credits, []).append(sid)
+            if areas[sid]:
+                self._by_credits_area.setdefault((credits, areas[sid]), []).append(sid)
+
+    def restrict(self, allowed_section_ids):
+        """allowed_section_ids에 있는 분반만 남기기 (제약 전파로 줄인 후보 반영)"""
+        self.section_ids = [sid for sid in self.section_ids if sid in allowed_section_ids]
+        self._codes = {sid: self._codes[sid] for sid in self.section_ids}
+        for buckets in (self._by_credits, self._by_credits_area):
+            for key in list(buckets):
+                buckets[key] = [sid for sid in buckets[key] if sid in allowed_section_ids]
+                if not buckets[key]:
+                    del buckets[key]
+
+    def __len__(self):
+        return len(self.section_ids)
+
+    @property
+    def credit_values(self):
+        """추가 가능 분반의 학점 값 (카탈로그에 처음 나온 순서)"""
+        return list(self._by_credits)
+
+    def sample(self, excluded_codes=(), credits=None, area=None, accept=None):
+        """
+        조건에 맞는 분반 ID 하나를 균등하게 선택 (없으면 None)
+        excluded_codes: 제외할 과목코드 (현재 선택된 과목 등)
+        credits / area: 학점 / 교양영역 버킷 제한 (area는 credits와 함께 사용)
+        accept: 추가 조건 함수 sid -> bool (시간 충돌 검사 등)
+        조건에 맞는 분반이 드물면 있더라도 None일 수 있다.
+        """
+        if credits is None:
+            bucket = self.section_ids
+        elif area is None:
+            bucket = self._by_credits.get(credits)
+        else:
+            bucket = self._by_credits_area.get((credits, area))
+        if not bucket:
+            return None
+
+        codes = self._codes
+        for _ in range(self.max_rejections):
+            sid = random.choice(bucket)
+            if codes[sid] not in excluded_codes and (accept is None or accept(sid)):
+                return sid
+
+        # 거절이 계속되면: 작은 버킷(max_rejections개 이하)만 남은 후보를 직접 모아 선택하고,
+        # 큰 버킷은 훑지 않고 None을 반환해 호출자가 다른 이동을 시도하게 한다 (실패 비용을 상수로 유지)
+        if len(bucket) > self.max_rejections:
+            return None
+        candidates = [sid for sid in bucket
+                      if codes[sid] not in excluded_codes and (accept is None or accept(sid))]
+        if candidates:
+            return random.choice(candidates)
+        return None
@@ -0,0 +1,504 @@
+import time
+
+from incremental_cost import IncrementalCostEvaluator
+from optimizer_base import Optimizer, register_optimizer
+from simulated_annealing import TimetableSimulatedAnnealing
+from solution_state import SolutionState
+
+
+class _Option:
+    """과목코드 하나의 분반 선택지 (탐색 중 반복 참조하는 값만)"""
+    __slots__ = ('sid', 'mask', 'credits', 'static_cost', 'area', 'days', 'periods')
+
+    def __init__(self, sid, mask, credits, static_cost, area, days, periods):
+        self.sid = sid
+        self.mask = mask
+        self.credits = credits
+        self.static_cost = static_cost  # 시간 선호 + 교수 선호 + 우선순위
+        self.area = area
+        self.days = days                # 수업이 있는 평일(월~금) 5비트
+        self.periods = periods          # 평일 수업 교시 수
+
+
+@register_optimizer('branch_and_bound')
+class BranchAndBoundSolver(Optimizer):
+    """
+    분기 한정법 정확 해법
+    과목코드마다 '분반 하나를 고르거나 넣지 않는' 선택을 정해진 순서로 내리며 깊이 우선 탐색한다.
+    후보는 SA가 다루는 해 공간과 같다: available_sections의 과목(필수/희망)과 추가 가능 분반의 과목.
+    - 시간 충돌은 하드 제약으로 보고 점유 비트마스크와 겹치는 분반은 후보에서 뺀다
+      (선수과목, 필수과목, 학점은 비용 그대로 계산하므로 충돌 없는 해 중에서는 정확한 최적해).
+    - 노드마다 아직 정하지 않은 과목으로 만들 수 있는 모든 해의 비용 하한을 구해 현재 최적해 이상이면 가지를 친다.
+      앞으로 수업이 있을 평일 집합 D(현재 요일을 포함하는 부분집합)마다
+        공강 보상(D 기준) + 연강/점심(현재 점유, 수업을 더해도 줄지 않음) + 확정된 분반 비용
+        + 학점 부족분을 D 안의 분반으로 채우는 분수 배낭 하한 + 채울 수 없는 교양영역/필수과목/선수과목 비용
+      의 최솟값을 하한으로 쓴다.
+    후보 과목코드가 max_courses개보다 많으면 탐색하지 않고 SA(self.sampler)로 최적화한다.
+    sampler의 constraint_propagation을 켜면 제약 전파로 줄인 후보 위에서 탐색하고 확정된 필수과목 분반은 미리 넣어 둔다
+    (이때 최적성은 줄인 후보 안에서의 최적).
+    """
+
+    PARAMETER_NAMES = ['max_courses', 'max_nodes', 'time_limit', 'target_cost', 'max_evaluations']
+
+    WEEKDAYS = 5
+
+    def __init__(self, user_profile, course_database, time_parser, cost_function):
+        # 후보 분반 구성과 큰 문제의 대체 최적화기 (SA 파라미터는 sampler에 설정)
+        self.sampler = TimetableSimulatedAnnealing(user_profile, course_database, time_parser, cost_function)
+        self.catalog = self.sampler.catalog
+        self.user_profile = user_profile
+        self.time_parser = time_parser
+        self.cost_function = cost_function
+
+        # 이보다 후보 과목코드가 많으면 SA로 대체
+        self.max_courses = 60
+
+        # 탐색 노드 수 상한 (넘으면 그때까지의 최적해를 반환하고 proven_optimal은 False)
+        self.max_nodes = 2000000
+
+        # 조기 종료 조건 (None이면 사용하지 않음)
+        self.time_limit = None
+        self.target_cost = None
+        self.max_evaluations = None  # 비용을 계산한 노드(완성 해) 수 상한
+
+    def set_parameters(self, parameters):
+        """파라미터 일괄 설정 (SA 파라미터는 sampler로 전달)"""
+        for name, value in parameters.items():
+            if name in self.PARAMETER_NAMES:
+                setattr(self, name, value)
+            else:
+                self.sampler.set_parameters({name: value})
+
+    def optimize(self, verbose=True, cancel_token=None):
+        """
+        분기 한정법 실행 (후보가 많으면 SA 결과에 'solver': 'simulated_annealing'을 붙여 반환)
+        Returns: {'best_solution', 'best_cost', 'proven_optimal', 'solver', 'nodes', 'pruned',
+                  'candidate_courses', 'iterations', 'evaluations', 'stop_reason', ...}
+        stop_reason은 탐색을 끝까지 마쳤으면 'optimal'
+        """
+        propagation = None
+        if self.sampler.constraint_propagation:
+            propagation = self.sampler.apply_constraint_propagation()
+            if verbose:
+                print(f"제약 전파: {propagation.summary()}")
+        domains = self.sampler.candidate_domains()
+        if len(domains) > self.max_courses:
+            if verbose:
+                print(f"후보 과목 {len(domains)}개 > {self.max_courses}개: 시뮬레이티드 어닐링으로 대체")
+            self.sampler.time_limit = self.time_limit if self.time_limit is not None else self.sampler.time_limit
+            self.sampler.target_cost = self.target_cost if self.target_cost is not None else self.sampler.target_cost
+            if self.max_evaluations is not None:
+                self.sampler.max_evaluations = self.max_evaluations
+            result = self.sampler.optimize(verbose=verbose, cancel_token=cancel_token)
+            result.update(solver='simulated_annealing', proven_optimal=False, candidate_courses=len(domains))
+            return result
+
+        result = _Search(self, domains, cancel_token, propagation.fixed if propagation else None).run(verbose)
+        result['propagation'] = propagation.to_dict() if propagation is not None else None
+        return result
+
+
+class _Search:
+    """BranchAndBoundSolver.optimize() 한 번의 탐색 상태"""
+
+    def __init__(self, solver, domains, cancel_token, fixed=None):
+        self.solver = solver
+        self.cancel_token = cancel_token
+        self.fixed = fixed or {}  # 필수과목코드 -> 제약 전파로 확정된 분반 ID (탐색 전에 넣어 둠)
+        cost_function = solver.cost_function
+        self.cost_function = cost_function
+        self.weights = cost_function.weights
+        self.time_parser = solver.time_parser
+
+        user_profile = solver.user_profile
+        self.completed_courses = set(user_profile['completed_courses'])
+        self.prerequisite_rules = user_profile['constraints']['prerequisite_rules']
+        self.area_requirements = user_profile['constraints']['area_requirements']
+        self.lunch_time_required = user_profile['preferences']['lunch_time_required']
+        self.min_credits = user_profile['min_credits']
+        self.max_credits = user_profile['max_credits']
+
+        self.required_multiplicity = {}
+        for required in user_profile['constraints']['required_courses']:
+            self.required_multiplicity[required] = self.required_multiplicity.get(required, 0) + 1
+
+        # 과목코드별 선택지 (분반 비용 항목은 증분 계산기와 같은 값)
+        evaluator = IncrementalCostEvaluator(cost_function)
+        periods = self.time_parser.PERIODS_PER_DAY
+        day_mask = (1 << periods) - 1
+        all_days = (1 << self.WEEKDAYS) - 1
+        # 평일 집합 D -> D의 모든 교시 비트마스크
+        self.weekday_masks = [sum(day_mask << (day_idx * periods) for day_idx in range(self.WEEKDAYS)
+                                  if days >> day_idx & 1)
+                              for days in range(all_days + 1)]
+        options_by_code = {}
+        for course_code, sids in domains.items():
+            options = []
+            for sid in sids:
+                terms = evaluator._section_terms(sid)
+                days = 0
+                for day_idx in range(self.WEEKDAYS):
+                    if (terms.mask >> (day_idx * periods)) & day_mask:
+                        days |= 1 << day_idx
+                weekday_periods = bin(terms.mask & self.weekday_masks[all_days]).count('1')
+                options.append(_Option(sid, terms.mask, terms.credits, evaluator.section_static_cost(sid),
+                                       terms.area, days, weekday_periods))
+            options.sort(key=lambda option: option.static_cost)
+            options_by_code[course_code] = options
+
+        # 변수 순서: 필수과목(분반 적은 순) → 나머지(학점당 비용 낮은 순)
+        def order_key(course_code):
+            options = options_by_code[course_code]
+            if course_code in self.required_multiplicity:
+                return (0, len(options), course_code)
+            best_ratio = min((option.static_cost / option.credits for option in options if option.credits > 0),
+                             default=float('inf'))
+            return (1, best_ratio, course_code)
+
+        self.codes = sorted(options_by_code, key=order_key)
+        self.options = [options_by_code[course_code] for course_code in self.codes]
+
+        # 평일 집합 D -> 공강 보상 비용, 점유 마스크 -> (연강 + 점심, 수업 평일 집합)
+        self.free_days_costs = [cost_function._free_days_bonus_cost(self.WEEKDAYS - bin(days).count('1'))
+                                for days in range(all_days + 1)]
+        self._day_costs = {}
+
+        self.best_cost = float('inf')
+        self.best_sids = []
+        self.nodes = 0
+        self.pruned = 0
+        self.stop_reason = None
+        self.improvements = []
+
+    WEEKDAYS = BranchAndBoundSolver.WEEKDAYS
+
+    def _occupancy_costs(self, occupied):
+        """점유 마스크의 (연강 + 점심 비용, 수업이 있는 평일 집합)"""
+        value = self._day_costs.get(occupied)
+        if value is None:
+            cost_function = self.cost_function
+            cost = 0
+            days = 0
+            for day_idx, day_bits in enumerate(self.time_parser.get_day_masks(occupied)[:self.WEEKDAYS]):
+                cost += cost_function._day_consecutive_cost(day_bits)
+                if self.lunch_time_required:
+                    cost += cost_function._day_lunch_cost(day_bits)
+                if day_bits:
+                    days |= 1 << day_idx
+            value = (cost, days)
+            self._day_costs[occupied] = value
+        return value
+
+    def _prerequisite_violations(self, selected_codes, reachable_codes=()):
+        """선택된 과목의 선수과목 중 이수/선택되지 않은 (그리고 reachable_codes에도 없는) 개수"""
+        violations = 0
+        for course_code in selected_codes:
+            for prerequisite in self.prerequisite_rules.get(course_code, ()):
+                if (prerequisite not in self.completed_courses and prerequisite not in selected_codes
+                        and prerequisite not in reachable_codes):
+                    violations += 1
+        return violations
+
+    def _solution_cost(self, selected_codes, occupied, credits, static_cost, area_counts):
+        """현재 선택만으로 된 해의 총 비용 (calculate_total_cost와 같은 값, 시간 충돌 없음)"""
+        weights = self.weights
+        day_cost, days = self._occupancy_costs(occupied)
+        required_missing = sum(multiplicity for course_code, multiplicity in self.required_multiplicity.items()
+                               if course_code not in selected_codes)
+        return (self._prerequisite_violations(selected_codes) * weights['prerequisite_violation']
+                + self.cost_function._credit_cost_from_total(credits)
+                + required_missing * weights['required_course_missing']
+                + day_cost + static_cost
+                + self.cost_function._area_cost_from_counts(area_counts)
+                + self.free_days_costs[days])
+
+    def _lower_bound_exceeds(self, remaining, selected_codes, occupied, credits, static_cost, area_counts,
+                             limit):
+        """
+        remaining(아직 정하지 않은 (변수 번호, 겹치지 않는 선택지) 목록)으로 만들 수 있는 모든 해의
+        비용 하한이 limit 이상인지 (평일 집합 D마다 하한을 구하다가 limit보다 작은 것이 있으면 False)
+        """
+        day_cost, current_days = self._occupancy_costs(occupied)
+        base = day_cost + static_cost
+        if credits > self.max_credits:
+            # 학점 초과는 더 넣을수록 커지므로 고정
+            base += (credits - self.max_credits) * self.weights['credit_excess']
+        area_deficit = 0
+        for area, required_count in self.area_requirements.items():
+            if required_count > area_counts.get(area, 0):
+                area_deficit += required_count - area_counts.get(area, 0)
+        state = (remaining, selected_codes, occupied, credits, area_counts, area_deficit)
+
+        # D가 커질수록 공강 보상은 줄고(비용 증가) 나머지 하한은 줄어들기만 하므로,
+        # 평일 전체 기준 나머지 하한으로도 limit을 넘는 D는 따로 계산하지 않는다
+        all_days = (1 << self.WEEKDAYS) - 1
+        loosest = self._remaining_bound(state, all_days)
+        missing_days = all_days & ~current_days
+        extra = missing_days
+        while True:
+            days = current_days | extra
+            bound = base + self.free_days_costs[days]
+            if bound + loosest < limit:
+                if days == all_days or bound + self._remaining_bound(state, days) < limit:
+                    return False
+            if not extra:
+                break
+            extra = (extra - 1) & missing_days
+        return True
+
+    def _remaining_bound(self, state, days):
+        """
+        수업이 평일 집합 days 안에만 있는 완성 해들에 대해, 확정된 분반/요일 비용을 뺀 나머지 비용의 하한
+        (학점 + 더할 분반의 정적 비용 + 교양영역 + 필수과목 + 선수과목)
+        """
+        remaining, selected_codes, occupied, credits, area_counts, area_deficit = state
+        weights = self.weights
+        shortage_weight = weights['credit_shortage']
+        area_weight = weights['area_requirement_violation']
+        shortage = self.min_credits - credits
+        outside = ~days
+
+        fill_items = []      # (학점당 정적 비용, 최대 학점)
+        density_items = []   # (교시당 학점, 최대 학점)
+        area_available = {}
+        area_credits = None  # 교양영역 분반의 최소 학점
+        reachable_codes = set()
+        bound = 0
+        for var, options in remaining:
+            best_ratio = None
+            best_density = 0
+            capacity = 0
+            lowest = None
+            areas = None
+            for option in options:
+                if option.days & outside:
+                    continue
+                if lowest is None or option.static_cost < lowest:
+                    lowest = option.static_cost
+                if option.credits > 0:
+                    ratio = max(option.static_cost, 0) / option.credits
+                    if best_ratio is None or ratio < best_ratio:
+                        best_ratio = ratio
+                    if option.credits > capacity:
+                        capacity = option.credits
+                    density = option.credits / option.periods if option.periods else float('inf')
+                    if density > best_density:
+                        best_density = density
+                if option.area:
+                    if areas is None:
+                        areas = {option.area}
+                    else:
+                        areas.add(option.area)
+                    if area_credits is None or option.credits < area_credits:
+                        area_credits = option.credits
+            if lowest is None:
+                continue
+            reachable_codes.add(self.codes[var])
+            if lowest < 0:
+                bound += lowest
+            if best_ratio is not None:
+                fill_items.append((best_ratio, capacity))
+                density_items.append((best_density, capacity))
+            if areas:
+                for area in areas:
+                    area_available[area] = area_available.get(area, 0) + 1
+
+        # 교양영역: 후보가 없어 채울 수 없는 부족분은 확정, 나머지는 더하는 학점에 따라 채울 수 있음
+        coverable = area_deficit
+        for area, required_count in self.area_requirements.items():
+            missing = required_count - area_counts.get(area, 0) - area_available.get(area, 0)
+            if missing > 0:
+                bound += missing * area_weight
+                coverable -= missing
+
+        # 더할 수 있는 최대 학점: 과목별 최대 학점 합과, D의 빈 교시를 학점/교시가 큰 분반부터 채운 값
+        free_periods = self._free_periods(occupied, days)
+        max_added = 0
+        density_items.sort(reverse=True)
+        for density, capacity in density_items:
+            needed_periods = capacity / density
+            if free_periods >= needed_periods:
+                max_added += capacity
+                free_periods -= needed_periods
+            else:
+                max_added += free_periods * density
+                break
+
+        # 더하는 학점 T에 대한 (정적 비용 분수 배낭 + 학점 비용 + 채우지 못한 교양영역)의 최소:
+        # 앞의 둘은 T에 대해 볼록하고 최솟점은 min(부족 학점, max_added, 부족 비용보다 싼 학점),
+        # 교양영역은 T가 교양 분반 최소 학점의 배수를 넘을 때만 줄어드므로 그 점들만 보면 된다
+        fill_items.sort()
+        cheap_credits = 0
+        for ratio, capacity in fill_items:
+            if ratio >= shortage_weight:
+                break
+            cheap_credits += capacity
+        best_added = max(0, min(shortage, max_added, cheap_credits))
+        candidates = {best_added}
+        if coverable > 0 and area_credits:
+            for count in range(1, coverable + 1):
+                if count * area_credits > max_added:
+                    break
+                candidates.add(max(count * area_credits, best_added))
+
+        excess_threshold = self.max_credits - credits
+        best_added_cost = None
+        for added in candidates:
+            added_cost = self._fill_cost(fill_items, added)
+            if added < shortage:
+                added_cost += (shortage - added) * shortage_weight
+            elif added > excess_threshold:
+                added_cost += (added - max(excess_threshold, 0)) * weights['credit_excess']
+            covered = coverable
+            if area_credits:
+                covered = min(coverable, int(added // area_credits))
+            added_cost += (coverable - covered) * area_weight
+            if best_added_cost is None or added_cost < best_added_cost:
+                best_added_cost = added_cost
+        bound += best_added_cost
+
+        for course_code, multiplicity in self.required_multiplicity.items():
+            if course_code not in selected_codes and course_code not in reachable_codes:
+                bound += multiplicity * weights['required_course_missing']
+
+        bound += (self._prerequisite_violations(selected_codes, reachable_codes)
+                  * weights['prerequisite_violation'])
+        return bound
+
+    @staticmethod
+    def _fill_cost(fill_items, credits):
+        """학점당 정적 비용이 낮은 과목부터 credits학점을 (분수로) 채우는 비용"""
+        cost = 0
+        for ratio, capacity in fill_items:
+            if credits <= 0:
+                break
+            amount = capacity if capacity < credits else credits
+            cost += ratio * amount
+            credits -= amount
+        return cost
+
+    def _free_periods(self, occupied, days):
+        """평일 집합 days에서 비어 있는 교시 수"""
+        return bin(self.weekday_masks[days] & ~occupied).count('1')
+
+    def _check_stop(self):
+        solver = self.solver
+        if solver.max_nodes is not None and self.nodes >= solver.max_nodes:
+            return 'max_nodes'
+        if solver.max_evaluations is not None and self.nodes >= solver.max_evaluations:
+            return 'max_evaluations'
+        if solver.target_cost is not None and self.best_cost <= solver.target_cost:
+            return 'target_cost'
+        if solver.time_limit is not None and time.perf_counter() - self.start_clock >= solver.time_limit:
+            return 'time_limit'
+        if self.cancel_token is not None:
+            return self.cancel_token.reason
+        return None
+
+    def _visit(self, remaining, selected_sids, selected_codes, occupied, credits, static_cost, area_counts):
+        """현재 선택을 해로 평가하고, remaining 중 하나를 더 넣는 가지들을 탐색"""
+        self.nodes += 1
+        if self.nodes % 1024 == 0:
+            self.stop_reason = self._check_stop()
+        if self.stop_reason is not None:
+            return
+
+        cost = self._solution_cost(selected_codes, occupied, credits, static_cost, area_counts)
+        if cost < self.best_cost:
+            self.best_cost = cost
+            self.best_sids = list(selected_sids)
+            self.improvements.append((time.perf_counter() - self.start_clock, self.nodes, cost))
+            if self.solver.target_cost is not None and cost <= self.solver.target_cost:
+                self.stop_reason = 'target_cost'
+                return
+
+        if not remaining:
+            return
+        if self._lower_bound_exceeds(remaining, selected_codes, occupied, credits, static_cost, area_counts,
+                                     self.best_cost):
+            self.pruned += 1
+            return
+
+        # 변수 순서대로 다음에 넣을 과목 하나를 고른다 (앞 변수들은 넣지 않은 것으로 확정)
+        for position, (var, options) in enumerate(remaining):
+            course_code = self.codes[var]
+            later = remaining[position + 1:]
+            for option in options:
+                child_occupied = occupied | option.mask
+                child_remaining = []
+                for other_var, other_options in later:
+                    compatible = [other for other in other_options if not other.mask & child_occupied]
+                    if compatible:
+                        child_remaining.append((other_var, compatible))
+
+                child_area_counts = area_counts
+                if option.area:
+                    child_area_counts = dict(area_counts)
+                    child_area_counts[option.area] = child_area_counts.get(option.area, 0) + 1
+
+                selected_sids.append(option.sid)
+                selected_codes.add(course_code)
+                self._visit(child_remaining, selected_sids, selected_codes, child_occupied,
+                            credits + option.credits, static_cost + option.static_cost, child_area_counts)
+                selected_sids.pop()
+                selected_codes.discard(course_code)
+                if self.stop_reason is not None:
+                    return
+
+    def run(self, verbose):
+        self.start_clock = time.perf_counter()
+        solver = self.solver
+
+        self.stop_reason = None
+        if solver.max_evaluations is not None and solver.max_evaluations <= 0:
+            self.stop_reason = 'max_evaluations'
+        elif self.cancel_token is not None:
+            self.stop_reason = self.cancel_token.reason
+
+        if verbose:
+            print(f"분기 한정법: 후보 과목 {len(self.codes)}개, 분반 {sum(map(len, self.options))}개")
+
+        if self.stop_reason is None:
+            selected_sids = []
+            selected_codes = set()
+            occupied = credits = static_cost = 0
+            area_counts = {}
+            for var, options in enumerate(self.options):
+                fixed_sid = self.fixed.get(self.codes[var])
+                for option in options:
+                    if option.sid == fixed_sid:
+                        selected_sids.append(option.sid)
+                        selected_codes.add(self.codes[var])
+                        occupied |= option.mask
+                        credits += option.credits
+                        static_cost += option.static_cost
+                        if option.area:
+                            area_counts[option.area] = area_counts.get(option.area, 0) + 1
+            remaining = []
+            for var, options in enumerate(self.options):
+                if self.codes[var] in selected_codes:
+                    continue
+                compatible = [option for option in options if not option.mask & occupied]
+                if compatible:
+                    remaining.append((var, compatible))
+            self._visit(remaining, selected_sids, selected_codes, occupied, credits, static_cost, area_counts)
+
+        stop_reason = self.stop_reason or 'optimal'
+        if verbose:
+            print(f"탐색 완료! 최적 비용 = {self.best_cost:.2f} (노드 {self.nodes}, 가지치기 {self.pruned}, "
+                  f"종료 이유: {stop_reason})")
+
+        return {
+            'best_solution': SolutionState(solver.catalog, self.best_sids).to_selections(),
+            'best_cost': self.best_cost,
+            'proven_optimal': stop_reason == 'optimal',
+            'solver': 'branch_and_bound',
+            'candidate_courses': len(self.codes),
+            'nodes': self.nodes,
+            'pruned': self.pruned,
+            'iterations': self.nodes,
+            'evaluations': self.nodes,
+            'stop_reason': stop_reason,
+            'elapsed_seconds': time.perf_counter() - self.start_clock,
+            'improvements': self.improvements
+        }
@@ -0,0 +1,262 @@
+import random
+import time
+
+import numpy as np
+
+from optimizer_base import Optimizer, register_optimizer
+from progress import DownsampledHistory
+from simulated_annealing import TimetableSimulatedAnnealing
+from solution_state import SolutionState
+from vectorized_cost import VectorizedCostFunction
+
+
+@register_optimizer('genetic_algorithm')
+class GeneticAlgorithm(Optimizer):
+    """
+    유전 알고리즘 최적화
+    개체는 과목코드가 겹치지 않는 분반 ID 목록이다.
+    - 선택: 토너먼트 선택, 상위 elite_count개는 그대로 다음 세대로
+    - 교차: 과목 단위 균등 교차 (두 부모에 모두 있는 과목은 유지하고 분반은 한쪽에서,
+            한쪽에만 있는 과목은 1/2 확률로 포함, 필수과목은 항상 포함)
+    - 변이: SA 이웃 이동(TimetableSimulatedAnnealing._propose_move)을 1~max_mutation_moves회 적용
+    - 수리: 시간이 겹치는 분반은 같은 과목의 겹치지 않는 분반으로 바꾸고, 없으면 (필수과목이 아니면) 뺀다
+    sampler의 constraint_propagation을 켜면 줄인 후보 분반만 쓰고, 확정된 필수과목 분반은 바꾸지 않는다.
+    세대마다 자식 전체를 VectorizedCostFunction으로 한 번에 채점한다.
+    """
+
+    PARAMETER_NAMES = ['population_size', 'generations', 'tournament_size', 'crossover_rate',
+                       'mutation_rate', 'max_mutation_moves', 'elite_count', 'max_no_improvement',
+                       'time_limit', 'target_cost', 'max_evaluations', 'history_points']
+
+    def __init__(self, user_profile, course_database, time_parser, cost_function):
+        # 초기 해/변이 이동 생성기 (feasible_moves 등 SA 파라미터는 sampler에 설정)
+        self.sampler = TimetableSimulatedAnnealing(user_profile, course_database, time_parser, cost_function)
+        self.catalog = self.sampler.catalog
+        self.user_profile = user_profile
+        self.time_parser = time_parser
+        self.cost_function = cost_function
+        self.required_courses = set(user_profile['constraints']['required_courses'])
+
+        self.population_size = 40
+        self.generations = 200
+        self.tournament_size = 3
+        self.crossover_rate = 0.9
+        self.mutation_rate = 0.5
+        self.max_mutation_moves = 2
+        self.elite_count = 2
+
+        # 조기 종료 조건 (None이면 사용하지 않음)
+        self.max_no_improvement = None   # 최적해 개선 없이 진행할 최대 세대 수
+        self.time_limit = None
+        self.target_cost = None
+        self.max_evaluations = None      # 채점한 개체 수 상한 (세대 단위로 확인)
+
+        # 세대별 최적 비용 히스토리 최대 점 수
+        self.history_points = 1000
+
+        # 일괄 비용 계산기 (처음 optimize할 때 후보 분반 열만으로 구성)
+        self._batch_cost_function = None
+
+    def set_parameters(self, parameters):
+        """파라미터 일괄 설정 (이동 생성 옵션 등 SA 파라미터는 sampler로 전달)"""
+        for name, value in parameters.items():
+            if name in self.PARAMETER_NAMES:
+                setattr(self, name, value)
+            else:
+                self.sampler.set_parameters({name: value})
+
+    @property
+    def batch_cost_function(self):
+        """해에 들어갈 수 있는 분반(추가 가능 과목, 필수/희망 과목의 모든 분반)을 열로 쓰는 VectorizedCostFunction"""
+        if self._batch_cost_function is None:
+            course_codes = set(self.sampler.available_section_ids)
+            course_codes.update(self.catalog.courses[sid]['course_code']
+                                for sid in self.sampler.eligibility.section_ids)
+            section_ids = sorted(sid for course_code in course_codes
+                                 for sid in self.catalog.get_section_ids(course_code))
+            self._batch_cost_function = VectorizedCostFunction(self.user_profile, self.catalog,
+                                                               self.time_parser, section_ids)
+        return self._batch_cost_function
+
+    def _evaluate(self, population):
+        """개체 목록의 총 비용 (한 번의 일괄 계산)"""
+        batch_cost_function = self.batch_cost_function
+        column_of = batch_cost_function.column_of
+        matrix = np.zeros((len(population), len(batch_cost_function.section_ids)), dtype=np.uint8)
+        for row, sids in enumerate(population):
+            for sid in sids:
+                matrix[row, column_of[sid]] = 1
+        return batch_cost_function.calculate_batch_costs(matrix).tolist()
+
+    def _course_code(self, sid):
+        return self.catalog.courses[sid]['course_code']
+
+    def _random_individual(self):
+        initial_solution = self.sampler.generate_initial_solution()
+        return self._repair(SolutionState.from_selections(self.catalog, initial_solution).sids)
+
+    def _tournament(self, population, costs):
+        contenders = random.sample(range(len(population)), min(self.tournament_size, len(population)))
+        return population[min(contenders, key=costs.__getitem__)]
+
+    def _crossover(self, first, second):
+        """과목 단위 균등 교차"""
+        sections_by_code = {}
+        for sid in first:
+            sections_by_code.setdefault(self._course_code(sid), []).append(sid)
+        for sid in second:
+            sections_by_code.setdefault(self._course_code(sid), []).append(sid)
+
+        child = []
+        for course_code, sids in sections_by_code.items():
+            if len(sids) > 1 or course_code in self.required_courses or random.random() < 0.5:
+                child.append(random.choice(sids))
+        return child
+
+    def _mutate(self, sids):
+        """SA 이웃 이동을 1~max_mutation_moves회 적용"""
+        state = SolutionState(self.catalog, sids)
+        for _ in range(random.randint(1, self.max_mutation_moves)):
+            move = self.sampler._propose_move(state)
+            if move is not None:
+                state.apply(move)
+        return state.sids
+
+    def _repair(self, sids):
+        """시간 충돌 제거 (확정된 분반, 필수과목 순으로 배치, 겹치면 같은 과목의 다른 분반으로, 없으면 제외)"""
+        sampler = self.sampler
+        ordered = sorted(sids, key=lambda sid: (sid not in sampler.fixed_section_ids,
+                                                self._course_code(sid) not in self.required_courses))
+
+        repaired = []
+        seen_codes = set()
+        occupied = 0
+        for sid in ordered:
+            course_code = self._course_code(sid)
+            if course_code in seen_codes:
+                continue
+            mask = sampler._section_mask(sid)
+            if mask & occupied:
+                alternatives = sampler._conflict_free(sampler._section_choices(sid), occupied)
+                if alternatives:
+                    sid = random.choice(alternatives)
+                    mask = sampler._section_mask(sid)
+                elif course_code not in self.required_courses:
+                    continue
+            repaired.append(sid)
+            seen_codes.add(course_code)
+            occupied |= mask
+        return repaired
+
+    def optimize(self, verbose=True, cancel_token=None):
+        """
+        유전 알고리즘 실행
+        Returns: {'best_solution', 'best_cost', 'iterations'(세대 수), 'evaluations', 'stop_reason',
+                  'propagation', ...}
+        """
+        start_clock = time.perf_counter()
+        # 제약 전파를 켜면 초기 해, 교차 후 수리(_section_choices), 변이 모두 줄인 후보 분반 안에서 만든다
+        propagation = None
+        if self.sampler.constraint_propagation:
+            propagation = self.sampler.apply_constraint_propagation()
+            if verbose:
+                print(f"제약 전파: {propagation.summary()}")
+        self.batch_cost_function  # 색인 구성은 실행 시간에 포함
+
+        population = [self._random_individual() for _ in range(self.population_size)]
+        costs = self._evaluate(population)
+        evaluations = len(population)
+
+        best_index = min(range(len(population)), key=costs.__getitem__)
+        best_cost = costs[best_index]
+        best_sids = list(population[best_index])
+        improvements = [(time.perf_counter() - start_clock, evaluations, best_cost)]
+
+        history = DownsampledHistory(self.history_points) if self.history_points != 0 else None
+        generation = 0
+        last_improvement = 0
+        elite_count = min(self.elite_count, len(population))
+
+        stop_reason = 'max_iterations' if self.generations <= 0 else None
+        if stop_reason is None and self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            stop_reason = 'max_evaluations'
+        if stop_reason is None and self.target_cost is not None and best_cost <= self.target_cost:
+            stop_reason = 'target_cost'
+        if stop_reason is None and cancel_token is not None:
+            stop_reason = cancel_token.reason
+
+        if verbose:
+            print(f"초기 세대: 최적 비용 = {best_cost:.2f}, 개체 수 = {len(population)}")
+
+        while stop_reason is None:
+            # 엘리트 보존
+            ranked = sorted(range(len(population)), key=costs.__getitem__)
+            next_population = [population[i] for i in ranked[:elite_count]]
+            next_costs = [costs[i] for i in ranked[:elite_count]]
+
+            # 선택 → 교차 → 변이 → 수리
+            children = []
+            while len(next_population) + len(children) < self.population_size:
+                first = self._tournament(population, costs)
+                if random.random() < self.crossover_rate:
+                    child = self._crossover(first, self._tournament(population, costs))
+                else:
+                    child = list(first)
+                if random.random() < self.mutation_rate:
+                    child = self._mutate(child)
+                child = self._repair(child)
+                if not child:
+                    child = self._random_individual()
+                children.append(child)
+
+            if children:
+                child_costs = self._evaluate(children)
+                evaluations += len(children)
+                next_population.extend(children)
+                next_costs.extend(child_costs)
+            population = next_population
+            costs = next_costs
+            generation += 1
+
+            generation_best = min(range(len(population)), key=costs.__getitem__)
+            if costs[generation_best] < best_cost:
+                best_cost = costs[generation_best]
+                best_sids = list(population[generation_best])
+                last_improvement = generation
+                improvements.append((time.perf_counter() - start_clock, evaluations, best_cost))
+
+            if history is not None:
+                history.record(generation, best_cost)
+
+            if verbose and generation % 20 == 0:
+                print(f"세대 {generation}: 최적 비용 = {best_cost:.2f}")
+
+            # 종료 조건 확인
+            if generation >= self.generations:
+                stop_reason = 'max_iterations'
+            elif self.target_cost is not None and best_cost <= self.target_cost:
+                stop_reason = 'target_cost'
+            elif self.max_no_improvement is not None and generation - last_improvement >= self.max_no_improvement:
+                stop_reason = 'no_improvement'
+            elif self.time_limit is not None and time.perf_counter() - start_clock >= self.time_limit:
+                stop_reason = 'time_limit'
+            elif self.max_evaluations is not None and evaluations >= self.max_evaluations:
+                stop_reason = 'max_evaluations'
+            elif cancel_token is not None:
+                stop_reason = cancel_token.reason
+
+        if verbose:
+            print(f"최적화 완료! 최종 비용 = {best_cost:.2f} (세대 {generation}, 종료 이유: {stop_reason})")
+
+        return {
+            'best_solution': SolutionState(self.catalog, best_sids).to_selections(),
+            'best_cost': best_cost,
+            'cost_history': history.costs if history is not None else [],
+            'history_iterations': history.iterations if history is not None else [],
+            'iterations': generation,
+            'evaluations': evaluations,
+            'stop_reason': stop_reason,
+            'elapsed_seconds': time.perf_counter() - start_clock,
+            'improvements': improvements,
+            'propagation': propagation.to_dict() if propagation is not None else None
+        }
@@ -0,0 +1,64 @@
+import math
+import time
+
+
+class OptimizationProfiler:
+    """
+    최적화 실행 계측 (선택 사항)
+    - 이름별 호출 횟수/누적 시간 (비용 항목, 이웃 이동 종류, 초기 해 생성 등)
+    - 온도 구간(10의 거듭제곱 단위)별 수락률
+    계측을 끈 경우에는 이 객체를 만들지 않고 호출부에서 None 검사만 한다.
+    """
+
+    def __init__(self):
+        self.timers = {}        # 이름 -> [호출 횟수, 누적 시간(초)]
+        self.acceptance = {}    # 온도 구간 -> [제안 수, 수락 수]
+        self.clock = time.perf_counter
+
+    def record(self, name, elapsed):
+        """이름별 호출 1회와 소요 시간 기록"""
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, elapsed]
+        else:
+            timer[0] += 1
+            timer[1] += elapsed
+
+    def record_acceptance(self, temperature, accepted):
+        """온도 구간별 제안/수락 기록"""
+        band = self.temperature_band(temperature)
+        counts = self.acceptance.get(band)
+        if counts is None:
+            counts = self.acceptance[band] = [0, 0]
+        counts[0] += 1
+        if accepted:
+            counts[1] += 1
+
+    @staticmethod
+    def temperature_band(temperature):
+        """온도를 [10^k, 10^(k+1)) 구간 이름으로 변환"""
+        if temperature <= 0:
+            return "0"
+        exponent = math.floor(math.log10(temperature))
+        return f"{10.0 ** exponent:g}-{10.0 ** (exponent + 1):g}"
+
+    def summary(self):
+        """계측 결과 딕셔너리 (누적 시간이 큰 순서)"""
+        timers = {}
+        for name, (calls, total) in sorted(self.timers.items(), key=lambda item: -item[1][1]):
+            timers[name] = {
+                'calls': calls,
+                'total_seconds': total,
+                'mean_us': total / calls * 1e6
+            }
+
+        acceptance = {}
+        for band, (proposed, accepted) in sorted(self.acceptance.items(),
+                                                 key=lambda item: -float(item[0].split('-')[0])):
+            acceptance[band] = {
+                'proposed': proposed,
+                'accepted': accepted,
+                'rate': accepted / proposed if proposed else 0.0
+            }
+
+        return {'timers': timers, 'acceptance_by_temperature': acceptance}
@@ -2,103 +2,245 @@
 # -*- coding: utf-8 -*-
 """
 시뮬레이티드 어닐링을 이용한 자동 시간표 생성 시스템
+
+사용법:
+    python main.py [optimize] [--catalog 경로] [--profile 경로] [--seed N] [--no-plot | --plot-to 파일] [--quiet]
+                   [--progress-bar] [--progress-jsonl 파일] [--exact]
+    python main.py batch | compile-catalog | serve | benchmark | compare  [각 모듈의 인자...]
+
+matplotlib 등 무거운 라이브러리는 그래프를 그릴 때만 불러온다 (최적화만 할 때의 시작 시간 단축).
 """
 
+import time
+
+_PROCESS_START = time.perf_counter()
+
+import argparse
+import contextlib
 import json
-import matplotlib.pyplot as plt
-import numpy as np
+import os
+import random
+import sys
 
 # 앞서 구현한 클래스들을 import
+from course_catalog import CourseCatalog
 from time_parser import TimeTableParser
 from cost_function import TimetableCostFunction  
 from simulated_annealing import TimetableSimulatedAnnealing
+from result_writer import build_result_payload
+
+# 최적화만 하는 경로(그래프 없음)의 시작 시간 예산: 프로세스 시작부터 최적화 시작까지
+STARTUP_BUDGET_SECONDS = 0.5
 
-def load_data():
-    """JSON 파일에서 데이터 로드"""
+# 다른 모듈의 CLI로 넘기는 하위 명령 -> 모듈 이름
+SUBCOMMAND_MODULES = {
+    'batch': 'batch',
+    'compile-catalog': 'catalog_snapshot',
+    'serve': 'service',
+    'benchmark': 'benchmark',
+    'compare': 'comparison',
+}
+
+def load_data(catalog_path='data/courses.json', profile_path='data/user_profile.json', time_parser=None):
+    """
+    JSON 파일에서 데이터 로드
+    catalog_path가 디렉터리면 컴파일된 스냅샷으로 보고 CourseCatalog를 반환
+    (time_parser를 주면 스냅샷의 시간표 마스크로 파서 캐시를 채움)
+    """
     try:
         # 과목 데이터 로드
-        with open('data/courses.json', 'r', encoding='utf-8') as f:
-            course_database = json.load(f)
+        if os.path.isdir(catalog_path):
+            from catalog_snapshot import load_catalog
+            course_database = load_catalog(catalog_path, time_parser)
+        else:
+            with open(catalog_path, 'r', encoding='utf-8') as f:
+                course_database = json.load(f)
         
         # 사용자 프로필 로드
-        with open('data/user_profile.json', 'r', encoding='utf-8') as f:
+        with open(profile_path, 'r', encoding='utf-8') as f:
             user_profile = json.load(f)
         
         return course_database, user_profile
     
     except FileNotFoundError as e:
         print(f"❌ 파일을 찾을 수 없습니다: {e}")
-        print("data/ 폴더에 courses.json과 user_profile.json 파일이 있는지 확인해주세요.")
+        print("--catalog / --profile 경로(기본: data/courses.json, data/user_profile.json)를 확인해주세요.")
         return None, None
     except json.JSONDecodeError as e:
         print(f"❌ JSON 파일 형식 오류: {e}")
         return None, None
 
-def plot_optimization_progress(cost_history, temperature_history):
-    """최적화 과정 시각화"""
+def plot_optimization_progress(cost_history, temperature_history, output_path=None, iterations=None):
+    """
+    최적화 과정 시각화
+    output_path가 있으면 화면에 띄우지 않고 이미지 파일로 저장
+    iterations: 각 점의 반복 번호 (솎아낸 히스토리용, None이면 0부터 순서대로)
+    """
+    if iterations is None:
+        iterations = range(len(cost_history))
+    import matplotlib
+    if output_path:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
     
     # 비용 변화
-    ax1.plot(cost_history, 'b-', alpha=0.7)
+    ax1.plot(iterations, cost_history, 'b-', alpha=0.7)
     ax1.set_xlabel('Iteration')
     ax1.set_ylabel('Cost')
     ax1.set_title('Simulated Annealing Cost Progress')
     ax1.grid(True, alpha=0.3)
     
     # 온도 변화
-    ax2.plot(temperature_history, 'r-', alpha=0.7)
+    ax2.plot(iterations, temperature_history, 'r-', alpha=0.7)
     ax2.set_xlabel('Iteration')
     ax2.set_ylabel('Temperature')
     ax2.set_title('Temperature Schedule')
     ax2.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.show()
+    if output_path:
+        fig.savefig(output_path)
+        plt.close(fig)
+    else:
+        plt.show()
+
+def _has_display():
+    """그래프 창을 띄울 수 있는 환경인지 (리눅스에서 DISPLAY/WAYLAND_DISPLAY가 없으면 헤드리스)"""
+    if sys.platform.startswith('linux'):
+        return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+    return True
+
+def compare_algorithms(course_database, user_profile, **options):
+    """
+    등록된 최적화 알고리즘을 같은 예산으로 여러 시드 실행해 비교 (comparison.compare_algorithms)
+    options: algorithms, seeds, max_evaluations, time_limit, target_cost, workers, parameters
+    """
+    from comparison import compare_algorithms as run_comparison
+    return run_comparison(course_database, user_profile, **options)
 
-def compare_algorithms():
-    """다른 최적화 알고리즘과 성능 비교 (미래 확장)"""
-    # TODO: 유전 알고리즘, 타부 서치 등과 비교
-    pass
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(
+        description="시뮬레이티드 어닐링 기반 자동 시간표 생성",
+        epilog="다른 하위 명령: " + ", ".join(SUBCOMMAND_MODULES) + " (python main.py <명령> --help)"
+    )
+    arg_parser.add_argument('--catalog', default='data/courses.json',
+                            help="과목 데이터 (courses.json 또는 컴파일된 스냅샷 디렉터리)")
+    arg_parser.add_argument('--profile', default='data/user_profile.json', help="사용자 프로필 JSON")
+    arg_parser.add_argument('--seed', type=int, default=None, help="난수 시드 (재현용)")
+    plot_group = arg_parser.add_mutually_exclusive_group()
+    plot_group.add_argument('--no-plot', action='store_true', help="최적화 과정 그래프를 그리지 않음")
+    plot_group.add_argument('--plot-to', metavar='FILE', default=None, help="그래프를 이미지 파일로 저장")
+    arg_parser.add_argument('--quiet', '-q', action='store_true', help="진행 상황/결과를 출력하지 않음")
+    arg_parser.add_argument('--instrument', action='store_true',
+                            help="비용 항목/이웃 이동별 시간과 수락률을 로그에 기록")
+    arg_parser.add_argument('--progress-bar', action='store_true', help="tqdm 진행 막대 표시 (표준 에러)")
+    arg_parser.add_argument('--progress-jsonl', metavar='FILE', default=None,
+                            help="반복별 진행 이벤트를 JSONL 파일로 기록")
+    arg_parser.add_argument('--progress-every', type=int, default=1, metavar='N',
+                            help="--progress-jsonl에 N번째 반복마다 기록 (기본 1)")
+    arg_parser.add_argument('--exact', action='store_true',
+                            help="분기 한정법으로 정확한 최적해 탐색 (후보 과목이 많으면 SA로 대체)")
+    arg_parser.add_argument('--propagate', action='store_true',
+                            help="최적화 전에 제약 전파로 들어갈 수 없는 분반을 후보에서 제거")
+    arg_parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET_SECONDS,
+                            help="시작 시간 예산(초), 넘으면 경고")
+    return arg_parser
 
-def main():
-    """메인 실행 함수"""
+def main(argv=None):
+    """명령줄 진입점: 하위 명령이면 해당 모듈로 넘기고, 아니면 시간표 최적화 실행"""
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    if argv and argv[0] in SUBCOMMAND_MODULES:
+        import importlib
+        return importlib.import_module(SUBCOMMAND_MODULES[argv[0]]).main(argv[1:])
+    if argv and argv[0] == 'optimize':
+        argv = argv[1:]
+    
+    args = build_arg_parser().parse_args(argv)
+    if args.quiet:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            return run_optimization(args)
+    return run_optimization(args)
+
+def run_optimization(args):
+    """시간표 최적화 실행"""
     print("=" * 60)
     print("시뮬레이티드 어닐링 기반 자동 시간표 생성 시스템")
     print("=" * 60)
     
     # 1. 데이터 로드
     print("\n1. 데이터 로딩...")
-    course_db, user_profile = load_data()
+    time_parser = TimeTableParser()  # 스냅샷을 읽을 때 시간표 마스크 캐시를 채우도록 먼저 생성
+    course_db, user_profile = load_data(args.catalog, args.profile, time_parser)
     
     if course_db is None or user_profile is None:
         print("❌ 데이터 로딩 실패. 프로그램을 종료합니다.")
         return
     
-    print(f"✅ 과목 데이터: {len(course_db['courses'])}개 과목 로드됨")
+    if args.seed is not None:
+        random.seed(args.seed)
+    
+    # 과목 색인은 한 번만 구성해 공유 (스냅샷이면 이미 CourseCatalog)
+    catalog = course_db if isinstance(course_db, CourseCatalog) else CourseCatalog(course_db)
+    print(f"✅ 과목 데이터: {len(catalog)}개 과목 로드됨")
     print(f"✅ 사용자: {user_profile['name']} ({user_profile['current_year']}학년)")
     print(f"✅ 원하는 과목: {len(user_profile['wanted_courses'])}개")
     
     # 2. 시스템 초기화
     print("\n2. 시스템 초기화...")
-    time_parser = TimeTableParser()
-    cost_function = TimetableCostFunction(user_profile, course_db, time_parser)
-    sa_optimizer = TimetableSimulatedAnnealing(user_profile, course_db, time_parser, cost_function)
+    cost_function = TimetableCostFunction(user_profile, catalog, time_parser)
+    sa_optimizer = TimetableSimulatedAnnealing(user_profile, catalog, time_parser, cost_function)
     
-    # SA 파라미터 설정
-    sa_optimizer.initial_temperature = 1000.0
-    sa_optimizer.final_temperature = 1.0
-    sa_optimizer.cooling_rate = 0.95
-    sa_optimizer.max_iterations = 1000
+    # SA 파라미터 설정 (기본값은 TimetableSimulatedAnnealing, 프로필의 'sa_parameters'로 덮어쓰기)
+    sa_optimizer.set_parameters(user_profile.get('sa_parameters', {}))
+    if args.instrument:
+        sa_optimizer.enable_profiling = True
+    if args.propagate:
+        sa_optimizer.constraint_propagation = True
     
     print("시뮬레이티드 어닐링 파라미터:")
-    print(f"  - 초기 온도: {sa_optimizer.initial_temperature}")
+    print(f"  - 냉각 스케줄: {sa_optimizer.cooling_schedule}")
+    if sa_optimizer.auto_initial_temperature:
+        print(f"  - 초기 온도: 자동 보정 (목표 수락률 {sa_optimizer.target_initial_acceptance})")
+    else:
+        print(f"  - 초기 온도: {sa_optimizer.initial_temperature}")
     print(f"  - 최종 온도: {sa_optimizer.final_temperature}")
     print(f"  - 냉각률: {sa_optimizer.cooling_rate}")
     print(f"  - 최대 반복: {sa_optimizer.max_iterations}")
     
+    # 시작 시간 (프로세스 시작 ~ 최적화 직전)
+    startup_seconds = time.perf_counter() - _PROCESS_START
+    print(f"  - 시작 시간: {startup_seconds * 1000:.1f}ms")
+    if startup_seconds > args.startup_budget:
+        print(f"⚠️ 시작 시간 {startup_seconds:.3f}초가 예산 {args.startup_budget}초를 넘었습니다.",
+              file=sys.stderr)
+    
     # 3. 최적화 실행
     print("\n3. 시간표 최적화 실행...")
-    result = sa_optimizer.optimize(verbose=True)
+    progress_sinks = []
+    if args.progress_bar:
+        try:
+            from progress import TqdmProgress
+            progress_sinks.append(TqdmProgress(total=sa_optimizer.max_iterations, desc="SA"))
+        except ImportError:
+            print("tqdm이 설치되지 않아 진행 막대를 건너뜁니다.", file=sys.stderr)
+    if args.progress_jsonl:
+        from progress import JSONLWriter
+        progress_sinks.append(JSONLWriter(args.progress_jsonl, every=args.progress_every))
+    try:
+        if args.exact:
+            from exact_solver import BranchAndBoundSolver
+            exact_solver = BranchAndBoundSolver(user_profile, catalog, time_parser, cost_function)
+            exact_solver.sampler = sa_optimizer  # 후보가 많아 SA로 대체할 때도 위 파라미터 그대로
+            result = exact_solver.optimize(verbose=True)
+        else:
+            result = sa_optimizer.optimize(verbose=True, progress=progress_sinks)
+    finally:
+        from progress import close_sinks
+        close_sinks(progress_sinks)
     
     # 4. 결과 출력
     print("\n4. 최적화 결과:")
@@ -108,15 +250,26 @@ def main():
     print("\n5. 상세 분석:")
     sa_optimizer.analyze_solution(result['best_solution'])
     
+    algorithm = 'Branch and Bound' if result.get('solver') == 'branch_and_bound' else 'Simulated Annealing'
+    
     # 6. 시각화 (matplotlib 사용시)
-    try:
-        print("\n6. 최적화 과정 시각화...")
-        plot_optimization_progress(result['cost_history'], result['temperature_history'])
-    except ImportError:
-        print("matplotlib가 설치되지 않아 시각화를 건너뜁니다.")
+    if args.no_plot:
+        pass
+    elif 'temperature_history' not in result:
+        print("\n6. 분기 한정법 결과에는 최적화 과정 그래프가 없습니다.")
+    elif args.plot_to is None and not _has_display():
+        print("\n6. 화면이 없는 환경이라 시각화를 건너뜁니다 (--plot-to 파일로 저장 가능).")
+    else:
+        try:
+            print("\n6. 최적화 과정 시각화...")
+            plot_optimization_progress(result['cost_history'], result['temperature_history'], args.plot_to,
+                                       iterations=result['history_iterations'])
+            if args.plot_to:
+                print(f"✅ 그래프가 '{args.plot_to}'에 저장되었습니다.")
+        except ImportError:
+            print("matplotlib가 설치되지 않아 시각화를 건너뜁니다.")
     
     # 7. 결과 저장
-    import os
     from datetime import datetime
     
     # results 폴더가 없으면 생성
@@ -126,22 +279,7 @@ def main():
     # 타임스탬프 생성 (YYYY-MM-DD_HH-MM-SS 형식)
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     
-    output = {
-        'student_info': {
-            'name': user_profile['name'],
-            'student_id': user_profile['student_id'],
-            'major': user_profile['major'],
-            'year': user_profile['current_year']
-        },
-        'optimized_timetable': result['best_solution'],
-        'optimization_stats': {
-            'final_cost': result['best_cost'],
-            'iterations': result['iterations'],
-            'algorithm': 'Simulated Annealing',
-            'timestamp': timestamp
-        },
-        'cost_breakdown': cost_function.get_cost_breakdown(result['best_solution'])
-    }
+    output = build_result_payload(user_profile, result, cost_function, timestamp, algorithm)
     
     # JSON으로 저장 (타임스탬프 포함한 파일명)
     result_file = f'results/timetable_{timestamp}.json'
@@ -160,27 +298,37 @@ def main():
         f.write(f"목표 학점: {user_profile['target_credits_this_semester']}\n\n")
         
         f.write("=== 최적화 파라미터 ===\n")
-        f.write(f"초기 온도: {sa_optimizer.initial_temperature}\n")
+        f.write(f"냉각 스케줄: {sa_optimizer.cooling_schedule}\n")
+        f.write(f"초기 온도: {result.get('initial_temperature')}\n")
         f.write(f"최종 온도: {sa_optimizer.final_temperature}\n")
         f.write(f"냉각률: {sa_optimizer.cooling_rate}\n")
-        f.write(f"최대 반복: {sa_optimizer.max_iterations}\n\n")
+        f.write(f"최대 반복: {sa_optimizer.max_iterations}\n")
+        f.write(f"시작 시간: {startup_seconds * 1000:.1f}ms\n\n")
         
         f.write("=== 최적화 결과 ===\n")
         f.write(f"최종 비용: {result['best_cost']:.2f}\n")
         f.write(f"총 반복 횟수: {result['iterations']}\n")
-        f.write(f"알고리즘: Simulated Annealing\n\n")
+        f.write(f"종료 이유: {result['stop_reason']}\n")
+        if 'infeasible_evaluation_ratio' in result:
+            f.write(f"시간 충돌 이웃 평가 비율: {result['infeasible_evaluation_ratio']:.1%}\n")
+        if result.get('solver') == 'branch_and_bound':
+            f.write(f"탐색 노드: {result['nodes']}, 가지치기: {result['pruned']}, "
+                    f"최적 증명: {'예' if result['proven_optimal'] else '아니오'}\n")
+        if result.get('propagation'):
+            propagation = result['propagation']
+            f.write(f"제약 전파: 분반 {propagation['before']['sections']} → {propagation['after']['sections']}, "
+                    f"확정 필수과목 {len(propagation['fixed'])}개\n")
+        f.write(f"알고리즘: {algorithm}\n\n")
         
         f.write("=== 선택된 과목 ===\n")
         total_credits = 0
         for i, course_selection in enumerate(result['best_solution'], 1):
-            for course in course_db['courses']:
-                if (course['course_code'] == course_selection['course_code'] and 
-                    course['section'] == course_selection['section']):
-                    f.write(f"{i}. {course['course_name']} ({course['course_code']}-{course['section']})\n")
-                    f.write(f"   교수: {course['professor']}, 학점: {course['credits']}, 시간: {course['schedule']}\n")
-                    f.write(f"   강의실: {course['classroom']}, 분류: {course['category']}, 영역: {course['area']}\n\n")
-                    total_credits += course['credits']
-                    break
+            course = catalog.get_course(course_selection['course_code'], course_selection['section'])
+            if course:
+                f.write(f"{i}. {course['course_name']} ({course['course_code']}-{course['section']})\n")
+                f.write(f"   교수: {course['professor']}, 학점: {course['credits']}, 시간: {course['schedule']}\n")
+                f.write(f"   강의실: {course['classroom']}, 분류: {course['category']}, 영역: {course['area']}\n\n")
+                total_credits += course['credits']
         
         f.write(f"총 학점: {total_credits}\n\n")
         
@@ -191,6 +339,16 @@ def main():
                 f.write(f"{cost_type}: {cost_value:.2f}\n")
         
         f.write(f"\n총 비용: {cost_breakdown['total']:.2f}\n")
+        
+        if result.get('profile'):
+            f.write("\n=== 성능 계측 ===\n")
+            for name, timer in result['profile']['timers'].items():
+                f.write(f"{name}: {timer['calls']}회, 총 {timer['total_seconds'] * 1000:.2f}ms, "
+                        f"평균 {timer['mean_us']:.1f}us\n")
+            
+            f.write("\n=== 온도 구간별 수락률 ===\n")
+            for band, stats in result['profile']['acceptance_by_temperature'].items():
+                f.write(f"T {band}: {stats['accepted']}/{stats['proposed']} ({stats['rate']:.1%})\n")
     
     print(f"✅ 최적화 로그가 '{log_file}'에 저장되었습니다.")
     
@@ -204,6 +362,7 @@ def main():
     
     print(f"✅ 최신 결과가 'latest_timetable.json'과 'latest_log.txt'로도 저장되었습니다.")
     print("\n🎉 최적화 완료!")
+    return output
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
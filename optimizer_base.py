@@ -0,0 +1,72 @@
+import importlib
+
+
+class Optimizer:
+    """
+    시간표 최적화기 공통 인터페이스
+    생성자는 (user_profile, course_database, time_parser, cost_function)을 받고,
+    optimize(verbose, cancel_token)는 최소한 다음 키를 가진 결과 딕셔너리를 반환한다.
+        best_solution, best_cost, iterations, evaluations, stop_reason, elapsed_seconds, improvements
+    evaluations는 비용을 계산한 후보 해 수로, 알고리즘끼리 같은 예산을 맞출 때 쓴다
+    (파라미터 max_evaluations로 상한 지정, time_limit은 실행 시간 상한).
+    improvements는 최적해가 개선될 때마다의 [(경과 초, 평가 수, 최적 비용)] 기록이다.
+    파라미터는 PARAMETER_NAMES에 나열하고 get_parameters / set_parameters로 일괄 조회/설정한다.
+    """
+
+    PARAMETER_NAMES = []
+
+    def get_parameters(self):
+        """현재 파라미터 딕셔너리"""
+        return {name: getattr(self, name) for name in self.PARAMETER_NAMES}
+
+    def set_parameters(self, parameters):
+        """파라미터 일괄 설정 (알 수 없는 이름은 무시)"""
+        for name, value in parameters.items():
+            if name in self.PARAMETER_NAMES:
+                setattr(self, name, value)
+
+    def optimize(self, verbose=True, cancel_token=None):
+        raise NotImplementedError
+
+
+# 이름 -> 최적화기 클래스 (register_optimizer로 등록)
+OPTIMIZERS = {}
+
+# 기본 제공 최적화기 이름 -> 모듈 (처음 찾을 때 불러와 등록)
+BUILTIN_OPTIMIZER_MODULES = {
+    'simulated_annealing': 'simulated_annealing',
+    'parallel_tempering': 'parallel_tempering',
+    'genetic_algorithm': 'genetic_algorithm',
+    'tabu_search': 'tabu_search',
+    'branch_and_bound': 'exact_solver'
+}
+
+
+def register_optimizer(name):
+    """최적화기 클래스를 name으로 등록하는 클래스 데코레이터"""
+    def decorator(cls):
+        OPTIMIZERS[name] = cls
+        cls.optimizer_name = name
+        return cls
+    return decorator
+
+
+def available_optimizers():
+    """등록된(또는 기본 제공) 최적화기 이름 목록"""
+    return sorted(set(OPTIMIZERS) | set(BUILTIN_OPTIMIZER_MODULES))
+
+
+def get_optimizer_class(name):
+    if name not in OPTIMIZERS and name in BUILTIN_OPTIMIZER_MODULES:
+        importlib.import_module(BUILTIN_OPTIMIZER_MODULES[name])
+    if name not in OPTIMIZERS:
+        raise ValueError(f"알 수 없는 최적화기: {name} (사용 가능: {', '.join(available_optimizers())})")
+    return OPTIMIZERS[name]
+
+
+def create_optimizer(name, user_profile, course_database, time_parser, cost_function, parameters=None):
+    """이름으로 최적화기 생성 (parameters는 set_parameters로 적용)"""
+    optimizer = get_optimizer_class(name)(user_profile, course_database, time_parser, cost_function)
+    if parameters:
+        optimizer.set_parameters(parameters)
+    return optimizer
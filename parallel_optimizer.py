@@ -0,0 +1,115 @@
+"""
+다중 시작(multi-start) 병렬 시뮬레이티드 어닐링
+서로 다른 시드의 독립 SA 체인을 ProcessPoolExecutor로 실행하고 가장 좋은 해를 고른다.
+과목 카탈로그와 사용자 프로필은 작업마다 전달하지 않고 워커 초기화 때 한 번만 전달한다.
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from catalog_snapshot import load_catalog
+from course_catalog import CourseCatalog
+from time_parser import TimeTableParser
+from cost_function import TimetableCostFunction
+from simulated_annealing import TimetableSimulatedAnnealing
+
+# 워커 프로세스마다 한 번 구성되는 최적화 객체
+_worker_optimizer = None
+
+
+def _init_worker(course_database, user_profile, sa_parameters):
+    """워커 초기화: 카탈로그 색인, 파서, 비용 함수, 최적화기를 한 번만 구성"""
+    global _worker_optimizer
+    _worker_optimizer = build_optimizer(user_profile, course_database, sa_parameters)
+
+
+def build_optimizer(user_profile, course_database, sa_parameters=None):
+    """
+    프로필과 과목 데이터로 SA 최적화기 구성
+    course_database: courses.json 딕셔너리, CourseCatalog 또는 컴파일된 스냅샷 디렉터리 경로
+    """
+    time_parser = TimeTableParser()
+    if isinstance(course_database, str):
+        catalog = load_catalog(course_database, time_parser)
+    elif isinstance(course_database, CourseCatalog):
+        catalog = course_database
+    else:
+        catalog = CourseCatalog(course_database)
+    cost_function = TimetableCostFunction(user_profile, catalog, time_parser)
+    optimizer = TimetableSimulatedAnnealing(user_profile, catalog, time_parser, cost_function)
+    if sa_parameters:
+        optimizer.set_parameters(sa_parameters)
+    return optimizer
+
+
+def _run_chain(seed):
+    """시드 하나로 SA 체인 실행 (워커 프로세스에서 호출)"""
+    random.seed(seed)
+    start_time = time.perf_counter()
+    result = _worker_optimizer.optimize(verbose=False)
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'seed': seed,
+        'best_cost': result['best_cost'],
+        'best_solution': result['best_solution'],
+        'iterations': result['iterations'],
+        'stop_reason': result['stop_reason'],
+        'elapsed_seconds': elapsed,
+        'pid': os.getpid()
+    }
+
+
+def optimize_parallel(user_profile, course_database, n_runs=8, workers=None,
+                      base_seed=None, sa_parameters=None):
+    """
+    독립 SA 체인 n_runs개를 workers개 프로세스에서 실행
+    course_database: courses.json 딕셔너리, CourseCatalog 또는 스냅샷 디렉터리 경로
+    Returns: {'best_solution', 'best_cost', 'best_seed', 'runs': [실행별 통계], 'elapsed_seconds', ...}
+    """
+    if n_runs < 1:
+        raise ValueError(f"n_runs는 1 이상이어야 합니다: {n_runs}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, n_runs))
+
+    if base_seed is None:
+        base_seed = random.randrange(2 ** 31)
+    seeds = [base_seed + i for i in range(n_runs)]
+
+    start_time = time.perf_counter()
+    initargs = (course_database, user_profile, sa_parameters)
+
+    if workers == 1:
+        # 프로세스 생성 비용 없이 현재 프로세스에서 순차 실행
+        # SA는 전역 random을 쓰므로 체인마다 시드를 바꾼 뒤 호출자의 난수 상태를 되돌린다
+        caller_random_state = random.getstate()
+        try:
+            _init_worker(*initargs)
+            runs = [_run_chain(seed) for seed in seeds]
+        finally:
+            random.setstate(caller_random_state)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=initargs) as executor:
+            runs = list(executor.map(_run_chain, seeds))
+
+    elapsed = time.perf_counter() - start_time
+
+    best_run = min(runs, key=lambda run: run['best_cost'])
+    costs = [run['best_cost'] for run in runs]
+
+    return {
+        'best_solution': best_run['best_solution'],
+        'best_cost': best_run['best_cost'],
+        'best_seed': best_run['seed'],
+        'runs': [{key: value for key, value in run.items() if key != 'best_solution'}
+                 for run in runs],
+        'n_runs': n_runs,
+        'workers': workers,
+        'mean_cost': sum(costs) / len(costs),
+        'worst_cost': max(costs),
+        'elapsed_seconds': elapsed
+    }
@@ -0,0 +1,216 @@
+import math
+import random
+import time
+
+from incremental_cost import IncrementalCostEvaluator
+from optimizer_base import Optimizer, register_optimizer
+from progress import DownsampledHistory
+from simulated_annealing import TimetableSimulatedAnnealing
+from solution_state import SolutionState
+
+
+@register_optimizer('parallel_tempering')
+class ParallelTempering(Optimizer):
+    """
+    병렬 템퍼링(복제본 교환) 최적화
+    고정 온도 사다리 위의 복제본 n_replicas개를 한 프로세스에서 같은 보폭으로 진행시키고,
+    swap_interval 반복마다 이웃한 온도의 복제본끼리 교환을 시도한다 (짝/홀 쌍을 번갈아 시도).
+    높은 온도의 복제본이 국소 최적에서 빠져나온 해를 낮은 온도로 넘겨주므로
+    독립 재시작보다 같은 평가 수에서 더 좋은 해를 찾는 것이 목표다.
+    이웃 이동 생성은 TimetableSimulatedAnnealing(self.sampler)의 것을, 비용은 증분 계산기를 그대로 쓴다.
+    """
+
+    PARAMETER_NAMES = ['n_replicas', 'min_temperature', 'max_temperature', 'temperatures',
+                       'max_iterations', 'swap_interval', 'time_limit', 'target_cost', 'max_evaluations',
+                       'history_points']
+
+    def __init__(self, user_profile, course_database, time_parser, cost_function):
+        # 이동 생성/초기 해 생성기 (feasible_moves, compound_move_rate 등은 sampler에 설정)
+        self.sampler = TimetableSimulatedAnnealing(user_profile, course_database, time_parser, cost_function)
+        self.catalog = self.sampler.catalog
+        self.cost_function = cost_function
+
+        # 온도 사다리: temperatures를 직접 주지 않으면 min~max 기하 간격
+        self.n_replicas = 8
+        self.min_temperature = 1.0
+        self.max_temperature = 1000.0
+        self.temperatures = None
+
+        # 복제본당 반복 수, 교환 시도 간격(반복)
+        self.max_iterations = 1000
+        self.swap_interval = 10
+
+        # 조기 종료 조건 (None이면 사용하지 않음)
+        self.time_limit = None
+        self.target_cost = None
+        self.max_evaluations = None  # 모든 복제본이 평가한 이웃 해 수 합의 상한
+
+        # 가장 낮은 온도 복제본의 비용 히스토리 최대 점 수
+        self.history_points = 1000
+
+    def set_parameters(self, parameters):
+        """파라미터 일괄 설정 (이동 생성 옵션 등 SA 파라미터는 sampler로 전달)"""
+        for name, value in parameters.items():
+            if name in self.PARAMETER_NAMES:
+                setattr(self, name, value)
+            else:
+                self.sampler.set_parameters({name: value})
+
+    def temperature_ladder(self):
+        """낮은 온도부터 정렬된 온도 목록"""
+        if self.temperatures:
+            return sorted(self.temperatures)
+        if self.n_replicas <= 1:
+            return [self.min_temperature]
+        ratio = (self.max_temperature / self.min_temperature) ** (1.0 / (self.n_replicas - 1))
+        return [self.min_temperature * ratio ** k for k in range(self.n_replicas)]
+
+    def optimize(self, verbose=True, cancel_token=None):
+        """
+        병렬 템퍼링 실행
+        Returns: {'best_solution', 'best_cost', 'temperatures', 'swap_acceptance_rates',
+                  'replica_acceptance_rates', 'final_costs', 'iterations', 'evaluations', 'stop_reason',
+                  'propagation', ...}
+        swap_acceptance_rates[k]는 temperatures[k]와 temperatures[k + 1] 사이 교환 수락률
+        replica_acceptance_rates[k]는 복제본 k가 평가한 이웃 중 수락된 비율 (이동을 만들지 못한 반복은 제외)
+        """
+        start_clock = time.perf_counter()
+        sampler = self.sampler
+        # 제약 전파를 켜면 초기 해와 이웃 이동 모두 줄인 후보 분반 안에서 만든다 (확정된 분반은 바꾸지 않음)
+        propagation = None
+        if sampler.constraint_propagation:
+            propagation = sampler.apply_constraint_propagation()
+            if verbose:
+                print(f"제약 전파: {propagation.summary()}")
+        temperatures = self.temperature_ladder()
+        n_replicas = len(temperatures)
+
+        # 복제본 k는 temperatures[k]에서 진행 (교환 시 해 상태를 맞바꿈)
+        evaluators = []
+        costs = []
+        terms_cache = None
+        for _ in range(n_replicas):
+            evaluator = IncrementalCostEvaluator(self.cost_function)
+            if terms_cache is None:
+                terms_cache = evaluator._terms_cache
+            evaluator._terms_cache = terms_cache  # 분반별 비용 항목은 복제본끼리 공유
+            evaluator.reset(sampler.generate_initial_solution())
+            evaluators.append(evaluator)
+            costs.append(evaluator.total_cost())
+
+        best_index = min(range(n_replicas), key=costs.__getitem__)
+        best_cost = costs[best_index]
+        best_sids = evaluators[best_index].state.snapshot()
+
+        accepted_moves = [0] * n_replicas
+        proposed_moves = [0] * n_replicas  # 이웃을 실제로 평가한 횟수 (이동 생성 실패는 제외)
+        swap_attempts = [0] * max(0, n_replicas - 1)
+        swap_accepts = [0] * max(0, n_replicas - 1)
+        history = DownsampledHistory(self.history_points) if self.history_points != 0 else None
+        evaluations = 0
+        iteration = 0
+        swap_round = 0
+        improvements = [(time.perf_counter() - start_clock, 0, best_cost)]
+
+        stop_reason = 'max_iterations' if self.max_iterations <= 0 else None
+        if stop_reason is None and self.max_evaluations is not None and self.max_evaluations <= 0:
+            stop_reason = 'max_evaluations'
+        if stop_reason is None and self.target_cost is not None and best_cost <= self.target_cost:
+            stop_reason = 'target_cost'
+        if stop_reason is None and cancel_token is not None:
+            stop_reason = cancel_token.reason
+
+        if verbose:
+            print(f"복제본 {n_replicas}개, 온도 {temperatures[0]:.2f} ~ {temperatures[-1]:.2f}")
+            print(f"초기 최적해: 비용 = {best_cost:.2f}")
+
+        while stop_reason is None:
+            # 모든 복제본을 한 걸음씩 진행
+            for k in range(n_replicas):
+                evaluator = evaluators[k]
+                state = evaluator.state
+                temperature = temperatures[k]
+
+                if state.sids:
+                    move = sampler._propose_move(state)
+                    if move is None:
+                        continue
+                    neighbor_cost = evaluator.evaluate_move(move)
+                    accepted = random.random() < sampler.acceptance_probability(costs[k], neighbor_cost, temperature)
+                    if accepted:
+                        evaluator.apply_move(move)
+                else:
+                    # 빈 해는 초기 해를 새로 생성
+                    neighbor_solution = sampler.generate_initial_solution()
+                    neighbor_cost = self.cost_function.calculate_total_cost(neighbor_solution)
+                    accepted = random.random() < sampler.acceptance_probability(costs[k], neighbor_cost, temperature)
+                    if accepted:
+                        evaluator.reset(neighbor_solution)
+                evaluations += 1
+                proposed_moves[k] += 1
+
+                if not accepted:
+                    continue
+                costs[k] = neighbor_cost
+                accepted_moves[k] += 1
+                if costs[k] < best_cost:
+                    best_cost = costs[k]
+                    best_sids = evaluator.state.snapshot()
+                    improvements.append((time.perf_counter() - start_clock, evaluations, best_cost))
+
+            iteration += 1
+
+            # 이웃 온도끼리 교환 시도: 수락 확률 min(1, exp((E_k - E_k+1) * (1/T_k - 1/T_k+1)))
+            if n_replicas > 1 and iteration % self.swap_interval == 0:
+                for k in range(swap_round % 2, n_replicas - 1, 2):
+                    swap_attempts[k] += 1
+                    exponent = (costs[k] - costs[k + 1]) * (1.0 / temperatures[k] - 1.0 / temperatures[k + 1])
+                    if exponent >= 0 or random.random() < math.exp(exponent):
+                        evaluators[k], evaluators[k + 1] = evaluators[k + 1], evaluators[k]
+                        costs[k], costs[k + 1] = costs[k + 1], costs[k]
+                        swap_accepts[k] += 1
+                swap_round += 1
+
+            if history is not None:
+                history.record(iteration, costs[0], temperatures[0])
+
+            if verbose and iteration % 200 == 0:
+                print(f"반복 {iteration}: 최적 비용 = {best_cost:.2f}, 최저 온도 복제본 비용 = {costs[0]:.2f}")
+
+            # 종료 조건 확인
+            if iteration >= self.max_iterations:
+                stop_reason = 'max_iterations'
+            elif self.target_cost is not None and best_cost <= self.target_cost:
+                stop_reason = 'target_cost'
+            elif self.time_limit is not None and time.perf_counter() - start_clock >= self.time_limit:
+                stop_reason = 'time_limit'
+            elif self.max_evaluations is not None and evaluations >= self.max_evaluations:
+                stop_reason = 'max_evaluations'
+            elif cancel_token is not None:
+                stop_reason = cancel_token.reason
+
+        swap_acceptance_rates = [accepts / attempts if attempts else 0.0
+                                 for accepts, attempts in zip(swap_accepts, swap_attempts)]
+
+        if verbose:
+            print(f"최적화 완료! 최종 비용 = {best_cost:.2f} (종료 이유: {stop_reason})")
+            print("교환 수락률: " + ", ".join(f"{rate:.2f}" for rate in swap_acceptance_rates))
+
+        return {
+            'best_solution': SolutionState(self.catalog, best_sids).to_selections(),
+            'best_cost': best_cost,
+            'temperatures': temperatures,
+            'swap_acceptance_rates': swap_acceptance_rates,
+            'swap_attempts': swap_attempts,
+            'replica_acceptance_rates': [accepted / proposed if proposed else 0.0
+                                         for accepted, proposed in zip(accepted_moves, proposed_moves)],
+            'final_costs': costs,
+            'cost_history': history.costs if history is not None else [],
+            'history_iterations': history.iterations if history is not None else [],
+            'iterations': iteration,
+            'evaluations': evaluations,
+            'stop_reason': stop_reason,
+            'elapsed_seconds': time.perf_counter() - start_clock,
+            'improvements': improvements,
+            'propagation': propagation.to_dict() if propagation is not None else None
+        }
@@ -0,0 +1,128 @@
+"""
+최적화 진행 이벤트와 기본 수신기(sink)
+optimize(progress=...)에 호출 가능한 객체(또는 그 목록)를 넘기면 반복마다 ProgressEvent를 받는다.
+모든 기본 수신기는 반복 횟수와 관계없이 메모리 사용량이 일정하다.
+"""
+
+import json
+from collections import deque
+
+
+class ProgressEvent:
+    """반복 하나가 끝난 뒤의 상태"""
+    __slots__ = ('iteration', 'current_cost', 'best_cost', 'temperature', 'accepted')
+
+    def __init__(self, iteration, current_cost, best_cost, temperature, accepted):
+        self.iteration = iteration
+        self.current_cost = current_cost
+        self.best_cost = best_cost
+        self.temperature = temperature
+        self.accepted = accepted
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (f"ProgressEvent(iteration={self.iteration}, current_cost={self.current_cost}, "
+                f"best_cost={self.best_cost}, temperature={self.temperature}, accepted={self.accepted})")
+
+
+class DownsampledHistory:
+    """
+    비용/온도 히스토리를 최대 max_points개로 유지
+    가득 차면 간격(stride)을 두 배로 늘리고 그 간격에 맞지 않는 점을 버리므로
+    항상 실행 전체를 고르게 덮는다. max_points가 None이면 모든 반복을 저장한다.
+    """
+
+    def __init__(self, max_points=1000):
+        self.max_points = max_points
+        self.stride = 1
+        self.iterations = []
+        self.costs = []
+        self.temperatures = []
+
+    def __call__(self, event):
+        self.record(event.iteration, event.current_cost, event.temperature)
+
+    def record(self, iteration, cost, temperature=None):
+        if iteration % self.stride:
+            return
+        self.iterations.append(iteration)
+        self.costs.append(cost)
+        self.temperatures.append(temperature)
+
+        if self.max_points is not None and len(self.iterations) > self.max_points:
+            self.stride *= 2
+            keep = [i for i, kept_iteration in enumerate(self.iterations) if kept_iteration % self.stride == 0]
+            self.iterations = [self.iterations[i] for i in keep]
+            self.costs = [self.costs[i] for i in keep]
+            self.temperatures = [self.temperatures[i] for i in keep]
+
+    def __len__(self):
+        return len(self.iterations)
+
+
+class RingBuffer:
+    """최근 capacity개의 이벤트만 보관"""
+
+    def __init__(self, capacity=1000):
+        self.events = deque(maxlen=capacity)
+
+    def __call__(self, event):
+        self.events.append(event)
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+
+class JSONLWriter:
+    """
+    every번째 반복마다 이벤트를 JSON 한 줄로 기록
+    destination: 파일 경로 또는 쓰기 가능한 스트림 (경로면 close()로 닫는다)
+    """
+
+    def __init__(self, destination, every=1):
+        self.every = max(1, every)
+        if isinstance(destination, str):
+            self.stream = open(destination, 'w', encoding='utf-8')
+            self._owns_stream = True
+        else:
+            self.stream = destination
+            self._owns_stream = False
+
+    def __call__(self, event):
+        if event.iteration % self.every == 0:
+            self.stream.write(json.dumps(event.to_dict()) + '\n')
+
+    def close(self):
+        self.stream.flush()
+        if self._owns_stream:
+            self.stream.close()
+
+
+class TqdmProgress:
+    """tqdm 진행 막대 (tqdm이 설치되어 있어야 함, refresh_every번째 반복마다 최적 비용 표시)"""
+
+    def __init__(self, total=None, refresh_every=50, **tqdm_options):
+        from tqdm import tqdm
+        self.refresh_every = max(1, refresh_every)
+        self.bar = tqdm(total=total, unit='it', **tqdm_options)
+
+    def __call__(self, event):
+        self.bar.update(1)
+        if event.iteration % self.refresh_every == 0:
+            self.bar.set_postfix(best=f"{event.best_cost:.1f}", T=f"{event.temperature:.2f}", refresh=False)
+
+    def close(self):
+        self.bar.close()
+
+
+def close_sinks(sinks):
+    """close()가 있는 수신기 닫기"""
+    for sink in sinks:
+        close = getattr(sink, 'close', None)
+        if close is not None:
+            close()
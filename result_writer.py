@@ -0,0 +1,20 @@
+def build_result_payload(user_profile, result, cost_function, timestamp,
+                         algorithm='Simulated Annealing'):
+    """최적화 결과 저장용 딕셔너리 (results/timetable_*.json 형식)"""
+    return {
+        'student_info': {
+            'name': user_profile['name'],
+            'student_id': user_profile['student_id'],
+            'major': user_profile['major'],
+            'year': user_profile['current_year']
+        },
+        'optimized_timetable': result['best_solution'],
+        'optimization_stats': {
+            'final_cost': result['best_cost'],
+            'iterations': result['iterations'],
+            'stop_reason': result.get('stop_reason'),
+            'algorithm': algorithm,
+            'timestamp': timestamp
+        },
+        'cost_breakdown': cost_function.get_cost_breakdown(result['best_solution'])
+    }
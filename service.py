@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+상주형 시간표 최적화 HTTP 서비스 (표준 라이브러리 asyncio만 사용)
+카탈로그 색인과 시간표 비트마스크는 워커 프로세스마다 시작할 때 한 번만 구성하고,
+요청마다 프로필 JSON을 받아 워커 풀에서 최적화한 뒤 main.py가 results/에 저장하는 것과 같은 결과를 돌려준다.
+
+- POST /optimize  본문: 프로필 JSON 또는 {"profile": {...}, "time_limit": 초, "seed": 정수, "sa_parameters": {...}}
+  (sa_parameters는 SA_PARAMETER_RULES에 있는 탐색 파라미터만, 허용 범위 안의 값으로)
+- GET  /metrics   처리 중/대기 요청 수, 요청 수, 지연 시간 백분위수
+- GET  /health    상태와 카탈로그 분반 수
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+import batch
+from catalog_snapshot import CatalogSnapshot
+from cooling_schedules import COOLING_SCHEDULES
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           422: 'Unprocessable Entity', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _is_positive_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 1
+
+
+# 클라이언트가 요청별로 바꿀 수 있는 SA 파라미터 -> (값 검사 함수, 허용 값 설명)
+# 반복/평가 수 예산, time_limit, 초기 온도 보정 표본 수, 냉각 스케줄 인자,
+# 프로파일링/디버그/캐시 설정은 서버가 정한다 (요청별 시간 예산을 지키기 위해)
+SA_PARAMETER_RULES = {
+    'initial_temperature': (lambda value: _is_number(value) and value > 0, "양수"),
+    'final_temperature': (lambda value: _is_number(value) and value > 0, "양수"),
+    'cooling_rate': (lambda value: _is_number(value) and 0 < value < 1, "0보다 크고 1보다 작은 수"),
+    'cooling_schedule': (lambda value: isinstance(value, str) and value in COOLING_SCHEDULES,
+                         " / ".join(COOLING_SCHEDULES)),
+    'auto_initial_temperature': (lambda value: isinstance(value, bool), "true / false"),
+    'target_initial_acceptance': (lambda value: _is_number(value) and 0 < value < 1, "0보다 크고 1보다 작은 수"),
+    'feasible_moves': (lambda value: isinstance(value, bool), "true / false"),
+    'compound_move_rate': (lambda value: _is_number(value) and 0 <= value <= 1, "0 이상 1 이하의 수"),
+    'constraint_propagation': (lambda value: isinstance(value, bool), "true / false"),
+    'max_no_improvement': (lambda value: value is None or _is_positive_int(value), "1 이상의 정수 또는 null"),
+    'target_cost': (lambda value: value is None or _is_number(value), "수 또는 null"),
+    'min_acceptance_rate': (lambda value: value is None or (_is_number(value) and 0 <= value <= 1),
+                            "0 이상 1 이하의 수 또는 null"),
+    'acceptance_window': (_is_positive_int, "1 이상의 정수"),
+}
+SA_PARAMETER_NAMES = list(SA_PARAMETER_RULES)
+
+
+def validate_sa_parameters(sa_parameters):
+    """클라이언트가 보낸 sa_parameters 검사 → 오류 메시지 (문제없으면 None)"""
+    if not isinstance(sa_parameters, dict):
+        return "sa_parameters는 JSON 객체여야 합니다"
+    unknown = sorted(name for name in sa_parameters if name not in SA_PARAMETER_RULES)
+    if unknown:
+        return f"바꿀 수 없는 SA 파라미터: {', '.join(unknown)}"
+    for name, value in sa_parameters.items():
+        is_valid, description = SA_PARAMETER_RULES[name]
+        if not is_valid(value):
+            return f"잘못된 SA 파라미터 값: {name}={json.dumps(value, ensure_ascii=False)} ({description})"
+    return None
+
+
+def _optimize_request(profile_id, user_profile, seed, sa_parameters, deadline):
+    """
+    워커 프로세스에서 요청 하나 최적화
+    deadline(time.time() 기준)까지 남은 시간을 SA time_limit으로 사용하므로 대기 시간도 예산에 포함된다.
+    """
+    parameters = dict(sa_parameters or {})
+    parameters['time_limit'] = max(0.0, deadline - time.time())
+    return batch._optimize_profile(profile_id, user_profile, seed, parameters)
+
+
+class OptimizationService:
+    """
+    워커 풀과 요청 통계를 가진 최적화 서비스
+    course_database: courses.json 딕셔너리 또는 컴파일된 스냅샷 디렉터리 경로
+    default_time_limit / max_time_limit: 요청별 시간 예산 기본값 / 상한(초)
+    max_queue: 모든 워커가 바쁠 때 대기시킬 최대 요청 수 (넘으면 503)
+    """
+
+    def __init__(self, course_database, workers=None, sa_parameters=None, default_time_limit=5.0,
+                 max_time_limit=60.0, max_queue=100, latency_window=1000):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.sa_parameters = sa_parameters or {}
+        self.default_time_limit = default_time_limit
+        self.max_time_limit = max_time_limit
+        self.max_queue = max_queue
+
+        if isinstance(course_database, str):
+            # 분반 수는 스냅샷 메타데이터에서 읽는다 (카탈로그는 워커마다 따로 불러옴)
+            self.sections = len(CatalogSnapshot(course_database))
+        else:
+            self.sections = len(course_database['courses'])
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=batch._init_worker,
+                                            initargs=(course_database, self.sa_parameters))
+
+        self.started_at = time.time()
+        self.in_flight = 0
+        self.requests = {'total': 0, 'completed': 0, 'failed': 0, 'rejected': 0}
+        self.latencies = deque(maxlen=latency_window)
+        self._next_seed = 0
+
+    def metrics(self):
+        return {
+            'uptime_seconds': time.time() - self.started_at,
+            'workers': self.workers,
+            'in_flight': self.in_flight,
+            'queue_depth': max(0, self.in_flight - self.workers),
+            'requests': dict(self.requests),
+            'latency_seconds': batch.latency_percentiles(list(self.latencies))
+        }
+
+    async def optimize(self, request):
+        """POST /optimize 처리 → (상태 코드, 응답 딕셔너리)"""
+        if not isinstance(request, dict):
+            return 400, {'error': "요청 본문은 JSON 객체여야 합니다"}
+        user_profile = request.get('profile', request)
+        if not isinstance(user_profile, dict):
+            return 400, {'error': "profile은 JSON 객체여야 합니다"}
+        try:
+            time_limit = min(float(request.get('time_limit', self.default_time_limit)), self.max_time_limit)
+            seed = int(request['seed']) if 'seed' in request else None
+        except (TypeError, ValueError) as e:
+            return 400, {'error': f"잘못된 time_limit/seed: {e}"}
+        if not time_limit > 0:  # 음수, 0, NaN 거부
+            return 400, {'error': f"time_limit은 양수여야 합니다: {request.get('time_limit')}"}
+        sa_parameters = request.get('sa_parameters') if 'profile' in request else None
+        if sa_parameters is not None:
+            error = validate_sa_parameters(sa_parameters)
+            if error is not None:
+                return 400, {'error': error, 'allowed': SA_PARAMETER_NAMES}
+
+        if self.in_flight >= self.workers + self.max_queue:
+            self.requests['rejected'] += 1
+            return 503, {'error': "대기 중인 요청이 너무 많습니다", 'queue_depth': self.in_flight - self.workers}
+
+        if seed is None:
+            seed = self._next_seed
+            self._next_seed += 1
+        profile_id = str(user_profile.get('student_id', self.requests['total']))
+
+        self.requests['total'] += 1
+        self.in_flight += 1
+        start_time = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            record = await loop.run_in_executor(self.executor, _optimize_request, profile_id, user_profile,
+                                                seed, sa_parameters, time.time() + time_limit)
+        except Exception:
+            self.requests['failed'] += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.latencies.append(time.perf_counter() - start_time)
+
+        if 'error' in record:
+            self.requests['failed'] += 1
+            return 422, {'error': record['error']}
+        self.requests['completed'] += 1
+        return 200, record['result']
+
+    async def dispatch(self, method, path, body):
+        if path == '/health':
+            if method != 'GET':
+                return 405, {'error': "GET만 지원합니다"}
+            return 200, {'status': 'ok', 'sections': self.sections, 'workers': self.workers}
+        if path == '/metrics':
+            if method != 'GET':
+                return 405, {'error': "GET만 지원합니다"}
+            return 200, self.metrics()
+        if path == '/optimize':
+            if method != 'POST':
+                return 405, {'error': "POST만 지원합니다"}
+            try:
+                request = json.loads(body.decode('utf-8') or 'null')
+            except (UnicodeDecodeError, ValueError) as e:
+                return 400, {'error': f"JSON 파싱 실패: {e}"}
+            return await self.optimize(request)
+        return 404, {'error': f"알 수 없는 경로: {path}"}
+
+    async def handle_connection(self, reader, writer):
+        """HTTP/1.1 요청 하나를 읽고 JSON으로 응답 (Connection: close)"""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            if len(request_line) != 3:
+                raise ValueError("잘못된 요청 줄")
+            method, target, _ = request_line
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get('content-length') or 0))
+
+            status, payload = await self.dispatch(method.upper(), urlsplit(target).path, body)
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            status, payload = 400, {'error': f"잘못된 HTTP 요청: {e}"}
+        except Exception as e:
+            # 처리 중 예상하지 못한 오류 (워커 풀 종료 등)도 응답은 보낸다
+            status, payload = 500, {'error': f"서버 오류: {type(e).__name__}: {e}"}
+
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(data)}\r\n"
+                     f"Connection: close\r\n\r\n".encode('latin-1') + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8000, ready=None):
+        """서버 실행 (ready: 리슨 시작 후 (host, port)로 호출되는 함수)"""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready is not None:
+            ready(*server.sockets[0].getsockname()[:2])
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(description="시간표 최적화 HTTP 서비스")
+    arg_parser.add_argument('--catalog', default='data/courses.json',
+                            help="과목 데이터 (courses.json 또는 컴파일된 스냅샷 디렉터리)")
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8000)
+    arg_parser.add_argument('--workers', type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    arg_parser.add_argument('--time-limit', type=float, default=5.0, help="요청별 기본 시간 예산(초)")
+    arg_parser.add_argument('--max-time-limit', type=float, default=60.0, help="요청별 시간 예산 상한(초)")
+    arg_parser.add_argument('--max-queue', type=int, default=100, help="최대 대기 요청 수")
+    arg_parser.add_argument('--max-iterations', type=int, default=None, help="요청별 SA 최대 반복")
+    return arg_parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    if os.path.isdir(args.catalog):
+        course_database = args.catalog
+    else:
+        with open(args.catalog, 'r', encoding='utf-8') as f:
+            course_database = json.load(f)
+
+    sa_parameters = {}
+    if args.max_iterations is not None:
+        sa_parameters['max_iterations'] = args.max_iterations
+
+    service = OptimizationService(course_database, args.workers, sa_parameters, args.time_limit,
+                                  args.max_time_limit, args.max_queue)
+    try:
+        asyncio.run(service.serve(args.host, args.port,
+                                  ready=lambda host, port: print(f"✅ http://{host}:{port} 에서 대기 중")))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,40 @@
 import random
 import math
-import copy
+import time
+from collections import deque
 from typing import List, Dict, Tuple
 
-class TimetableSimulatedAnnealing:
+from cancellation import CancellationToken
+from constraint_propagation import propagate_domains
+from cost_cache import CostCache
+from cooling_schedules import calibrate_initial_temperature, create_cooling_schedule
+from course_catalog import CourseCatalog
+from eligibility_index import EligibilityIndex
+from incremental_cost import IncrementalCostEvaluator
+from instrumentation import OptimizationProfiler
+from optimizer_base import Optimizer, register_optimizer
+from progress import DownsampledHistory, ProgressEvent
+from solution_state import Move, SolutionState
+
+@register_optimizer('simulated_annealing')
+class TimetableSimulatedAnnealing(Optimizer):
+    # 병렬 실행 등에서 다른 인스턴스로 복사되는 파라미터 이름
+    PARAMETER_NAMES = ['initial_temperature', 'final_temperature', 'cooling_rate',
+                       'max_iterations', 'cooling_schedule', 'cooling_options',
+                       'auto_initial_temperature', 'calibration_samples', 'target_initial_acceptance',
+                       'feasible_moves', 'compound_move_rate', 'constraint_propagation',
+                       'use_incremental_cost', 'cost_cache_size', 'enable_profiling',
+                       'max_no_improvement', 'time_limit', 'target_cost', 'max_evaluations',
+                       'min_acceptance_rate', 'acceptance_window', 'history_points']
+    
     def __init__(self, user_profile, course_database, time_parser, cost_function):
         self.user_profile = user_profile
-        self.course_db = course_database
+        # course_database는 courses.json 딕셔너리 또는 미리 만든 CourseCatalog
+        if isinstance(course_database, CourseCatalog):
+            self.catalog = course_database
+        else:
+            self.catalog = CourseCatalog(course_database)
+        self.course_db = self.catalog.course_db
         self.time_parser = time_parser
         self.cost_function = cost_function
         
@@ -16,8 +44,61 @@ class TimetableSimulatedAnnealing:
         self.cooling_rate = 0.95
         self.max_iterations = 1000
         
+        # 냉각 스케줄 (cooling_schedules.COOLING_SCHEDULES의 이름, options는 스케줄별 인자)
+        self.cooling_schedule = 'geometric'
+        self.cooling_options = None
+        
+        # 초기 온도 자동 보정: 초기 해 주변 이웃 calibration_samples개의 비용 증가량으로
+        # 나빠지는 이동의 수락 확률이 target_initial_acceptance가 되도록 T0를 정한다
+        self.auto_initial_temperature = False
+        self.calibration_samples = 100
+        self.target_initial_acceptance = 0.8
+        
+        # 조기 종료 조건 (None이면 사용하지 않음, 종료 이유는 결과의 'stop_reason')
+        self.max_no_improvement = None   # 최적해 개선 없이 진행할 최대 반복 수
+        self.time_limit = None           # 최대 실행 시간(초)
+        self.target_cost = None          # 이 비용 이하의 해를 찾으면 종료
+        self.min_acceptance_rate = None  # 최근 acceptance_window회 수락률이 이보다 낮으면 종료
+        self.acceptance_window = 100
+        self.max_evaluations = None      # 평가한 이웃 해 수 상한 (알고리즘 비교 시 같은 예산)
+        
+        # 이웃 이동 생성: feasible_moves는 시간이 겹치는 분반을 후보에서 제외,
+        # compound_move_rate는 swap_course / swap_section_pair 복합 이동을 제안할 확률
+        self.feasible_moves = False
+        self.compound_move_rate = 0.0
+        
+        # 최적화 전 제약 전파로 후보 분반 축소 (constraint_propagation.propagate_domains, 결과의 'propagation')
+        # 처음 optimize할 때 한 번 적용되며, 분반이 하나 남은 필수과목은 분반 변경 이동에서 뺀다
+        self.constraint_propagation = False
+        self.propagation = None
+        self.section_domains = None
+        self.fixed_section_ids = set()
+        
+        # 증분 비용 계산 사용 여부 (debug 옵션은 매 이동마다 전체 계산과 교차 검증)
+        self.use_incremental_cost = True
+        self.debug_incremental_cost = False
+        
+        # 전체 비용 계산 결과 LRU 캐시 크기 (0이면 사용 안 함, 통계는 결과의 'cost_cache')
+        # 같은 해를 다시 방문할 때 calculate_total_cost / get_cost_breakdown을 건너뛴다
+        self.cost_cache_size = 0
+        
+        # 계측 사용 여부 (비용 항목/이웃 이동별 시간, 온도 구간별 수락률 → 결과의 'profile')
+        self.enable_profiling = False
+        
+        # 결과의 cost_history / temperature_history에 남길 최대 점 수
+        # (넘으면 간격을 넓혀 실행 전체를 고르게 솎아냄, None이면 전부 저장, 0이면 기록 안 함)
+        self.history_points = 1000
+        
+        # 이수 과목/선수과목 규칙 기준으로 추가 가능한 분반 색인 (실행 중 변하지 않음)
+        self.completed_courses = set(user_profile['completed_courses'])
+        self.eligibility = EligibilityIndex(self.catalog, user_profile)
+        
         # 과목별 가능한 분반들 미리 계산
         self.available_sections = self._build_available_sections()
+        self.available_section_ids = {
+            course_code: [self.catalog.section_id(course_code, section) for section in sections]
+            for course_code, sections in self.available_sections.items()
+        }
     
     def _build_available_sections(self):
         """각 과목코드별로 선택 가능한 분반들 매핑"""
@@ -26,27 +107,22 @@ class TimetableSimulatedAnnealing:
         # 1. 필수과목들은 자동으로 모든 분반 추가
         required_courses = set(self.user_profile['constraints']['required_courses'])
         
-        for course in self.course_db['courses']:
-            course_code = course['course_code']
-            section = course['section']
-            
-            # 필수과목이면 모든 분반 자동 추가
-            if course_code in required_courses:
-                if course_code not in sections_map:
-                    sections_map[course_code] = []
-                sections_map[course_code].append(section)
+        for course_code in self.user_profile['constraints']['required_courses']:
+            sections = self.catalog.get_sections(course_code)
+            if sections and course_code not in sections_map:
+                sections_map[course_code] = list(sections)
         
         # 2. wanted_courses에 있는 과목들 추가 (우선순위 부여용)
         wanted_courses = {wc['course_code']: wc['sections'] 
                          for wc in self.user_profile.get('wanted_courses', [])}
         
-        for course in self.course_db['courses']:
-            course_code = course['course_code']
-            section = course['section']
-            
+        for course_code, wanted_sections in wanted_courses.items():
             # wanted_courses에 명시된 과목이고 필수과목이 아닌 경우
-            if course_code in wanted_courses and course_code not in required_courses:
-                if section in wanted_courses[course_code]:
+            if course_code in required_courses:
+                continue
+            
+            for section in self.catalog.get_sections(course_code):
+                if section in wanted_sections:
                     if course_code not in sections_map:
                         sections_map[course_code] = []
                     if section not in sections_map[course_code]:  # 중복 방지
@@ -54,6 +130,41 @@ class TimetableSimulatedAnnealing:
         
         return sections_map
     
+    def candidate_domains(self):
+        """과목코드 -> 넣을 수 있는 분반 ID 목록 (필수/희망 과목의 분반과 추가 가능 분반 전체)"""
+        domains = {course_code: list(sids) for course_code, sids in self.available_section_ids.items()}
+        for sid in self.eligibility.section_ids:
+            sids = domains.setdefault(self.catalog.courses[sid]['course_code'], [])
+            if sid not in sids:
+                sids.append(sid)
+        return domains
+    
+    def apply_constraint_propagation(self):
+        """
+        제약 전파로 줄인 후보 분반을 초기 해 생성과 이웃 이동에 반영 (한 번만 적용)
+        Returns: PropagationResult
+        """
+        if self.propagation is not None:
+            return self.propagation
+        
+        self.propagation = propagate_domains(self.candidate_domains(), self.catalog, self.user_profile,
+                                             self.time_parser)
+        allowed = self.propagation.allowed_section_ids()
+        # 분반이 모두 빠진 희망 과목은 후보에서 제외
+        self.available_section_ids = {
+            course_code: [sid for sid in sids if sid in allowed]
+            for course_code, sids in self.available_section_ids.items()
+            if any(sid in allowed for sid in sids)
+        }
+        self.available_sections = {
+            course_code: [self.catalog.courses[sid]['section'] for sid in sids]
+            for course_code, sids in self.available_section_ids.items()
+        }
+        self.eligibility.restrict(allowed)
+        self.section_domains = self.propagation.domains
+        self.fixed_section_ids = set(self.propagation.fixed.values())
+        return self.propagation
+    
     def generate_initial_solution(self):
         """초기 해 생성 (필수과목 우선, wanted_courses 고려, 학점 목표 달성)"""
         solution = []
@@ -110,32 +221,8 @@ class TimetableSimulatedAnnealing:
         """학점 부족 시 추가 과목 자동 선택"""
         additional_courses = []
         current_credits = self._calculate_credits(current_solution)
-        current_codes = {c['course_code'] for c in current_solution}
-        
-        # 선택 가능한 모든 과목들 수집
-        available_courses = []
-        
-        for course in self.course_db['courses']:
-            course_code = course['course_code']
-            
-            # 이미 선택된 과목은 제외
-            if course_code in current_codes:
-                continue
-                
-            # 선수과목 확인
-            if self._has_prerequisite_violation([{'course_code': course_code, 'section': course['section']}]):
-                continue
-                
-            available_courses.append(course)
-        
-        # 학점별로 그룹화하여 효율적 선택
-        courses_by_credits = {}
-        for course in available_courses:
-            credits = course['credits']
-            if credits > 0:  # 0학점 과목 제외
-                if credits not in courses_by_credits:
-                    courses_by_credits[credits] = []
-                courses_by_credits[credits].append(course)
+        # 이미 선택된 과목코드 (추가한 과목도 여기에 넣어 다시 뽑히지 않게 함)
+        excluded_codes = {c['course_code'] for c in current_solution}
         
         # 학점 부족분 계산
         needed_credits = min_credits - current_credits
@@ -143,7 +230,7 @@ class TimetableSimulatedAnnealing:
         
         # 우선 교양영역 요구사항을 만족하는 과목들 선택
         additional_courses.extend(self._select_courses_for_area_requirements(
-            current_solution + additional_courses, courses_by_credits
+            current_solution + additional_courses, excluded_codes
         ))
         
         # 남은 학점 채우기
@@ -152,7 +239,7 @@ class TimetableSimulatedAnnealing:
         remaining_target = max(0, target_additional - current_additional_credits)
         
         # 효율적으로 학점 채우기 (큰 학점부터)
-        credit_values = sorted(courses_by_credits.keys(), reverse=True)
+        credit_values = sorted(self.eligibility.credit_values, reverse=True)
         
         attempts = 0
         max_attempts = 50  # 무한루프 방지
@@ -166,12 +253,10 @@ class TimetableSimulatedAnnealing:
             for credits in credit_values:
                 if credits > remaining_target and remaining_target > 0:
                     continue  # 목표를 너무 초과하는 과목은 스킵
-                    
-                available_in_credits = [c for c in courses_by_credits[credits] 
-                                      if c['course_code'] not in {ac['course_code'] for ac in additional_courses}]
                 
-                if available_in_credits:
-                    selected_course = random.choice(available_in_credits)
+                sid = self.eligibility.sample(excluded_codes, credits)
+                if sid is not None:
+                    selected_course = self.catalog.courses[sid]
                     course_selection = {
                         'course_code': selected_course['course_code'],
                         'section': selected_course['section']
@@ -181,6 +266,7 @@ class TimetableSimulatedAnnealing:
                     test_solution = current_solution + additional_courses + [course_selection]
                     if not self._has_hard_constraints_violation(test_solution):
                         additional_courses.append(course_selection)
+                        excluded_codes.add(course_selection['course_code'])
                         current_additional_credits += credits
                         added_course = True
                         break
@@ -190,8 +276,11 @@ class TimetableSimulatedAnnealing:
         
         return additional_courses
     
-    def _select_courses_for_area_requirements(self, current_solution, courses_by_credits):
-        """교양영역 요구사항을 만족하는 과목 선택"""
+    def _select_courses_for_area_requirements(self, current_solution, excluded_codes):
+        """
+        교양영역 요구사항을 만족하는 과목 선택
+        선택한 과목코드는 excluded_codes에 추가된다.
+        """
         selected_courses = []
         current_areas = self._get_current_area_counts(current_solution)
         area_requirements = self.user_profile['constraints']['area_requirements']
@@ -200,18 +289,17 @@ class TimetableSimulatedAnnealing:
             current_count = current_areas.get(area, 0)
             if current_count < required_count:
                 # 해당 영역의 과목 찾기
-                for credits in courses_by_credits:
-                    area_courses = [c for c in courses_by_credits[credits] 
-                                  if c.get('area') == area and 
-                                  c['course_code'] not in {sc['course_code'] for sc in selected_courses}]
+                for credits in self.eligibility.credit_values:
+                    sid = self.eligibility.sample(excluded_codes, credits, area)
                     
-                    if area_courses:
-                        selected_course = random.choice(area_courses)
+                    if sid is not None:
+                        selected_course = self.catalog.courses[sid]
                         course_selection = {
                             'course_code': selected_course['course_code'],
                             'section': selected_course['section']
                         }
                         selected_courses.append(course_selection)
+                        excluded_codes.add(course_selection['course_code'])
                         current_areas[area] = current_areas.get(area, 0) + 1
                         break
         
@@ -230,9 +318,7 @@ class TimetableSimulatedAnnealing:
     
     def _has_prerequisite_violation(self, test_courses):
         """선수과목 위반 여부 확인"""
-        selected_codes = [c['course_code'] for c in test_courses]
-        completed_codes = self.user_profile['completed_courses']
-        available_codes = completed_codes + selected_codes
+        available_codes = self.completed_courses.union(c['course_code'] for c in test_courses)
         
         prereq_rules = self.user_profile['constraints']['prerequisite_rules']
         
@@ -256,28 +342,23 @@ class TimetableSimulatedAnnealing:
     
     def _get_course_details(self, course_code, section):
         """과목 상세정보 가져오기"""
-        for course in self.course_db['courses']:
-            if course['course_code'] == course_code and course['section'] == section:
-                return course
-        return None
+        return self.catalog.get_course(course_code, section)
     
     def _has_hard_constraints_violation(self, solution):
         """하드 제약 위반 여부 (시간 충돌, 선수과목 등)"""
-        # 시간 충돌 검사
-        schedules = []
+        # 시간 충돌 검사 (지금까지 선택된 시간의 비트마스크와 AND)
+        occupied = 0
         for course_selection in solution:
             course = self._get_course_details(course_selection['course_code'], 
                                            course_selection['section'])
             if course and course['schedule']:
-                for existing_schedule in schedules:
-                    if self.time_parser.check_time_conflict(course['schedule'], existing_schedule):
-                        return True
-                schedules.append(course['schedule'])
+                course_mask = self.time_parser.get_schedule_mask(course['schedule'])
+                if course_mask & occupied:
+                    return True
+                occupied |= course_mask
         
         # 선수과목 검사
-        selected_codes = [c['course_code'] for c in solution]
-        completed_codes = self.user_profile['completed_courses']
-        available_codes = completed_codes + selected_codes
+        available_codes = self.completed_courses.union(c['course_code'] for c in solution)
         
         prereq_rules = self.user_profile['constraints']['prerequisite_rules']
         for course_selection in solution:
@@ -294,93 +375,175 @@ class TimetableSimulatedAnnealing:
         if not current_solution:
             return self.generate_initial_solution()
         
-        neighbor = copy.deepcopy(current_solution)
-        action = random.choice(['change_section', 'add_course', 'remove_course'])
-        
-        if action == 'change_section' and neighbor:
-            # 기존 과목의 분반 변경
-            idx = random.randint(0, len(neighbor) - 1)
-            course_code = neighbor[idx]['course_code']
-            
-            if course_code in self.available_sections:
-                available_sections = self.available_sections[course_code]
-                if len(available_sections) > 1:
-                    new_section = random.choice([s for s in available_sections 
-                                               if s != neighbor[idx]['section']])
-                    neighbor[idx]['section'] = new_section
+        state = SolutionState.from_selections(self.catalog, current_solution)
+        move = self._propose_move(state)
+        if move is not None:
+            state.apply(move)
+        return state.to_selections()
+    
+    def _propose_move(self, state):
+        """
+        이웃 이동 선택 (SolutionState는 변경하지 않음)
+        Returns: Move('change_section' / 'add_course' / 'remove_course'
+                      / 'swap_course' / 'swap_section_pair') 또는 None (변경 없음)
+        feasible_moves가 켜져 있으면 나머지 과목과 시간이 겹치는 분반은 후보에서 뺀다.
+        """
+        if self.compound_move_rate and random.random() < self.compound_move_rate:
+            action = random.choice(['swap_course', 'swap_section_pair'])
+        else:
+            action = random.choice(['change_section', 'add_course', 'remove_course'])
+        
+        if action == 'change_section' and state.sids:
+            # 기존 과목의 분반 변경 (제약 전파로 확정된 분반은 제외)
+            if self.fixed_section_ids:
+                movable_indices = [i for i, sid in enumerate(state.sids) if sid not in self.fixed_section_ids]
+                if not movable_indices:
+                    return None
+                idx = random.choice(movable_indices)
             else:
-                # available_sections에 없는 과목(자동 추가된 과목)의 경우
-                # 같은 과목코드의 다른 분반 찾기
-                same_course_sections = [c['section'] for c in self.course_db['courses'] 
-                                      if c['course_code'] == course_code]
-                if len(same_course_sections) > 1:
-                    new_section = random.choice([s for s in same_course_sections 
-                                               if s != neighbor[idx]['section']])
-                    neighbor[idx]['section'] = new_section
+                idx = random.randint(0, len(state.sids) - 1)
+            current_sid = state.sids[idx]
+            section_ids = self._section_choices(current_sid)
+            
+            if len(section_ids) > 1:
+                candidates = [sid for sid in section_ids if sid != current_sid]
+                if self.feasible_moves:
+                    candidates = self._conflict_free(candidates, self._occupied_mask(state, idx))
+                if candidates:
+                    return Move('change_section', idx, current_sid, random.choice(candidates))
         
         elif action == 'add_course':
             # 새로운 과목 추가
-            current_codes = [c['course_code'] for c in neighbor]
-            
-            # 1순위: wanted_courses에서 선택
-            wanted_courses_list = self.user_profile.get('wanted_courses', [])
-            available_wanted = [wc for wc in wanted_courses_list 
-                              if wc['course_code'] not in current_codes 
-                              and wc['course_code'] in self.available_sections]
-            
-            # 2순위: 전체 과목 중에서 선택 (학점 목표 달성용)
-            if available_wanted:
-                # wanted_courses에서 우선순위 기반 선택
-                weights = [wc['priority'] for wc in available_wanted]
-                selected_course = random.choices(available_wanted, weights=weights)[0]
-                course_code = selected_course['course_code']
-                section = random.choice(self.available_sections[course_code])
-            else:
-                # wanted_courses가 없으면 전체 과목에서 선택
-                eligible_course = self._find_random_eligible_course(current_codes)
-                if eligible_course:
-                    course_code = eligible_course['course_code']
-                    section = eligible_course['section']
-                else:
-                    return neighbor  # 추가할 과목이 없음
-            
-            neighbor.append({'course_code': course_code, 'section': section})
+            occupied = self._occupied_mask(state) if self.feasible_moves else None
+            new_sid = self._pick_course_to_add(state, occupied)
+            if new_sid is not None:
+                return Move('add_course', new_sid=new_sid)
         
-        elif action == 'remove_course' and neighbor:
+        elif action == 'remove_course' and state.sids:
             # 과목 삭제 (필수과목은 제외)
-            required_courses = set(self.user_profile['constraints']['required_courses'])
-            removable_indices = [i for i, c in enumerate(neighbor) 
-                               if c['course_code'] not in required_courses]
-            
+            removable_indices = self._removable_indices(state)
             if removable_indices:
                 idx = random.choice(removable_indices)
-                neighbor.pop(idx)
-        
-        return neighbor
-    
-    def _find_random_eligible_course(self, current_codes):
-        """현재 선택되지 않은 과목 중에서 랜덤하게 하나 선택"""
-        eligible_courses = []
+                return Move('remove_course', idx, old_sid=state.sids[idx])
         
-        for course in self.course_db['courses']:
-            course_code = course['course_code']
+        elif action == 'swap_course' and state.sids:
+            # 과목 하나를 빼고 다른 과목을 같은 자리에 넣기 (삭제 + 추가를 한 번에)
+            removable_indices = self._removable_indices(state)
+            if removable_indices:
+                idx = random.choice(removable_indices)
+                occupied = self._occupied_mask(state, idx) if self.feasible_moves else None
+                new_sid = self._pick_course_to_add(state, occupied)
+                if new_sid is not None:
+                    return Move('swap_course', idx, state.sids[idx], new_sid)
+        
+        elif action == 'swap_section_pair' and len(state.sids) >= 2:
+            # 두 과목의 분반을 함께 변경 (한 과목씩 바꾸면 충돌이 생기는 경우)
+            indices = range(len(state.sids))
+            if self.fixed_section_ids:
+                indices = [i for i, sid in enumerate(state.sids) if sid not in self.fixed_section_ids]
+                if len(indices) < 2:
+                    return None
+            first, second = random.sample(indices, 2)
+            first_sid = state.sids[first]
+            second_sid = state.sids[second]
+            first_candidates = [sid for sid in self._section_choices(first_sid) if sid != first_sid]
+            second_candidates = [sid for sid in self._section_choices(second_sid) if sid != second_sid]
             
-            # 이미 선택된 과목은 제외
-            if course_code in current_codes:
-                continue
-                
-            # 0학점 과목 제외 (채플 같은 것들)
-            if course['credits'] <= 0:
-                continue
-                
-            # 선수과목 확인
-            if not self._has_prerequisite_violation([{'course_code': course_code, 'section': course['section']}]):
-                eligible_courses.append(course)
+            if self.feasible_moves:
+                occupied = self._occupied_mask(state, first, second)
+                first_candidates = self._conflict_free(first_candidates, occupied)
+            if first_candidates and second_candidates:
+                new_first = random.choice(first_candidates)
+                if self.feasible_moves:
+                    second_candidates = self._conflict_free(second_candidates,
+                                                            occupied | self._section_mask(new_first))
+                if second_candidates:
+                    new_second = random.choice(second_candidates)
+                    return Move('swap_section_pair', first, first_sid, new_first,
+                                second=Move('change_section', second, second_sid, new_second))
         
-        if eligible_courses:
-            return random.choice(eligible_courses)
         return None
     
+    def _pick_course_to_add(self, state, occupied=None):
+        """
+        추가할 과목의 분반 ID 선택 (없으면 None)
+        occupied가 주어지면 그 시간과 겹치지 않는 분반만 고른다.
+        """
+        # 1순위: wanted_courses에서 선택
+        wanted_courses_list = self.user_profile.get('wanted_courses', [])
+        available_wanted = [wc for wc in wanted_courses_list 
+                          if not state.has_course_code(wc['course_code'])
+                          and wc['course_code'] in self.available_section_ids]
+        
+        # 2순위: 전체 과목 중에서 선택 (학점 목표 달성용)
+        if available_wanted:
+            # wanted_courses에서 우선순위 기반 선택
+            weights = [wc['priority'] for wc in available_wanted]
+            selected_course = random.choices(available_wanted, weights=weights)[0]
+            section_ids = self.available_section_ids[selected_course['course_code']]
+            if occupied is not None:
+                section_ids = self._conflict_free(section_ids, occupied)
+                if not section_ids:
+                    return None
+            return random.choice(section_ids)
+        
+        # wanted_courses가 없으면 전체 과목에서 선택
+        return self._find_random_eligible_course(state.code_counts, occupied)
+    
+    def _section_choices(self, sid):
+        """sid와 같은 과목의 선택 가능한 분반 ID 목록"""
+        course_code = self.catalog.courses[sid]['course_code']
+        if course_code in self.available_section_ids:
+            return self.available_section_ids[course_code]
+        # available_sections에 없는 과목(자동 추가된 과목)의 경우
+        # 같은 과목코드의 다른 분반 찾기 (제약 전파를 했으면 남은 분반만)
+        if self.section_domains is not None and course_code in self.section_domains:
+            return self.section_domains[course_code]
+        return self.catalog.get_section_ids(course_code)
+    
+    def _removable_indices(self, state):
+        """삭제할 수 있는 (필수과목이 아닌) 과목 위치"""
+        required_courses = set(self.user_profile['constraints']['required_courses'])
+        return [i for i, sid in enumerate(state.sids) 
+                if self.catalog.courses[sid]['course_code'] not in required_courses]
+    
+    def _section_mask(self, sid):
+        """분반 시간표 비트마스크"""
+        schedule = self.catalog.courses[sid]['schedule']
+        return self.time_parser.get_schedule_mask(schedule) if schedule else 0
+    
+    def _occupied_mask(self, state, *skip_indices):
+        """skip_indices 위치를 제외한 과목들이 차지하는 시간 비트마스크"""
+        occupied = 0
+        for idx, sid in enumerate(state.sids):
+            if idx not in skip_indices:
+                occupied |= self._section_mask(sid)
+        return occupied
+    
+    def _conflict_free(self, section_ids, occupied):
+        """occupied와 시간이 겹치지 않는 분반만 (섹션 충돌 그래프 대신 비트마스크 AND 사용)"""
+        return [sid for sid in section_ids if not self._section_mask(sid) & occupied]
+    
+    def _has_time_conflict(self, sids):
+        """분반 목록 안에 시간이 겹치는 쌍이 있는지"""
+        occupied = 0
+        for sid in sids:
+            mask = self._section_mask(sid)
+            if mask & occupied:
+                return True
+            occupied |= mask
+        return False
+    
+    def _find_random_eligible_course(self, current_codes, occupied=None):
+        """
+        현재 선택되지 않은 과목 중에서 랜덤하게 분반 하나 선택 (occupied와 겹치는 분반 제외)
+        Returns: 분반 ID 또는 None
+        """
+        if occupied is None:
+            return self.eligibility.sample(current_codes)
+        return self.eligibility.sample(current_codes,
+                                       accept=lambda sid: not self._section_mask(sid) & occupied)
+    
     def acceptance_probability(self, current_cost, new_cost, temperature):
         """수락 확률 계산"""
         if new_cost < current_cost:
@@ -388,66 +551,369 @@ class TimetableSimulatedAnnealing:
         else:
             return math.exp(-(new_cost - current_cost) / temperature)
     
-    def optimize(self, verbose=True):
-        """시뮬레이티드 어닐링 최적화 실행"""
+    def optimize(self, verbose=True, progress=None, cancel_token=None):
+        """
+        시뮬레이티드 어닐링 최적화 실행
+        progress: 반복마다 ProgressEvent를 받는 호출 가능한 객체 또는 그 목록 (progress.py의 수신기 등)
+        cancel_token: CancellationToken (취소되거나 마감이 지나면 그때까지의 최적해 반환,
+                      종료 이유는 'cancelled' / 'deadline')
+        """
+        steps = self._run(verbose, progress, cancel_token, anytime=False)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+    
+    def iter_improvements(self, verbose=False, progress=None, cancel_token=None):
+        """
+        애니타임 최적화: 초기 해와 최적해가 개선될 때마다
+        {'iteration', 'best_cost', 'best_solution', 'elapsed_seconds', 'stop_reason': None}을 내보내고,
+        마지막으로 optimize()와 같은 결과 딕셔너리(stop_reason 포함)를 내보내는 제너레이터
+        중간에 그만 읽어도 된다 (close() 시 계측 등 정리).
+        """
+        result = yield from self._run(verbose, progress, cancel_token, anytime=True)
+        yield result
+    
+    async def aiter_improvements(self, progress=None, cancel_token=None):
+        """
+        iter_improvements의 비동기 반복자 버전
+        최적화는 기본 스레드 풀에서 실행되어 이벤트 루프를 막지 않고,
+        반복을 중단하면(break, 태스크 취소) 실행 중인 최적화도 취소된다.
+        """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        token = CancellationToken(parent=cancel_token)
+        
+        def drive():
+            try:
+                for item in self.iter_improvements(progress=progress, cancel_token=token):
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+        
+        worker = loop.run_in_executor(None, drive)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield item
+            await worker
+        finally:
+            token.cancel()
+            if not worker.done():
+                await asyncio.wait([worker])
+    
+    def _run(self, verbose, progress, cancel_token, anytime):
+        """계측/캐시를 준비하고 _anneal 실행 (제너레이터, 반환값은 결과 딕셔너리)"""
+        if progress is None:
+            progress = []
+        elif callable(progress):
+            progress = [progress]
+        if self.constraint_propagation:
+            self.apply_constraint_propagation()
+            if verbose:
+                print(f"제약 전파: {self.propagation.summary()}")
+        profiler = OptimizationProfiler() if self.enable_profiling else None
+        self.cost_function.profiler = profiler
+        if self.cost_cache_size and self.cost_function.cost_cache is None:
+            self.cost_function.cost_cache = CostCache(self.cost_cache_size)
+        try:
+            return (yield from self._anneal(verbose, profiler, progress, cancel_token, anytime))
+        finally:
+            self.cost_function.profiler = None
+    
+    def _anneal(self, verbose, profiler, progress, cancel_token, anytime):
+        """
+        optimize 본체 (profiler가 None이면 계측하지 않음, progress는 진행 이벤트 수신기 목록)
+        anytime이면 초기 해와 최적해 개선마다 중간 결과를 yield한다.
+        """
+        start_clock = time.perf_counter()
+        
         # 초기 해 생성
-        current_solution = self.generate_initial_solution()
-        current_cost = self.cost_function.calculate_total_cost(current_solution)
+        if profiler is not None:
+            start_time = profiler.clock()
+        initial_solution = self.generate_initial_solution()
+        if profiler is not None:
+            profiler.record('initial_solution', profiler.clock() - start_time)
+        current_cost = self.cost_function.calculate_total_cost(initial_solution)
+        
+        # 루프 안에서는 정수 분반 ID 기반 해를 제자리에서 수정 (deepcopy 없음)
+        evaluator = None
+        if self.use_incremental_cost:
+            evaluator = IncrementalCostEvaluator(self.cost_function)
+            evaluator.debug_check = self.debug_incremental_cost
+            evaluator.reset(initial_solution)
+            state = evaluator.state
+        else:
+            state = SolutionState.from_selections(self.catalog, initial_solution)
         
-        best_solution = copy.deepcopy(current_solution)
+        best_sids = state.snapshot()
         best_cost = current_cost
         
-        temperature = self.initial_temperature
+        # 초기 온도 자동 보정 (표본 평가도 평가 수 예산, 시간 제한, 취소에 포함)
+        initial_temperature = self.initial_temperature
+        calibration_evaluations = 0
+        if self.auto_initial_temperature and state.sids:
+            samples = self.calibration_samples
+            if self.max_evaluations is not None:
+                samples = min(samples, self.max_evaluations)
+            
+            def calibration_stopped():
+                if self.time_limit is not None and time.perf_counter() - start_clock >= self.time_limit:
+                    return True
+                return cancel_token is not None and cancel_token.reason is not None
+            
+            transitions = self._sample_transitions(state, evaluator, current_cost, samples, calibration_stopped)
+            calibration_evaluations = len(transitions)
+            calibrated = calibrate_initial_temperature(transitions, self.target_initial_acceptance)
+            if calibrated is not None:
+                initial_temperature = calibrated
+        
+        schedule = create_cooling_schedule(self.cooling_schedule, self.cooling_rate, self.cooling_options)
+        schedule.reset(initial_temperature, self.final_temperature, self.max_iterations)
+        
+        temperature = initial_temperature
         iteration = 0
+        last_improvement = 0
+        
+        # 비용/온도 히스토리는 history_points개 이내로 솎아서 보관 (메모리 일정)
+        history = DownsampledHistory(self.history_points) if self.history_points != 0 else None
         
-        cost_history = []
-        temperature_history = []
+        # 평가한 이웃 해 수 (초기 온도 보정 표본 포함)와 그중 시간 충돌이 있는 해의 수
+        evaluations = calibration_evaluations
+        infeasible_evaluations = 0
+        
+        # 최적해 개선 기록 [(경과 초, 평가 수, 최적 비용)] (알고리즘 비교의 목표 도달 시간용)
+        improvements = [(time.perf_counter() - start_clock, 0, best_cost)]
+        
+        stop_reason = self._initial_stop_reason(initial_temperature, best_cost)
+        if stop_reason is None and self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            stop_reason = 'max_evaluations'
+        if stop_reason is None and self.time_limit is not None and time.perf_counter() - start_clock >= self.time_limit:
+            stop_reason = 'time_limit'
+        if stop_reason is None and cancel_token is not None:
+            stop_reason = cancel_token.reason
+        
+        # 최근 수락 여부 (수락률 기반 종료용)
+        recent_acceptance = None
+        recent_accepted = 0
+        if self.min_acceptance_rate is not None:
+            recent_acceptance = deque(maxlen=self.acceptance_window)
         
         if verbose:
-            print(f"초기 해: 비용 = {current_cost:.2f}, 과목 수 = {len(current_solution)}")
+            print(f"초기 해: 비용 = {current_cost:.2f}, 과목 수 = {len(state)}")
+            if initial_temperature != self.initial_temperature:
+                print(f"초기 온도 자동 보정: {initial_temperature:.2f}")
             print("최적화 시작...")
         
-        while temperature > self.final_temperature and iteration < self.max_iterations:
-            # 이웃 해 생성
-            neighbor_solution = self.generate_neighbor(current_solution)
-            neighbor_cost = self.cost_function.calculate_total_cost(neighbor_solution)
+        if anytime:
+            yield self._improvement(iteration, best_cost, best_sids, start_clock)
+        
+        while stop_reason is None:
+            if state.sids:
+                # 이웃 이동 하나를 평가하고, 수락된 경우에만 해에 반영
+                if profiler is not None:
+                    start_time = profiler.clock()
+                move = self._propose_move(state)
+                if profiler is not None:
+                    now = profiler.clock()
+                    profiler.record(f"neighbor.{move.kind if move is not None else 'none'}", now - start_time)
+                    start_time = now
+                
+                if move is None:
+                    neighbor_cost = current_cost
+                elif evaluator is not None:
+                    neighbor_cost = evaluator.evaluate_move(move)
+                    evaluations += 1
+                    if evaluator.evaluated_conflict_pairs:
+                        infeasible_evaluations += 1
+                else:
+                    state.apply(move)
+                    neighbor_cost = self.cost_function.calculate_total_cost(state.to_selections())
+                    evaluations += 1
+                    if self._has_time_conflict(state.sids):
+                        infeasible_evaluations += 1
+                    state.undo(move)
+                
+                if profiler is not None and move is not None:
+                    evaluation = 'incremental' if evaluator is not None else 'full'
+                    profiler.record(f'evaluation.{evaluation}', profiler.clock() - start_time)
+                
+                accepted = random.random() < self.acceptance_probability(current_cost, neighbor_cost, temperature)
+                if accepted and move is not None:
+                    if evaluator is not None:
+                        evaluator.apply_move(move)
+                    else:
+                        state.apply(move)
+            else:
+                # 빈 해는 초기 해를 새로 생성
+                neighbor_solution = self.generate_initial_solution()
+                neighbor_cost = self.cost_function.calculate_total_cost(neighbor_solution)
+                accepted = random.random() < self.acceptance_probability(current_cost, neighbor_cost, temperature)
+                if accepted:
+                    if evaluator is not None:
+                        evaluator.reset(neighbor_solution)
+                        state = evaluator.state
+                    else:
+                        state = SolutionState.from_selections(self.catalog, neighbor_solution)
+            
+            if profiler is not None:
+                profiler.record_acceptance(temperature, accepted)
             
             # 수락 여부 결정
-            if random.random() < self.acceptance_probability(current_cost, neighbor_cost, temperature):
-                current_solution = neighbor_solution
+            if accepted:
                 current_cost = neighbor_cost
                 
                 # 최적해 업데이트
                 if current_cost < best_cost:
-                    best_solution = copy.deepcopy(current_solution)
+                    best_sids = state.snapshot()
                     best_cost = current_cost
+                    last_improvement = iteration + 1
+                    improvements.append((time.perf_counter() - start_clock, evaluations, best_cost))
                     
                     if verbose and iteration % 100 == 0:
                         print(f"반복 {iteration}: 새로운 최적해 발견! 비용 = {best_cost:.2f}")
+                    
+                    if anytime:
+                        yield self._improvement(iteration + 1, best_cost, best_sids, start_clock)
             
-            # 온도 감소
-            temperature *= self.cooling_rate
+            # 온도 갱신
             iteration += 1
+            temperature = schedule.next_temperature(temperature, iteration, accepted)
             
-            # 히스토리 기록
-            cost_history.append(current_cost)
-            temperature_history.append(temperature)
+            # 히스토리 기록, 진행 이벤트 전달
+            if history is not None:
+                history.record(iteration, current_cost, temperature)
+            if progress:
+                event = ProgressEvent(iteration, current_cost, best_cost, temperature, accepted)
+                for sink in progress:
+                    sink(event)
             
             if verbose and iteration % 200 == 0:
                 print(f"반복 {iteration}: 현재 비용 = {current_cost:.2f}, 온도 = {temperature:.2f}")
+            
+            # 종료 조건 확인
+            if recent_acceptance is not None:
+                if len(recent_acceptance) == recent_acceptance.maxlen:
+                    recent_accepted -= recent_acceptance[0]
+                recent_acceptance.append(accepted)
+                recent_accepted += accepted
+            
+            if temperature <= self.final_temperature:
+                stop_reason = 'final_temperature'
+            elif iteration >= self.max_iterations:
+                stop_reason = 'max_iterations'
+            elif self.target_cost is not None and best_cost <= self.target_cost:
+                stop_reason = 'target_cost'
+            elif self.max_no_improvement is not None and iteration - last_improvement >= self.max_no_improvement:
+                stop_reason = 'no_improvement'
+            elif self.time_limit is not None and time.perf_counter() - start_clock >= self.time_limit:
+                stop_reason = 'time_limit'
+            elif (recent_acceptance is not None and len(recent_acceptance) == recent_acceptance.maxlen
+                  and recent_accepted < self.min_acceptance_rate * recent_acceptance.maxlen):
+                stop_reason = 'low_acceptance'
+            elif self.max_evaluations is not None and evaluations >= self.max_evaluations:
+                stop_reason = 'max_evaluations'
+            elif cancel_token is not None:
+                stop_reason = cancel_token.reason
         
         if verbose:
             print(f"최적화 완료! 최종 비용 = {best_cost:.2f}")
-            print(f"총 반복 횟수: {iteration}")
+            print(f"총 반복 횟수: {iteration} (종료 이유: {stop_reason})")
         
         return {
-            'best_solution': best_solution,
+            'best_solution': SolutionState(self.catalog, best_sids).to_selections(),
             'best_cost': best_cost,
-            'cost_history': cost_history,
-            'temperature_history': temperature_history,
-            'iterations': iteration
+            'cost_history': history.costs if history is not None else [],
+            'temperature_history': history.temperatures if history is not None else [],
+            'history_iterations': history.iterations if history is not None else [],
+            'iterations': iteration,
+            'initial_temperature': initial_temperature,
+            'evaluations': evaluations,
+            'infeasible_evaluation_ratio': infeasible_evaluations / evaluations if evaluations else 0.0,
+            'stop_reason': stop_reason,
+            'elapsed_seconds': time.perf_counter() - start_clock,
+            'improvements': improvements,
+            'cost_cache': self.cost_function.cost_cache.stats() if self.cost_function.cost_cache is not None else None,
+            'profile': profiler.summary() if profiler is not None else None,
+            'propagation': self.propagation.to_dict() if self.propagation is not None else None
         }
     
+    def _improvement(self, iteration, best_cost, best_sids, start_clock):
+        """애니타임 중간 결과"""
+        return {
+            'iteration': iteration,
+            'best_cost': best_cost,
+            'best_solution': SolutionState(self.catalog, best_sids).to_selections(),
+            'elapsed_seconds': time.perf_counter() - start_clock,
+            'stop_reason': None
+        }
+    
+    def _initial_stop_reason(self, initial_temperature, initial_cost):
+        """반복을 시작하기도 전에 종료해야 하는 경우의 종료 이유 (없으면 None)"""
+        if self.min_acceptance_rate is not None and self.acceptance_window < 1:
+            raise ValueError(f"acceptance_window는 1 이상이어야 합니다: {self.acceptance_window}")
+        if initial_temperature <= self.final_temperature:
+            return 'final_temperature'
+        if self.max_iterations <= 0:
+            return 'max_iterations'
+        if self.max_evaluations is not None and self.max_evaluations <= 0:
+            return 'max_evaluations'
+        if self.target_cost is not None and initial_cost <= self.target_cost:
+            return 'target_cost'
+        return None
+    
+    def _sample_transitions(self, state, evaluator, current_cost, samples, should_stop=None):
+        """
+        현재 해에서 이웃 이동 samples개를 평가해 [(현재 비용, 이웃 비용)] 반환 (해는 바뀌지 않음)
+        should_stop: 표본마다 확인하는 중단 조건 (True를 반환하면 그때까지의 표본만 반환)
+        """
+        transitions = []
+        for _ in range(samples):
+            if should_stop is not None and should_stop():
+                break
+            move = self._propose_move(state)
+            if move is None:
+                continue
+            if evaluator is not None:
+                neighbor_cost = evaluator.evaluate_move(move)
+            else:
+                state.apply(move)
+                neighbor_cost = self.cost_function.calculate_total_cost(state.to_selections())
+                state.undo(move)
+            transitions.append((current_cost, neighbor_cost))
+        return transitions
+    
+    def calibrate_initial_temperature(self, solution=None):
+        """
+        solution(기본: 새 초기 해) 주변 이웃의 비용 증가량으로 초기 온도 추정
+        Returns: 추정 온도 (나빠지는 이웃이 없으면 현재 initial_temperature)
+        """
+        if solution is None:
+            solution = self.generate_initial_solution()
+        state = SolutionState.from_selections(self.catalog, solution)
+        if not state.sids:
+            return self.initial_temperature
+        
+        current_cost = self.cost_function.calculate_total_cost(solution)
+        transitions = self._sample_transitions(state, None, current_cost, self.calibration_samples)
+        calibrated = calibrate_initial_temperature(transitions, self.target_initial_acceptance)
+        return calibrated if calibrated is not None else self.initial_temperature
+    
+    def optimize_parallel(self, n_runs=8, workers=None, base_seed=None):
+        """
+        서로 다른 시드의 독립 SA 체인을 여러 프로세스에서 실행하고 최적해 반환
+        (parallel_optimizer.optimize_parallel 참고)
+        """
+        from parallel_optimizer import optimize_parallel
+        
+        return optimize_parallel(self.user_profile, self.catalog, n_runs=n_runs, workers=workers,
+                                 base_seed=base_seed, sa_parameters=self.get_parameters())
+    
     def print_solution(self, solution):
         """해 출력"""
         print("\n=== 최적 시간표 ===")
@@ -522,17 +988,18 @@ class TimetableSimulatedAnnealing:
         
         # 공강일 분석 (NEW!)
         print("\n=== 공강일 분석 ===")
-        matrix = self.time_parser.get_weekly_schedule_matrix([
+        occupancy = self.time_parser.get_occupancy_mask([
             self._get_course_details(c['course_code'], c['section']) 
             for c in solution if self._get_course_details(c['course_code'], c['section'])
         ])
+        day_masks = self.time_parser.get_day_masks(occupancy)
         
         weekdays = ['월', '화', '수', '목', '금']
         days_with_classes = []
         free_days = []
         
         for day_idx, day_name in enumerate(weekdays):
-            has_classes = any(period != '' for period in matrix[day_idx])
+            has_classes = day_masks[day_idx] != 0
             if has_classes:
                 days_with_classes.append(day_name)
             else:
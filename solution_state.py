@@ -0,0 +1,127 @@
+class Move:
+    """
+    이웃 이동 기술자 (해를 복사하지 않고 제자리에서 적용/되돌리기)
+    kind: 'change_section' / 'add_course' / 'remove_course'
+          / 'swap_course' (index 위치의 과목을 다른 과목 분반으로 교체)
+          / 'swap_section_pair' (두 과목의 분반을 함께 변경, 두 번째 변경은 second)
+    index: 대상 위치 (add_course는 적용 시점에 끝 위치로 채워짐)
+    old_sid / new_sid: 이동 전후 분반 ID
+    """
+    __slots__ = ('kind', 'index', 'old_sid', 'new_sid', 'second')
+
+    def __init__(self, kind, index=None, old_sid=None, new_sid=None, second=None):
+        self.kind = kind
+        self.index = index
+        self.old_sid = old_sid
+        self.new_sid = new_sid
+        self.second = second
+
+    def __repr__(self):
+        text = f"Move({self.kind!r}, index={self.index}, old_sid={self.old_sid}, new_sid={self.new_sid}"
+        if self.second is not None:
+            text += f", second={self.second!r}"
+        return text + ")"
+
+
+class SolutionState:
+    """
+    정수 분반 ID(sid) 리스트로 표현한 해
+    최적화 루프 안에서는 이 구조만 사용하고, 마지막에 to_selections()로
+    기존 [{'course_code', 'section'}] 형식으로 변환한다.
+    """
+    __slots__ = ('catalog', 'sids', 'code_counts')
+
+    def __init__(self, catalog, sids=None):
+        self.catalog = catalog
+        self.sids = []
+        self.code_counts = {}
+        for sid in sids or []:
+            self.insert(len(self.sids), sid)
+
+    @classmethod
+    def from_selections(cls, catalog, selections):
+        """[{'course_code', 'section'}] 형식의 해를 변환"""
+        sids = []
+        for course_selection in selections:
+            sid = catalog.section_id(course_selection['course_code'], course_selection['section'])
+            if sid is None:
+                raise ValueError(f"카탈로그에 없는 분반입니다: "
+                                 f"{course_selection['course_code']}-{course_selection['section']}")
+            sids.append(sid)
+        return cls(catalog, sids)
+
+    def to_selections(self):
+        """기존 [{'course_code', 'section'}] 형식으로 변환"""
+        courses = self.catalog.courses
+        return [{'course_code': courses[sid]['course_code'], 'section': courses[sid]['section']}
+                for sid in self.sids]
+
+    def snapshot(self):
+        """현재 분반 ID 목록 복사본 (최적해 보관용)"""
+        return list(self.sids)
+
+    def __len__(self):
+        return len(self.sids)
+
+    def course_code(self, idx):
+        return self.catalog.courses[self.sids[idx]]['course_code']
+
+    def section(self, idx):
+        return self.catalog.courses[self.sids[idx]]['section']
+
+    def has_course_code(self, course_code):
+        return course_code in self.code_counts
+
+    def course_codes(self):
+        """선택된 과목코드 목록 (해 순서)"""
+        courses = self.catalog.courses
+        return [courses[sid]['course_code'] for sid in self.sids]
+
+    def insert(self, idx, sid):
+        course_code = self.catalog.courses[sid]['course_code']
+        self.sids.insert(idx, sid)
+        self.code_counts[course_code] = self.code_counts.get(course_code, 0) + 1
+
+    def pop(self, idx):
+        sid = self.sids.pop(idx)
+        course_code = self.catalog.courses[sid]['course_code']
+        remaining = self.code_counts[course_code] - 1
+        if remaining:
+            self.code_counts[course_code] = remaining
+        else:
+            del self.code_counts[course_code]
+        return sid
+
+    def replace(self, idx, sid):
+        """idx번째 분반 교체"""
+        courses = self.catalog.courses
+        if courses[self.sids[idx]]['course_code'] == courses[sid]['course_code']:
+            self.sids[idx] = sid
+        else:
+            self.pop(idx)
+            self.insert(idx, sid)
+
+    def apply(self, move):
+        """이동 적용"""
+        if move.kind == 'change_section' or move.kind == 'swap_course':
+            self.replace(move.index, move.new_sid)
+        elif move.kind == 'add_course':
+            move.index = len(self.sids)
+            self.insert(move.index, move.new_sid)
+        elif move.kind == 'swap_section_pair':
+            self.replace(move.index, move.new_sid)
+            self.apply(move.second)
+        else:
+            self.pop(move.index)
+
+    def undo(self, move):
+        """apply()로 적용한 이동 되돌리기"""
+        if move.kind == 'change_section' or move.kind == 'swap_course':
+            self.replace(move.index, move.old_sid)
+        elif move.kind == 'add_course':
+            self.pop(move.index)
+        elif move.kind == 'swap_section_pair':
+            self.undo(move.second)
+            self.replace(move.index, move.old_sid)
+        else:
+            self.insert(move.index, move.old_sid)
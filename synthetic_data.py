@@ -0,0 +1,131 @@
+"""
+벤치마크용 합성 과목 데이터/사용자 프로필 생성기
+같은 시드와 설정이면 항상 같은 데이터를 만든다.
+"""
+
+import random
+
+DAY_CHARS = ['월', '화', '수', '목', '금']
+CATEGORIES = ['전필', '전선', '교선']
+
+
+def _random_schedule(rng):
+    """'월4-6' 또는 '화1-2,목1-2' 형식의 시간표 문자열"""
+    if rng.random() < 0.6:
+        day = rng.choice(DAY_CHARS)
+        start = rng.randint(1, 13)
+        return f"{day}{start}-{start + 2}"
+
+    days = rng.sample(DAY_CHARS, 2)
+    start = rng.randint(1, 14)
+    return ",".join(f"{day}{start}-{start + 1}" for day in days)
+
+
+def generate_catalog(n_courses=300, sections_per_course=3, n_areas=4, n_professors=None, seed=0):
+    """
+    합성 courses.json 데이터 생성
+    총 분반 수 = n_courses * sections_per_course
+    """
+    rng = random.Random(seed)
+    if n_professors is None:
+        n_professors = max(10, n_courses // 2)
+    professors = [f"교수{i:04d}" for i in range(n_professors)]
+    areas = [f"{i + 1}영역" for i in range(n_areas)]
+
+    courses = []
+    for course_idx in range(n_courses):
+        course_code = f"{course_idx + 10000:05d}"
+        category = rng.choice(CATEGORIES)
+        area = rng.choice(areas) if category == '교선' else ""
+        credits = rng.choice([3, 3, 3, 2, 1])
+        year_level = rng.randint(1, 4)
+
+        for section_idx in range(sections_per_course):
+            courses.append({
+                'course_code': course_code,
+                'section': f"{section_idx + 1:03d}",
+                'course_name': f"과목{course_code}",
+                'credits': credits,
+                'professor': rng.choice(professors),
+                'schedule': _random_schedule(rng),
+                'classroom': f"강{rng.randint(100, 599)}",
+                'category': category,
+                'area': area,
+                'year_level': year_level
+            })
+
+    return {'courses': courses}
+
+
+def generate_profile(course_database, prerequisite_density=0.1, n_required=3, n_wanted=3,
+                     n_completed=10, seed=0):
+    """
+    합성 user_profile.json 데이터 생성
+    prerequisite_density: 선수과목 규칙을 갖는 과목 비율
+    """
+    rng = random.Random(seed)
+    course_codes = list(dict.fromkeys(course['course_code'] for course in course_database['courses']))
+    areas = sorted({course['area'] for course in course_database['courses'] if course['area']})
+
+    sampled = rng.sample(course_codes, min(len(course_codes), n_completed + n_required + n_wanted))
+    completed = sampled[:n_completed]
+    required = sampled[n_completed:n_completed + n_required]
+    wanted = sampled[n_completed + n_required:]
+
+    prerequisite_rules = {}
+    for course_code in course_codes:
+        if rng.random() < prerequisite_density:
+            candidates = [code for code in rng.sample(course_codes, min(3, len(course_codes)))
+                          if code != course_code]
+            prerequisite_rules[course_code] = candidates[:rng.randint(1, 2)]
+    # 필수과목은 선수과목 없이 수강 가능하도록
+    for course_code in required:
+        prerequisite_rules[course_code] = []
+
+    return {
+        'student_id': f"{seed:010d}",
+        'name': f"학생{seed}",
+        'current_year': 3,
+        'major': "컴퓨터공학과",
+        'completed_courses': completed,
+        'current_credits': 3 * len(completed),
+        'target_credits_this_semester': 18,
+        'min_credits': 15,
+        'max_credits': 21,
+        'preferences': {
+            'preferred_times': [],
+            'avoid_times': ["금7-15"],
+            'preferred_professors': [],
+            'avoid_professors': [],
+            'lunch_time_required': True,
+            'lunch_preferred_periods': [5, 6],
+            'max_consecutive_classes': 3,
+            'preferred_areas': []
+        },
+        'constraints': {
+            'required_courses': required,
+            'prerequisite_rules': prerequisite_rules,
+            'year_restrictions': {},
+            'area_requirements': {area: 1 for area in areas}
+        },
+        'wanted_courses': [
+            {'course_code': course_code, 'priority': rng.randint(1, 9), 'sections': ["001", "002"],
+             'reason': ""}
+            for course_code in wanted
+        ],
+        'cost_function_weights': {
+            'time_conflict': 1000,
+            'prerequisite_violation': 1000,
+            'credit_shortage': 300,
+            'credit_excess': 200,
+            'required_course_missing': 800,
+            'consecutive_classes': 50,
+            'non_preferred_time': 30,
+            'avoid_time_violation': 100,
+            'lunch_time_violation': 80,
+            'non_preferred_professor': 20,
+            'area_requirement_violation': 150,
+            'low_priority_course': 10,
+            'free_days_bonus': 500
+        }
+    }
@@ -0,0 +1,224 @@
+import time
+
+from incremental_cost import IncrementalCostEvaluator
+from optimizer_base import Optimizer, register_optimizer
+from progress import DownsampledHistory
+from simulated_annealing import TimetableSimulatedAnnealing
+from solution_state import Move, SolutionState
+
+
+@register_optimizer('tabu_search')
+class TabuSearch(Optimizer):
+    """
+    타부 탐색 최적화
+    매 반복마다 현재 해의 이웃 전체를 증분 비용으로 평가하고, 타부가 아닌 가장 좋은 이동을 (나빠지더라도) 적용한다.
+    - 이웃: 선택된 과목마다 다른 모든 분반으로 변경 / 필수과목이 아닌 과목 삭제 / 추가 후보 상위 max_additions개
+    - 타부: 이동으로 빠지거나 들어온 (과목코드, 분반)은 tenure회 동안 다시 넣거나 뺄 수 없다
+    - 열망 기준: 타부 이동이라도 지금까지의 최적해보다 좋아지면 허용
+    추가 후보는 희망/필수 과목 분반을 먼저, 나머지 추가 가능 분반은 정적 비용(시간/교수 선호, 우선순위)
+    오름차순으로 보고, 이미 선택된 과목이거나 현재 해와 시간이 겹치는 분반은 건너뛴다.
+    sampler의 constraint_propagation을 켜면 분반 변경과 추가 후보 모두 줄인 후보 분반 안에서만 고른다
+    (확정된 필수과목은 다른 분반이 남지 않으므로 바뀌지 않음).
+    """
+
+    PARAMETER_NAMES = ['max_iterations', 'tenure', 'max_additions', 'max_no_improvement',
+                       'time_limit', 'target_cost', 'max_evaluations', 'history_points']
+
+    def __init__(self, user_profile, course_database, time_parser, cost_function):
+        # 초기 해 생성기, 분반 후보/시간 마스크 조회용
+        self.sampler = TimetableSimulatedAnnealing(user_profile, course_database, time_parser, cost_function)
+        self.catalog = self.sampler.catalog
+        self.cost_function = cost_function
+        self.required_courses = set(user_profile['constraints']['required_courses'])
+
+        self.max_iterations = 200
+        self.tenure = 7
+        self.max_additions = 20
+
+        # 조기 종료 조건 (None이면 사용하지 않음)
+        self.max_no_improvement = 50
+        self.time_limit = None
+        self.target_cost = None
+        self.max_evaluations = None  # 평가한 이동 수 상한 (반복 단위로 확인)
+
+        self.history_points = 1000
+
+        # 실행 간 공유: 분반별 비용 항목 캐시, 추가 후보 순서 (프로필과 카탈로그가 같으면 변하지 않음)
+        self._terms_cache = {}
+        self._ranking = None
+
+    def set_parameters(self, parameters):
+        """파라미터 일괄 설정 (constraint_propagation 등 SA 파라미터는 sampler로 전달)"""
+        for name, value in parameters.items():
+            if name in self.PARAMETER_NAMES:
+                setattr(self, name, value)
+            else:
+                self.sampler.set_parameters({name: value})
+
+    def _addition_ranking(self, evaluator):
+        """
+        추가 후보 분반 순서 (희망/필수 과목 분반 → 나머지 추가 가능 분반, 각각 정적 비용 오름차순)
+        Returns: [(분반 ID, 시간 비트마스크, 과목코드)]
+        """
+        if self._ranking is not None:
+            return self._ranking
+        preferred = [sid for sids in self.sampler.available_section_ids.values() for sid in sids]
+        preferred_set = set(preferred)
+        others = [sid for sid in self.sampler.eligibility.section_ids if sid not in preferred_set]
+        preferred.sort(key=evaluator.section_static_cost)
+        others.sort(key=evaluator.section_static_cost)
+        self._ranking = []
+        for sid in preferred + others:
+            terms = evaluator._section_terms(sid)
+            self._ranking.append((sid, terms.mask, terms.course_code))
+        return self._ranking
+
+    def _addition_candidates(self, state, ranking, occupied):
+        candidates = []
+        for sid, mask, course_code in ranking:
+            if mask & occupied or state.has_course_code(course_code):
+                continue
+            candidates.append(sid)
+            if len(candidates) >= self.max_additions:
+                break
+        return candidates
+
+    def optimize(self, verbose=True, cancel_token=None):
+        """
+        타부 탐색 실행
+        Returns: {'best_solution', 'best_cost', 'iterations', 'evaluations', 'stop_reason',
+                  'neighborhood_seconds', 'evaluations_per_ms', 'propagation', ...}
+        """
+        start_clock = time.perf_counter()
+        sampler = self.sampler
+        propagation = None
+        if sampler.constraint_propagation:
+            if sampler.propagation is None:
+                self._ranking = None  # 줄어든 후보로 추가 순서를 다시 만든다
+            propagation = sampler.apply_constraint_propagation()
+            if verbose:
+                print(f"제약 전파: {propagation.summary()}")
+
+        evaluator = IncrementalCostEvaluator(self.cost_function)
+        evaluator._terms_cache = self._terms_cache
+        evaluator.reset(sampler.generate_initial_solution())
+        state = evaluator.state
+        ranking = self._addition_ranking(evaluator)
+
+        current_cost = evaluator.total_cost()
+        best_cost = current_cost
+        best_sids = state.snapshot()
+
+        tabu_until = {}  # sid -> 이 반복 전까지 타부
+        history = DownsampledHistory(self.history_points) if self.history_points != 0 else None
+        evaluations = 0
+        neighborhood_seconds = 0.0
+        iteration = 0
+        last_improvement = 0
+        improvements = [(time.perf_counter() - start_clock, 0, best_cost)]
+
+        stop_reason = 'max_iterations' if self.max_iterations <= 0 else None
+        if stop_reason is None and self.max_evaluations is not None and self.max_evaluations <= 0:
+            stop_reason = 'max_evaluations'
+        if stop_reason is None and self.target_cost is not None and best_cost <= self.target_cost:
+            stop_reason = 'target_cost'
+        if stop_reason is None and cancel_token is not None:
+            stop_reason = cancel_token.reason
+
+        if verbose:
+            print(f"초기 해: 비용 = {current_cost:.2f}, 과목 수 = {len(state)}")
+
+        while stop_reason is None:
+            scan_start = time.perf_counter()
+            best_move = None
+            best_move_cost = float('inf')
+
+            def consider(cost, kind, idx=None, old_sid=None, new_sid=None):
+                # 타부인 (과목코드, 분반)을 건드리는 이동은 최적해를 갱신할 때만 허용 (열망 기준)
+                nonlocal best_move, best_move_cost
+                if cost >= best_move_cost:
+                    return
+                if cost >= best_cost and (tabu_until.get(old_sid, 0) > iteration
+                                          or tabu_until.get(new_sid, 0) > iteration):
+                    return
+                best_move = (kind, idx, old_sid, new_sid)
+                best_move_cost = cost
+
+            # 분반 변경 / 삭제 (과목을 뺀 해를 기준으로 같은 과목의 후보 분반들을 한 번에 채점)
+            for idx, sid in enumerate(state.sids):
+                alternatives = [other for other in sampler._section_choices(sid) if other != sid]
+                removal_cost, costs = evaluator.evaluate_replacements(idx, alternatives)
+                evaluations += len(alternatives)
+                if evaluator.entries[idx].course_code not in self.required_courses:
+                    evaluations += 1
+                    consider(removal_cost, 'remove_course', idx, sid)
+                for new_sid, cost in zip(alternatives, costs):
+                    if cost < best_move_cost:
+                        consider(cost, 'change_section', idx, sid, new_sid)
+
+            # 과목 추가
+            occupied = 0
+            for terms in evaluator.entries:
+                occupied |= terms.mask
+            additions = self._addition_candidates(state, ranking, occupied)
+            for new_sid, cost in zip(additions, evaluator.evaluate_additions(additions)):
+                if cost < best_move_cost:
+                    consider(cost, 'add_course', new_sid=new_sid)
+            evaluations += len(additions)
+            neighborhood_seconds += time.perf_counter() - scan_start
+
+            iteration += 1
+            if best_move is None:
+                stop_reason = 'no_moves'
+                break
+
+            kind, idx, old_sid, new_sid = best_move
+            evaluator.apply_move(Move(kind, idx, old_sid, new_sid))
+            current_cost = best_move_cost
+            for sid in (old_sid, new_sid):
+                if sid is not None:
+                    tabu_until[sid] = iteration + self.tenure
+
+            if current_cost < best_cost:
+                best_cost = current_cost
+                best_sids = state.snapshot()
+                last_improvement = iteration
+                improvements.append((time.perf_counter() - start_clock, evaluations, best_cost))
+
+            if history is not None:
+                history.record(iteration, current_cost)
+
+            if verbose and iteration % 20 == 0:
+                print(f"반복 {iteration}: 현재 비용 = {current_cost:.2f}, 최적 비용 = {best_cost:.2f}")
+
+            # 종료 조건 확인
+            if iteration >= self.max_iterations:
+                stop_reason = 'max_iterations'
+            elif self.target_cost is not None and best_cost <= self.target_cost:
+                stop_reason = 'target_cost'
+            elif self.max_no_improvement is not None and iteration - last_improvement >= self.max_no_improvement:
+                stop_reason = 'no_improvement'
+            elif self.time_limit is not None and time.perf_counter() - start_clock >= self.time_limit:
+                stop_reason = 'time_limit'
+            elif self.max_evaluations is not None and evaluations >= self.max_evaluations:
+                stop_reason = 'max_evaluations'
+            elif cancel_token is not None:
+                stop_reason = cancel_token.reason
+
+        if verbose:
+            print(f"최적화 완료! 최종 비용 = {best_cost:.2f} (반복 {iteration}, 종료 이유: {stop_reason})")
+
+        return {
+            'best_solution': SolutionState(self.catalog, best_sids).to_selections(),
+            'best_cost': best_cost,
+            'cost_history': history.costs if history is not None else [],
+            'history_iterations': history.iterations if history is not None else [],
+            'iterations': iteration,
+            'evaluations': evaluations,
+            'neighborhood_seconds': neighborhood_seconds,
+            'evaluations_per_ms': evaluations / (neighborhood_seconds * 1000) if neighborhood_seconds else 0.0,
+            'stop_reason': stop_reason,
+            'elapsed_seconds': time.perf_counter() - start_clock,
+            'improvements': improvements,
+            'propagation': propagation.to_dict() if propagation is not None else None
+        }
@@ -0,0 +1,106 @@
+"""
+최적화 서비스 localhost 테스트
+서버를 임의 포트에 띄우고 잘못된 sa_parameters / time_limit 요청이 400으로 거부되는지 확인
+실행: python -m unittest discover tests
+"""
+
+import asyncio
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from service import OptimizationService  # noqa: E402
+
+
+class OptimizationServiceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(os.path.join(ROOT, 'data', 'courses.json'), encoding='utf-8') as f:
+            course_database = json.load(f)
+        with open(os.path.join(ROOT, 'data', 'user_profile.json'), encoding='utf-8') as f:
+            cls.profile = json.load(f)
+
+        cls.service = OptimizationService(course_database, workers=1, sa_parameters={'max_iterations': 50})
+        ready = threading.Event()
+        address = {}
+
+        def on_ready(host, port):
+            address['port'] = port
+            ready.set()
+
+        threading.Thread(target=lambda: asyncio.run(cls.service.serve('127.0.0.1', 0, ready=on_ready)),
+                         daemon=True).start()
+        if not ready.wait(10):
+            raise RuntimeError("서버가 시작되지 않았습니다")
+        cls.port = address['port']
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.executor.shutdown()
+
+    def post(self, request):
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        try:
+            connection.request('POST', '/optimize', json.dumps(request))
+            response = connection.getresponse()
+            return response.status, json.loads(response.read().decode('utf-8'))
+        finally:
+            connection.close()
+
+    def test_rejects_invalid_sa_parameters(self):
+        invalid = [
+            [1, 2],
+            'abc',
+            {'max_iterations': 10 ** 9},
+            {'calibration_samples': 300000},
+            {'cooling_options': {'scale': -1}},
+            {'min_acceptance_rate': 0.1, 'acceptance_window': 0},
+            {'acceptance_window': 2.5},
+            {'max_no_improvement': 0},
+            {'cooling_rate': 1.5},
+            {'cooling_rate': 0},
+            {'cooling_rate': 'x'},
+            {'initial_temperature': -1},
+            {'final_temperature': 0},
+            {'cooling_schedule': 'unknown'},
+            {'cooling_schedule': ['geometric']},
+            {'auto_initial_temperature': 1},
+            {'target_initial_acceptance': 1.0},
+            {'compound_move_rate': 2},
+            {'min_acceptance_rate': True},
+            {'target_cost': 'low'},
+        ]
+        for sa_parameters in invalid:
+            with self.subTest(sa_parameters=sa_parameters):
+                status, payload = self.post({'profile': self.profile, 'seed': 0, 'sa_parameters': sa_parameters})
+                self.assertEqual(status, 400)
+                self.assertIn('error', payload)
+
+    def test_rejects_invalid_time_limit(self):
+        for time_limit in ['abc', 0, -1]:
+            with self.subTest(time_limit=time_limit):
+                status, _ = self.post({'profile': self.profile, 'time_limit': time_limit})
+                self.assertEqual(status, 400)
+
+    def test_accepts_valid_sa_parameters(self):
+        sa_parameters = {'cooling_schedule': 'reheating', 'cooling_rate': 0.9, 'initial_temperature': 500,
+                         'min_acceptance_rate': 0.01, 'acceptance_window': 10, 'max_no_improvement': None,
+                         'auto_initial_temperature': True}
+        start_time = time.perf_counter()
+        status, payload = self.post({'profile': self.profile, 'seed': 0, 'time_limit': 0.5,
+                                     'sa_parameters': sa_parameters})
+        self.assertEqual(status, 200)
+        self.assertIn('optimized_timetable', payload)
+        self.assertLess(time.perf_counter() - start_time, 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,11 @@ import json
 from datetime import datetime, timedelta
 
 class TimeTableParser:
+    # 비트마스크 구성: 요일(월~토) x 교시(1~15), 비트 위치 = 요일 인덱스 * 15 + (교시 - 1)
+    PERIODS_PER_DAY = 15
+    DAY_ORDER = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT']
+    DAY_MASK = (1 << PERIODS_PER_DAY) - 1
+    
     def __init__(self):
         # 교시별 시작 시간 정의 (24시간 형식)
         self.period_times = {
@@ -15,6 +20,10 @@ class TimeTableParser:
             '월': 'MON', '화': 'TUE', '수': 'WED', 
             '목': 'THU', '금': 'FRI', '토': 'SAT'
         }
+        self.day_indices = {day: idx for idx, day in enumerate(self.DAY_ORDER)}
+        
+        # 시간표 문자열 -> 비트마스크 캐시
+        self._mask_cache = {}
     
     def parse_schedule(self, schedule_str):
         """
@@ -69,22 +78,45 @@ class TimeTableParser:
         end_time = start_time + timedelta(minutes=45)
         return end_time.strftime("%H:%M")
     
-    def check_time_conflict(self, schedule1, schedule2):
-        """두 시간표 간 충돌 검사"""
-        blocks1 = self.parse_schedule(schedule1)
-        blocks2 = self.parse_schedule(schedule2)
-        
-        for block1 in blocks1:
-            for block2 in blocks2:
-                if (block1['day'] == block2['day'] and 
-                    self._periods_overlap(block1, block2)):
-                    return True
-        return False
+    def get_schedule_mask(self, schedule_str):
+        """
+        시간표 문자열을 요일x교시 비트마스크(정수)로 변환
+        같은 문자열은 한 번만 파싱하고 이후에는 캐시된 값을 반환
+        예: '월1-2' -> 0b11, '화1' -> 1 << 15
+        """
+        mask = self._mask_cache.get(schedule_str)
+        if mask is None:
+            mask = self._compile_schedule_mask(schedule_str)
+            self._mask_cache[schedule_str] = mask
+        return mask
+    
+    def _compile_schedule_mask(self, schedule_str):
+        """parse_schedule 결과를 비트마스크로 변환 (1~15교시 범위만 표시)"""
+        mask = 0
+        for block in self.parse_schedule(schedule_str):
+            day_offset = self.day_indices[block['day']] * self.PERIODS_PER_DAY
+            start_period = max(block['start_period'], 1)
+            end_period = min(block['end_period'], self.PERIODS_PER_DAY)
+            for period in range(start_period, end_period + 1):
+                mask |= 1 << (day_offset + period - 1)
+        return mask
     
-    def _periods_overlap(self, block1, block2):
-        """교시 겹침 검사"""
-        return not (block1['end_period'] < block2['start_period'] or 
-                   block2['end_period'] < block1['start_period'])
+    def get_day_masks(self, mask):
+        """비트마스크를 요일별(월~토) 15비트 마스크 리스트로 분리"""
+        return [(mask >> (day_idx * self.PERIODS_PER_DAY)) & self.DAY_MASK
+                for day_idx in range(len(self.DAY_ORDER))]
+    
+    def get_occupancy_mask(self, course_list):
+        """과목 목록 전체가 차지하는 시간의 비트마스크 (OR 합)"""
+        occupancy = 0
+        for course in course_list:
+            if course.get('schedule'):
+                occupancy |= self.get_schedule_mask(course['schedule'])
+        return occupancy
+    
+    def check_time_conflict(self, schedule1, schedule2):
+        """두 시간표 간 충돌 검사 (비트마스크 AND)"""
+        return (self.get_schedule_mask(schedule1) & self.get_schedule_mask(schedule2)) != 0
     
     def get_weekly_schedule_matrix(self, course_list):
         """
@@ -93,19 +125,20 @@ class TimeTableParser:
         """
         # 0: 빈 시간, 과목코드: 해당 과목
         matrix = [[''] * 15 for _ in range(5)]
-        day_indices = {'MON': 0, 'TUE': 1, 'WED': 2, 'THU': 3, 'FRI': 4}
         
         for course in course_list:
             if 'schedule' not in course or not course['schedule']:
                 continue
-                
-            blocks = self.parse_schedule(course['schedule'])
-            for block in blocks:
-                if block['day'] in day_indices:
-                    day_idx = day_indices[block['day']]
-                    for period in range(block['start_period'], block['end_period'] + 1):
-                        if 1 <= period <= 15:
-                            matrix[day_idx][period-1] = course['course_code']
+            
+            day_masks = self.get_day_masks(self.get_schedule_mask(course['schedule']))
+            for day_idx in range(5):
+                day_bits = day_masks[day_idx]
+                period_idx = 0
+                while day_bits:
+                    if day_bits & 1:
+                        matrix[day_idx][period_idx] = course['course_code']
+                    day_bits >>= 1
+                    period_idx += 1
         
         return matrix
     
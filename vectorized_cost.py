@@ -0,0 +1,251 @@
+import numpy as np
+
+from cost_function import TimetableCostFunction
+
+
+class VectorizedCostFunction(TimetableCostFunction):
+    """
+    NumPy 기반 일괄 비용 계산 백엔드
+    후보 해 B개를 (B x S) 이진 분반 선택 행렬로 표현하고, 분반별 요일x교시 점유 텐서,
+    학점 벡터, 교양영역 원-핫, 교수/시간 선호 비용 등을 미리 계산해 한 번의 호출로 채점한다.
+    calculate_batch_costs() 결과는 각 후보에 대한 calculate_total_cost()와 같다.
+
+    section_ids를 주면 해당 분반들만 열로 사용한다 (기본: 카탈로그 전체).
+    카탈로그가 크면 선택 행렬이 커지므로 후보 분반 집합으로 제한하는 것이 좋다.
+    같은 분반을 두 번 선택한 해는 이진 행렬로 표현되지 않는다.
+    """
+
+    def __init__(self, user_profile, course_database, time_parser, section_ids=None):
+        super().__init__(user_profile, course_database, time_parser)
+
+        if section_ids is None:
+            section_ids = range(len(self.catalog))
+        self.section_ids = np.asarray(list(section_ids), dtype=np.int64)
+        self.column_of = {int(sid): col for col, sid in enumerate(self.section_ids)}
+        self._build_tensors()
+
+    def _build_tensors(self):
+        """분반별 정적 특성 텐서 구성"""
+        periods = self.time_parser.PERIODS_PER_DAY
+        days = len(self.time_parser.DAY_ORDER)
+        courses = self.catalog.courses
+        masks = self.catalog.get_schedule_masks(self.time_parser)
+        n_sections = len(self.section_ids)
+
+        # 요일x교시 점유 텐서 (S, 6, 15)
+        occupancy = np.zeros((n_sections, days * periods), dtype=bool)
+        credits = np.zeros(n_sections)
+        static_time_preference = np.zeros(n_sections)
+        static_professor = np.zeros(n_sections)
+        static_priority = np.zeros(n_sections)
+        codes = []
+
+        for col, sid in enumerate(self.section_ids):
+            course = courses[sid]
+            mask = masks[sid]
+            while mask:
+                low_bit = mask & -mask
+                occupancy[col, low_bit.bit_length() - 1] = True
+                mask ^= low_bit
+
+            single = [{'course_code': course['course_code'], 'section': course['section']}]
+            credits[col] = course['credits']
+            static_time_preference[col] = self._time_preference_cost(single)
+            static_professor[col] = self._professor_preference_cost(single)
+            static_priority[col] = self._priority_cost(single)
+            codes.append(course['course_code'])
+
+        self.occupancy = occupancy.reshape(n_sections, days, periods)
+        self.weekday_occupancy = self.occupancy[:, :5, :].reshape(n_sections, 5 * periods).astype(np.float64)
+        # 충돌 쌍 계산용 (S + 1, 6 * 15) 점유 행렬, 마지막 0행은 빈 칸(-1) 인덱스용
+        self.padded_occupancy = np.concatenate(
+            [occupancy, np.zeros((1, days * periods), dtype=bool)]
+        ).astype(np.float64)
+        self.credits = credits
+        self.static_time_preference = static_time_preference
+        self.static_professor = static_professor
+        self.static_priority = static_priority
+        self.professor_flags = static_professor > 0
+
+        # 교양영역 원-핫 (요구사항에 있는 영역만)
+        area_requirements = self.user_profile['constraints']['area_requirements']
+        self.required_areas = list(area_requirements)
+        self.area_required_counts = np.array([area_requirements[area] for area in self.required_areas],
+                                             dtype=np.float64)
+        area_onehot = np.zeros((n_sections, len(self.required_areas)))
+        area_index = {area: i for i, area in enumerate(self.required_areas)}
+        for col, sid in enumerate(self.section_ids):
+            area = courses[sid]['area']
+            if area and area in area_index:
+                area_onehot[col, area_index[area]] = 1.0
+        self.area_onehot = area_onehot
+
+        # 필수과목/선수과목 계산에 쓰이는 과목코드만 원-핫으로 구성
+        completed = set(self.user_profile['completed_courses'])
+        prereq_rules = self.user_profile['constraints']['prerequisite_rules']
+        required_courses = self.user_profile['constraints']['required_courses']
+
+        tracked_codes = list(dict.fromkeys(
+            list(required_courses) + list(prereq_rules) +
+            [p for prerequisites in prereq_rules.values() for p in prerequisites]
+        ))
+        code_index = {code: i for i, code in enumerate(tracked_codes)}
+        code_onehot = np.zeros((n_sections, len(tracked_codes)))
+        for col, code in enumerate(codes):
+            if code in code_index:
+                code_onehot[col, code_index[code]] = 1.0
+        self.code_onehot = code_onehot
+        self.required_code_idx = np.array([code_index[code] for code in required_courses], dtype=np.int64)
+
+        rule_course_idx = []
+        rule_prereq_idx = []
+        for course_code, prerequisites in prereq_rules.items():
+            for prerequisite in prerequisites:
+                if prerequisite not in completed:
+                    rule_course_idx.append(code_index[course_code])
+                    rule_prereq_idx.append(code_index[prerequisite])
+        self.rule_course_idx = np.array(rule_course_idx, dtype=np.int64)
+        self.rule_prereq_idx = np.array(rule_prereq_idx, dtype=np.int64)
+
+        lunch_periods = self.user_profile['preferences']['lunch_preferred_periods']
+        self.lunch_period_idx = np.array([p - 1 for p in lunch_periods if 1 <= p <= periods],
+                                         dtype=np.int64)
+
+    def encode(self, solutions):
+        """[{'course_code', 'section'}] 해 목록을 (B x S) 이진 선택 행렬로 변환"""
+        matrix = np.zeros((len(solutions), len(self.section_ids)), dtype=np.uint8)
+        for row, solution in enumerate(solutions):
+            for course_selection in solution:
+                sid = self.catalog.section_id(course_selection['course_code'], course_selection['section'])
+                col = self.column_of.get(sid)
+                if col is not None:
+                    matrix[row, col] = 1
+        return matrix
+
+    def decode(self, selection_row):
+        """선택 행렬의 한 행을 [{'course_code', 'section'}] 형식으로 변환"""
+        courses = self.catalog.courses
+        return [{'course_code': courses[sid]['course_code'], 'section': courses[sid]['section']}
+                for sid in self.section_ids[np.flatnonzero(selection_row)]]
+
+    def calculate_batch_costs(self, selection_matrix):
+        """후보 해 전체의 총 비용 (B,)"""
+        return self.calculate_batch_breakdown(selection_matrix)['total']
+
+    def calculate_batch_breakdown(self, selection_matrix):
+        """후보 해 전체의 항목별 비용 (get_cost_breakdown과 같은 키, 값은 (B,) 배열)"""
+        selection = np.asarray(selection_matrix, dtype=np.float64)
+        if selection.ndim == 1:
+            selection = selection[np.newaxis, :]
+        weights = self.weights
+        periods = self.time_parser.PERIODS_PER_DAY
+        batch_size = selection.shape[0]
+
+        # 요일별 점유 (B, 5, 15)
+        occupied = (selection @ self.weekday_occupancy).reshape(batch_size, 5, periods) > 0
+
+        # 선택된 과목코드 개수 (필수/선수과목용)
+        code_counts = selection @ self.code_onehot
+
+        # 1. 시간 충돌 (모든 쌍)
+        time_conflict = self._batch_conflict_pairs(selection) * weights['time_conflict']
+
+        # 2. 선수과목 위반
+        if len(self.rule_course_idx):
+            violations = (code_counts[:, self.rule_course_idx] *
+                          (code_counts[:, self.rule_prereq_idx] == 0)).sum(axis=1)
+        else:
+            violations = np.zeros(batch_size)
+        prerequisite_violation = violations * weights['prerequisite_violation']
+
+        # 3. 학점
+        total_credits = selection @ self.credits
+        min_credits = self.user_profile['min_credits']
+        max_credits = self.user_profile['max_credits']
+        credit_cost = np.where(
+            total_credits < min_credits, (min_credits - total_credits) * weights['credit_shortage'],
+            np.where(total_credits > max_credits, (total_credits - max_credits) * weights['credit_excess'], 0.0)
+        )
+
+        # 4. 필수과목 누락
+        missing = (code_counts[:, self.required_code_idx] == 0).sum(axis=1)
+        required_course_missing = missing * weights['required_course_missing']
+
+        # 5. 연강: 길이 L인 연속 수업은 길이 (max+1) 창이 L-max개 → 가득 찬 창의 수를 센다
+        max_consecutive = self.user_profile['preferences']['max_consecutive_classes']
+        window = max_consecutive + 1
+        if window <= periods:
+            cumulative = np.concatenate(
+                [np.zeros((batch_size, 5, 1)), np.cumsum(occupied, axis=2)], axis=2
+            )
+            window_sums = cumulative[:, :, window:] - cumulative[:, :, :-window]
+            full_windows = (window_sums == window).sum(axis=(1, 2))
+        else:
+            full_windows = np.zeros(batch_size)
+        consecutive_classes = full_windows * weights['consecutive_classes']
+
+        # 6. 시간 선호도, 8. 교수 선호도, 10. 우선순위 (분반별 정적 비용의 합)
+        time_preference = selection @ self.static_time_preference
+        professor_preference = selection @ self.static_professor
+        priority = selection @ self.static_priority
+
+        # 7. 점심시간
+        if self.user_profile['preferences']['lunch_time_required']:
+            if len(self.lunch_period_idx):
+                lunch_available = (~occupied[:, :, self.lunch_period_idx]).any(axis=2)
+            else:
+                lunch_available = np.zeros((batch_size, 5), dtype=bool)
+            lunch_time = (~lunch_available).sum(axis=1) * weights['lunch_time_violation']
+        else:
+            lunch_time = np.zeros(batch_size)
+
+        # 9. 교양영역
+        area_counts = selection @ self.area_onehot
+        area_shortage = np.maximum(self.area_required_counts - area_counts, 0).sum(axis=1)
+        area_requirement = area_shortage * weights['area_requirement_violation']
+
+        # 11. 공강일 (월~금)
+        free_days = 5 - occupied.any(axis=2).sum(axis=1)
+        weight = weights.get('free_days_bonus', 100)
+        free_days_bonus = -(free_days * free_days * 30) * weight / 100
+
+        breakdown = {
+            'time_conflict': time_conflict,
+            'prerequisite_violation': prerequisite_violation,
+            'credit_cost': credit_cost,
+            'required_course_missing': required_course_missing,
+            'consecutive_classes': consecutive_classes,
+            'time_preference': time_preference,
+            'lunch_time': lunch_time,
+            'professor_preference': professor_preference,
+            'area_requirement': area_requirement,
+            'priority': priority,
+            'free_days_bonus': free_days_bonus
+        }
+
+        total = np.zeros(batch_size)
+        for term in breakdown.values():
+            total = total + term
+        breakdown['total'] = total
+        return breakdown
+
+    def _batch_conflict_pairs(self, selection):
+        """후보별 시간이 겹치는 분반 쌍의 수"""
+        batch_size = selection.shape[0]
+        rows, cols = np.nonzero(selection)
+        if len(rows) == 0:
+            return np.zeros(batch_size)
+
+        # 후보별 선택 분반을 (B, k_max) 인덱스 배열로 모으기 (빈 칸은 -1)
+        counts = np.bincount(rows, minlength=batch_size)
+        k_max = counts.max()
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        ranks = np.arange(len(rows)) - starts[rows]
+        selected = np.full((batch_size, k_max), -1, dtype=np.int64)
+        selected[rows, ranks] = cols
+
+        gathered = self.padded_occupancy[selected]  # 빈 칸(-1)은 마지막 0행을 가리킴
+
+        overlaps = np.einsum('bis,bjs->bij', gathered, gathered) > 0
+        upper = np.triu(np.ones((k_max, k_max), dtype=bool), k=1)
+        return (overlaps & upper).sum(axis=(1, 2)).astype(np.float64)